@@ -1,10 +1,17 @@
-from fastapi import FastAPI, HTTPException
+import asyncio
+import json
+import os
+from fastapi import FastAPI, HTTPException, Header, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
-from typing import Dict, List, Any, Optional
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, ValidationError
+from typing import Dict, List, Any, Optional, Tuple
 from wfir.models import WorkflowIR
-from wfir.compiler.langgraph.transpiler import LangGraphTranspiler
-from wfir.runtime.registry import NodeRegistry
+from wfir.loader import WorkflowLoader, loads
+from wfir.compiler.cache import CompileCache, SUPPORTED_TARGETS, compile_key
+from wfir.compiler.langgraph.pool import GraphPool
+from wfir.runtime.registry import NodeRegistry, Runtime
+from wfir.runtime.response_cache import get_response_cache
 
 app = FastAPI()
 
@@ -20,11 +27,37 @@ app.add_middleware(
 async def get_node_types():
     return NodeRegistry.get_all_schemas()
 
+# Validated IR keyed by content; identical re-submissions skip pydantic validation
+workflow_loader = WorkflowLoader(max_entries=int(os.environ.get("WFIR_IR_CACHE_SIZE", "256")))
+
+def validation_detail(error: ValidationError, loc: tuple) -> List[Dict[str, Any]]:
+    """Pydantic errors located the way FastAPI reports body validation errors."""
+    details = error.errors(include_url=False, include_context=False)
+    for detail in details:
+        detail["loc"] = [*loc, *detail["loc"]]
+    return details
+
+def load_request_workflow(data: Any, loc: tuple = ("body",)) -> WorkflowIR:
+    """Validate (or fetch from cache) the workflow part of a request body, 422 on invalid IR."""
+    if not isinstance(data, dict):
+        raise HTTPException(status_code=422, detail="Expected a workflow object")
+    try:
+        return workflow_loader.load(data)
+    except ValidationError as e:
+        raise HTTPException(status_code=422, detail=validation_detail(e, loc))
+
+async def read_json(request: Request) -> Any:
+    try:
+        return loads(await request.body())
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid JSON: {e}")
+
 @app.post("/validate")
-async def validate_workflow(workflow: WorkflowIR):
+async def validate_workflow(request: Request):
     """
     Validates the workflow IR.
     """
+    workflow = load_request_workflow(await read_json(request))
     try:
         # Static validation is already done by Pydantic model (WorkflowIR)
         # We can add additional semantic validation here if needed
@@ -47,21 +80,161 @@ async def validate_workflow(workflow: WorkflowIR):
 class CompileRequest(BaseModel):
     workflow: WorkflowIR
     target: str = "langgraph"
+    parallel: bool = False
+    # Id of the workflow being edited; its compiles share a transpiler that only re-renders changed nodes
+    session: Optional[str] = None
+
+    @classmethod
+    def parse(cls, data: Any) -> "CompileRequest":
+        """Like model_validate, but the workflow goes through the IR cache."""
+        if not isinstance(data, dict):
+            raise HTTPException(status_code=422, detail="Expected a compile request object")
+        workflow = load_request_workflow(data.get("workflow"), ("body", "workflow"))
+        options = {k: v for k, v in data.items() if k != "workflow"}
+        try:
+            return cls.model_validate({**options, "workflow": workflow})
+        except ValidationError as e:
+            raise HTTPException(status_code=422, detail=validation_detail(e, ("body",)))
+
+# Shared across requests; the UI re-submits identical workflows on every edit
+compile_cache = CompileCache(
+    max_entries=int(os.environ.get("WFIR_COMPILE_CACHE_SIZE", "256")),
+    cache_dir=os.environ.get("WFIR_CACHE_DIR"),
+)
 
 @app.post("/compile")
-async def compile_workflow(request: CompileRequest):
+async def compile_workflow(raw_request: Request, response: Response, if_none_match: Optional[str] = Header(None)):
     """
     Compiles the workflow IR to the target language/framework.
+    Responses carry an ETag derived from the workflow content, target and compiler version;
+    a matching If-None-Match gets an empty 304.
     """
-    if request.target == "langgraph":
-        transpiler = LangGraphTranspiler()
+    request = CompileRequest.parse(await read_json(raw_request))
+    if request.target not in SUPPORTED_TARGETS:
+        raise HTTPException(status_code=400, detail=f"Unsupported target: {request.target}")
+
+    key = compile_key(request.workflow, request.target, parallel=request.parallel)
+    etag = f'"{key}"'
+    if if_none_match and etag in [tag.strip() for tag in if_none_match.split(",")]:
+        return Response(status_code=304, headers={"ETag": etag})
+
+    try:
+        _, code = compile_cache.compile(request.workflow, request.target, parallel=request.parallel, key=key, session=request.session)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Compilation failed: {str(e)}")
+
+    response.headers["ETag"] = etag
+    return {"code": code}
+
+class RunRequest(BaseModel):
+    workflow: WorkflowIR
+    inputs: Dict[str, Any] = {}
+
+    @classmethod
+    def parse(cls, data: Any) -> "RunRequest":
+        """Like model_validate, but the workflow goes through the IR cache."""
+        if not isinstance(data, dict):
+            raise HTTPException(status_code=422, detail="Expected a run request object")
+        workflow = load_request_workflow(data.get("workflow"), ("body", "workflow"))
+        options = {k: v for k, v in data.items() if k != "workflow"}
         try:
-            code = transpiler.visit_workflow(request.workflow)
-            return {"code": code}
+            return cls.model_validate({**options, "workflow": workflow})
+        except ValidationError as e:
+            raise HTTPException(status_code=422, detail=validation_detail(e, ("body",)))
+
+# Execution plans (validated params, node instances) shared across runs, keyed by workflow hash
+runtime = Runtime()
+
+def sse_event(event: str, data: Any) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+@app.post("/run")
+async def run_workflow(raw_request: Request):
+    """
+    Runs the workflow and streams progress as server-sent events:
+    `node_start`, `token` (chunks of nodes with `stream` set), `node_end` and
+    `workflow_end`, or `error` if the run fails. Each `data` is a JSON object.
+    """
+    from wfir.runner import WorkflowRunner
+
+    request = RunRequest.parse(await read_json(raw_request))
+    try:
+        runner = WorkflowRunner.from_runtime(request.workflow, runtime)
+    except (ValueError, ValidationError) as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+    async def stream():
+        try:
+            async for event in runner.events(request.inputs):
+                yield sse_event(event["event"], {"node": event["node"], "data": event["data"]})
         except Exception as e:
-            raise HTTPException(status_code=500, detail=f"Compilation failed: {str(e)}")
-    else:
-        raise HTTPException(status_code=400, detail=f"Unsupported target: {request.target}")
+            yield sse_event("error", {"node": None, "data": str(e)})
+
+    # No proxy buffering, so tokens reach the client as soon as they are produced
+    return StreamingResponse(stream(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+# Stored workflows: id -> (workflow, graph pool key)
+workflows: Dict[str, Tuple[WorkflowIR, str]] = {}
+
+# Warm compiled graphs shared by all runs; the generated code comes from the compile cache
+graph_pool = GraphPool(
+    max_entries=int(os.environ.get("WFIR_GRAPH_POOL_SIZE", "64")),
+    compile_cache=compile_cache,
+)
+
+async def warm_graph(workflow: WorkflowIR, key: str, workflow_id: Optional[str] = None):
+    """The compiled graph for a stored workflow; building one (rarely) happens off the event loop."""
+    graph = graph_pool.peek(key)
+    if graph is None:
+        try:
+            graph = await asyncio.to_thread(graph_pool.get, workflow, key, workflow_id)
+        except Exception as e:
+            raise HTTPException(status_code=422, detail=f"Failed to build graph: {str(e)}")
+    return graph
+
+@app.put("/workflows/{workflow_id}")
+async def put_workflow(workflow_id: str, request: Request):
+    """
+    Stores a workflow under `workflow_id` and warms its compiled graph,
+    so the first run doesn't pay for graph construction.
+    """
+    workflow = load_request_workflow(await read_json(request))
+    key = graph_pool.key(workflow)
+    await warm_graph(workflow, key, workflow_id)
+    workflows[workflow_id] = (workflow, key)
+    return {"id": workflow_id, "hash": key}
+
+class WorkflowRunRequest(BaseModel):
+    inputs: Dict[str, Any] = {}
+
+@app.post("/workflows/{workflow_id}/run")
+async def run_stored_workflow(workflow_id: str, request: Optional[WorkflowRunRequest] = None):
+    """
+    Runs a stored workflow on its warm compiled graph. `inputs` seed the graph state;
+    the response holds the final state. Runs execute concurrently on the event loop.
+    """
+    stored = workflows.get(workflow_id)
+    if stored is None:
+        raise HTTPException(status_code=404, detail=f"Workflow '{workflow_id}' not found")
+    workflow, key = stored
+    graph = await warm_graph(workflow, key)
+
+    try:
+        state = await graph.ainvoke(dict(request.inputs) if request else {})
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Execution failed: {str(e)}")
+    return {"id": workflow_id, "hash": key, "state": state}
+
+@app.get("/stats")
+async def get_stats():
+    """Hit/miss counters of the API's caches, including the LLM response cache."""
+    return {
+        "llm_responses": get_response_cache().stats(),
+        "workflows": {"hits": workflow_loader.hits, "misses": workflow_loader.misses},
+        "compile": {"hits": compile_cache.hits, "misses": compile_cache.misses},
+        "graphs": {"hits": graph_pool.hits, "misses": graph_pool.misses, "size": len(graph_pool)},
+    }
 
 if __name__ == "__main__":
     import uvicorn
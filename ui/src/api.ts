@@ -51,7 +51,8 @@ export const transpileWorkflow = async (id: string, target: string = 'langgraph'
   const workflow = await getWorkflow(id);
   const response = await axios.post(`${API_URL}/compile`, {
     workflow,
-    target
+    target,
+    session: id
   });
   return response.data;
 };
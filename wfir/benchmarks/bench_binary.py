@@ -0,0 +1,67 @@
+"""
+Benchmark: size and load time of the binary format vs JSON.
+
+Uses editor-style workflows (positions, repeated LLM params) of 1k and 10k nodes.
+
+    uv run python benchmarks/bench_binary.py
+"""
+import gc
+import json
+import time
+from wfir import binary
+from wfir.loader import loads
+from wfir.models import TRUSTED, WorkflowIR
+
+def editor_workflow(size: int) -> WorkflowIR:
+    nodes = [{"id": "start", "type": "StartNode", "metadata": {"position": {"x": 100, "y": 100}}}]
+    edges = []
+    for i in range(1, size):
+        prev = nodes[-1]["id"]
+        node_id = f"llm-{1763542362909 + i}"
+        nodes.append({
+            "id": node_id,
+            "type": "LLM",
+            "inputs": {"prompt": {"valueFrom": {"nodeId": prev}}},
+            "params": {"provider": "openai", "model": "gpt-4o", "temperature": 0.7, "system_prompt": ""},
+            "outputs": {"output": "Any"},
+            "metadata": {"position": {"x": 219.50086212158203 + i, "y": 166.23263549804688 + i}},
+        })
+        edges.append({"source": prev, "target": node_id})
+    return WorkflowIR(name="Editor", nodes=nodes, edges=edges)
+
+def timed(fn, repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main(sizes=(1_000, 10_000)):
+    for size in sizes:
+        workflow = editor_workflow(size)
+        as_json = json.dumps(workflow.model_dump(mode="json", by_alias=True)).encode("utf-8")
+        as_compact_json = json.dumps(workflow.model_dump(mode="json", by_alias=True, exclude_defaults=True), separators=(",", ":")).encode("utf-8")
+        as_binary = binary.dumps(workflow)
+        as_stripped = binary.dumps(workflow, strip_metadata=True)
+
+        print(f"{size} nodes")
+        print(f"  size  json:            {len(as_json):>10,} B")
+        print(f"  size  json (compact):  {len(as_compact_json):>10,} B")
+        print(f"  size  binary:          {len(as_binary):>10,} B ({len(as_json) / len(as_binary):.1f}x smaller)")
+        print(f"  size  binary stripped: {len(as_stripped):>10,} B ({len(as_json) / len(as_stripped):.1f}x smaller)")
+
+        decode_stdlib = timed(lambda: json.loads(as_json))
+        decode_json = timed(lambda: loads(as_json))
+        decode_binary = timed(lambda: binary.decode(as_binary))
+        load_json = timed(lambda: WorkflowIR.model_validate(loads(as_json), context=TRUSTED))
+        load_binary = timed(lambda: binary.loads(as_binary, trusted=True))
+        print(f"  decode json (stdlib):  {decode_stdlib * 1e3:>8.1f} ms")
+        print(f"  decode json (orjson):  {decode_json * 1e3:>8.1f} ms")
+        print(f"  decode binary:         {decode_binary * 1e3:>8.1f} ms")
+        print(f"  load json (trusted):   {load_json * 1e3:>8.1f} ms")
+        print(f"  load binary (trusted): {load_binary * 1e3:>8.1f} ms")
+
+if __name__ == "__main__":
+    main()
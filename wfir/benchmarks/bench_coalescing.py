@@ -0,0 +1,69 @@
+"""
+Benchmark: concurrent identical LLM calls with and without coalescing.
+
+CALLERS executions of the same prompt start at once, against a simulated provider
+taking PROVIDER_LATENCY per call and serving at most PROVIDER_CONCURRENCY calls at a
+time (a rate-limited upstream). Measured for coroutines (`aexecute`) and worker threads
+(`execute`); reports upstream calls and wall time.
+
+    uv run python benchmarks/bench_coalescing.py
+"""
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict
+from wfir.runtime.base import Context
+from wfir.runtime.nodes import LLMNode, LLMParams, NodeDef
+from wfir.runtime.registry import NodeRegistry, Runtime
+
+CALLERS = 100
+PROVIDER_LATENCY = 0.05
+PROVIDER_CONCURRENCY = 10
+
+class SimulatedLLMNode(LLMNode):
+    """LLMNode's coalescing key, with a simulated provider instead of a real one."""
+    upstream_calls = 0
+    _async_slots: asyncio.Semaphore = None
+    _thread_slots = threading.Semaphore(PROVIDER_CONCURRENCY)
+
+    def execute(self, inputs: Dict[str, Any], context: Context, node_def: NodeDef[LLMParams]) -> Any:
+        with self._thread_slots:
+            SimulatedLLMNode.upstream_calls += 1
+            time.sleep(PROVIDER_LATENCY)
+        return f"answer to {inputs['prompt']}"
+
+    async def aexecute(self, inputs: Dict[str, Any], context: Context, node_def: NodeDef[LLMParams]) -> Any:
+        async with SimulatedLLMNode._async_slots:
+            SimulatedLLMNode.upstream_calls += 1
+            await asyncio.sleep(PROVIDER_LATENCY)
+        return f"answer to {inputs['prompt']}"
+
+def run_async(node) -> float:
+    async def main():
+        SimulatedLLMNode._async_slots = asyncio.Semaphore(PROVIDER_CONCURRENCY)
+        await asyncio.gather(*(node.aexecute({"prompt": "same"}, Context({})) for _ in range(CALLERS)))
+
+    start = time.perf_counter()
+    asyncio.run(main())
+    return time.perf_counter() - start
+
+def run_threads(node) -> float:
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=CALLERS) as pool:
+        list(pool.map(lambda _: node.execute({"prompt": "same"}, Context({})), range(CALLERS)))
+    return time.perf_counter() - start
+
+def main():
+    NodeRegistry.register("SimulatedLLM", SimulatedLLMNode)
+    node = Runtime.prepare_node("SimulatedLLM", {"id": "llm", "params": {"provider": "mock", "temperature": 0}})
+    print(f"{CALLERS} identical calls, provider {PROVIDER_LATENCY * 1e3:.0f} ms/call, {PROVIDER_CONCURRENCY} at a time")
+    for label, run in (("async", run_async), ("threads", run_threads)):
+        for coalesce in (False, True):
+            SimulatedLLMNode.coalesce = coalesce
+            SimulatedLLMNode.upstream_calls = 0
+            wall = run(node)
+            print(f"{label:<8} coalesce={str(coalesce):<5}  upstream calls {SimulatedLLMNode.upstream_calls:4d}   wall {wall * 1e3:7.1f} ms")
+
+if __name__ == "__main__":
+    main()
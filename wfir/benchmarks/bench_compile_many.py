@@ -0,0 +1,54 @@
+"""
+Benchmark: compiling many workflows one process at a time vs `wfir compile-many`.
+
+One `wfir compile` per file pays interpreter start-up and the pydantic/Jinja/LangGraph
+imports every time; compile-many pays them once per worker and skips unchanged
+inputs on the next run.
+
+    uv run python benchmarks/bench_compile_many.py
+"""
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+def write_workflows(directory: str, count: int, size: int = 30):
+    for n in range(count):
+        nodes = [{"id": "start", "type": "StartNode"}]
+        edges = []
+        for i in range(1, size):
+            prev = nodes[-1]["id"]
+            nodes.append({"id": f"llm-{i}", "type": "LLM", "inputs": {"prompt": {"valueFrom": {"nodeId": prev}}},
+                          "params": {"provider": "mock", "model": f"m{n}"}})
+            edges.append({"source": prev, "target": f"llm-{i}"})
+        with open(os.path.join(directory, f"wf{n:03d}.json"), "w") as f:
+            json.dump({"name": f"Workflow {n}", "nodes": nodes, "edges": edges}, f)
+
+def run(args) -> float:
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-m", "wfir.cli", *args], check=True, stdout=subprocess.DEVNULL)
+    return time.perf_counter() - start
+
+def main(count: int = 40):
+    with tempfile.TemporaryDirectory() as tmp:
+        inputs = os.path.join(tmp, "in")
+        os.makedirs(inputs)
+        write_workflows(inputs, count)
+
+        one_by_one = 0.0
+        for name in sorted(os.listdir(inputs)):
+            one_by_one += run(["compile", os.path.join(inputs, name)])
+
+        out = os.path.join(tmp, "out")
+        cold = run(["compile-many", inputs, "-o", out])
+        warm = run(["compile-many", inputs, "-o", out])
+
+        print(f"{count} workflows, {os.cpu_count()} CPUs")
+        print(f"  wfir compile per file:     {one_by_one:7.2f} s")
+        print(f"  wfir compile-many (cold):  {cold:7.2f} s ({one_by_one / cold:.1f}x)")
+        print(f"  wfir compile-many (warm):  {warm:7.2f} s ({one_by_one / warm:.1f}x, all skipped)")
+
+if __name__ == "__main__":
+    main()
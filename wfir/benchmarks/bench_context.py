@@ -0,0 +1,75 @@
+"""
+Benchmark: resolving the inputs of every node of a NODES-node workflow.
+
+Each node has a literal input and a reference to the previous node's output; the state
+holds every output. One pass creates a Context per node and resolves its inputs.
+
+    legacy      the previous `Context.resolve_inputs`: walks the definition dicts, builds
+                state keys with replace/f-strings and prints every value (to /dev/null here)
+    compile     `InputPlan.compile` + `resolve` on every call (definition dicts walked each time)
+    planned     `Context.resolve_inputs` with plans compiled once per node
+
+    uv run python benchmarks/bench_context.py
+"""
+import contextlib
+import os
+import time
+from typing import Any, Dict
+from wfir.runtime.base import Context, InputPlan, state_key
+
+NODES = 10_000
+ROUNDS = 5
+
+def legacy_resolve(state: Dict[str, Any], inputs_def: Dict[str, Any]) -> Dict[str, Any]:
+    resolved = {}
+    for name, input_val in inputs_def.items():
+        value_from = input_val.get("valueFrom")
+        value = input_val.get("value")
+        print(f"Value: {value}")
+        print(f"Value from: {value_from}")
+        if value_from:
+            ref_node = value_from.get("nodeId")
+            print(f"Ref node: {ref_node}")
+            resolved[name] = state.get(f'{ref_node.replace("-", "_")}_output') if ref_node else None
+        elif value is not None:
+            resolved[name] = value
+        else:
+            resolved[name] = None
+    return resolved
+
+def main():
+    definitions = [{"prompt": {"value": f"step {i}"}} for i in range(NODES)]
+    for i in range(1, NODES):
+        definitions[i]["previous"] = {"valueFrom": {"nodeId": f"node-{i - 1}"}}
+    state = {state_key(f"node-{i}"): i for i in range(NODES)}
+    plans = [InputPlan.compile(d) for d in definitions]
+
+    def legacy():
+        for d in definitions:
+            Context(state)
+            legacy_resolve(state, d)
+
+    def compile_each():
+        for d in definitions:
+            Context(state)
+            InputPlan.compile(d).resolve(state)
+
+    def planned():
+        for plan in plans:
+            Context(state).resolve_inputs(plan)
+
+    print(f"{NODES} nodes, best of {ROUNDS}")
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        timings = {}
+        for label, run in (("legacy", legacy), ("compile", compile_each), ("planned", planned)):
+            best = float("inf")
+            for _ in range(ROUNDS):
+                start = time.perf_counter()
+                run()
+                best = min(best, time.perf_counter() - start)
+            timings[label] = best
+    for label, seconds in timings.items():
+        print(f"{label:<8} {seconds * 1e3:8.2f} ms   {seconds / NODES * 1e9:7.0f} ns/node")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""
+Benchmark: per-evaluation cost of Condition/Loop expressions.
+
+Compares the previous inline `eval(expression_text, ...)` path, which re-parses
+and re-compiles the string on every call, with the cached expression engine.
+
+    uv run python benchmarks/bench_expressions.py
+"""
+import timeit
+from wfir.runtime.expressions import compile_expression, evaluate_expression
+
+EXPRESSIONS = [
+    "input['count'] < 3",
+    "val > 5 and flag",
+    "status in ['ok', 'done'] or retries >= max_retries",
+]
+
+INPUTS = {
+    "count": 1,
+    "val": 10,
+    "flag": True,
+    "status": "pending",
+    "retries": 2,
+    "max_retries": 3,
+}
+
+def eval_each_time(expression: str):
+    eval_context = INPUTS.copy()
+    eval_context["input"] = INPUTS
+    return eval(expression, {"__builtins__": {}}, eval_context)
+
+def main(number: int = 100_000):
+    print(f"{'expression':<55} {'eval (us)':>10} {'engine (us)':>12} {'speedup':>8}")
+    for expression in EXPRESSIONS:
+        compile_expression(expression)  # Warm the cache, as a long-running loop would
+        baseline = timeit.timeit(lambda: eval_each_time(expression), number=number)
+        engine = timeit.timeit(lambda: evaluate_expression(expression, INPUTS), number=number)
+        print(
+            f"{expression:<55} {baseline / number * 1e6:>10.2f} "
+            f"{engine / number * 1e6:>12.2f} {baseline / engine:>7.1f}x"
+        )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Benchmark: per-request graph construction vs. a warm GraphPool.
+
+    rebuild   transpile, exec the generated module and build_graph().compile()
+              on every request (what running generated code by hand costs)
+    pooled    GraphPool.get with the key stored at registration (an LRU lookup, as
+              in the API's /workflows/{id}/run) and ainvoke on the warm graph
+
+Both run REQUESTS requests for an N-node chain of mock LLM nodes, CONCURRENCY at a time.
+
+    uv run python benchmarks/bench_graph_pool.py
+"""
+import asyncio
+import time
+from wfir.models import WorkflowIR
+from wfir.compiler.cache import compile_ir
+from wfir.compiler.langgraph.pool import GraphPool, load_module
+
+REQUESTS = 200
+CONCURRENCY = 20
+
+def chain(size: int) -> WorkflowIR:
+    nodes = [{"id": "start", "type": "StartNode"}]
+    edges = []
+    for i in range(1, size - 1):
+        prev = nodes[-1]["id"]
+        nodes.append({
+            "id": f"llm-{i}",
+            "type": "LLM",
+            "inputs": {"prompt": {"value": f"step {i}"}},
+            "params": {"provider": "mock", "model": "m"},
+        })
+        edges.append({"source": prev, "target": nodes[-1]["id"]})
+    edges.append({"source": nodes[-1]["id"], "target": "end"})
+    nodes.append({"id": "end", "type": "EndNode"})
+    return WorkflowIR.model_validate({"name": "Chain", "nodes": nodes, "edges": edges})
+
+async def serve(handle, workflow: WorkflowIR) -> float:
+    semaphore = asyncio.Semaphore(CONCURRENCY)
+
+    async def request():
+        async with semaphore:
+            await handle(workflow)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(request() for _ in range(REQUESTS)))
+    return time.perf_counter() - start
+
+async def rebuild(workflow: WorkflowIR):
+    code = compile_ir(workflow, async_nodes=True)
+    graph = load_module(code, workflow.content_hash()).build_graph().compile()
+    await graph.ainvoke({})
+
+def main():
+    pool = GraphPool()
+    keys = {}
+
+    async def pooled(workflow: WorkflowIR):
+        await pool.get(workflow, keys[id(workflow)]).ainvoke({})
+
+    for size in (5, 20, 50):
+        workflow = chain(size)
+        # Warm up and remember the key, as PUT /workflows/{id} does
+        keys[id(workflow)] = pool.key(workflow)
+        pool.get(workflow, keys[id(workflow)])
+        asyncio.run(rebuild(workflow))  # pay one-off imports outside the timing
+        slow = asyncio.run(serve(rebuild, workflow))
+        fast = asyncio.run(serve(pooled, workflow))
+        print(f"{size:3d} nodes: rebuild {REQUESTS / slow:7.1f} req/s   pooled {REQUESTS / fast:7.1f} req/s   ({slow / fast:5.1f}x)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Benchmark: HTTP node throughput against a local server with LATENCY per response.
+
+    per-request client   a new httpx.Client (and connection) for every request,
+                         the naive implementation
+    pooled sync          HTTPNode.execute on the shared keep-alive pool, from FANOUT threads
+    pooled async         HTTPNode.aexecute on the shared pool, FANOUT coroutines at a time
+
+    uv run python benchmarks/bench_http.py
+"""
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import httpx
+from wfir.runtime.base import Context
+from wfir.runtime.http_client import get_http_pool
+from wfir.runtime.nodes import HTTPNode, HTTPParams, NodeDef
+
+REQUESTS = 1000
+FANOUT = 20
+LATENCY = 0.005
+BODY = b'{"ok": true}'
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        time.sleep(LATENCY)
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(BODY)))
+        self.end_headers()
+        self.wfile.write(BODY)
+
+def per_request_client(url: str):
+    with httpx.Client() as client:
+        client.get(url).json()
+
+def main():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/"
+
+    node = HTTPNode()
+    node_def = NodeDef(params=HTTPParams(url=url), node_id="http")
+    get_http_pool().max_per_host = FANOUT
+
+    def run_threads(fn) -> float:
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=FANOUT) as pool:
+            list(pool.map(lambda _: fn(), range(REQUESTS)))
+        return time.perf_counter() - start
+
+    async def run_async() -> float:
+        semaphore = asyncio.Semaphore(FANOUT)
+
+        async def one():
+            async with semaphore:
+                await node.aexecute({}, Context({}), node_def)
+
+        await one()  # connect outside the timing, like the sync warm-up below
+        start = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(REQUESTS)))
+        return time.perf_counter() - start
+
+    node.execute({}, Context({}), node_def)
+    results = {
+        "per-request client": run_threads(lambda: per_request_client(url)),
+        "pooled sync": run_threads(lambda: node.execute({}, Context({}), node_def)),
+        "pooled async": asyncio.run(run_async()),
+    }
+    print(f"{REQUESTS} GETs, {FANOUT} in flight, server latency {LATENCY * 1e3:.0f} ms")
+    for label, seconds in results.items():
+        print(f"{label:<20} {REQUESTS / seconds:8.0f} req/s")
+    server.shutdown()
+
+if __name__ == "__main__":
+    main()
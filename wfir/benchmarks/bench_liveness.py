@@ -0,0 +1,66 @@
+"""
+Benchmark: peak memory of a run with and without releasing dead outputs.
+
+A chain of NODES nodes, each producing a fresh PAYLOAD_BYTES result read only by the
+next node (think documents passed from step to step), then a small End node.
+Peak traced memory (tracemalloc) is measured for WorkflowRunner and for the generated
+LangGraph graph, keeping every output vs. `release_outputs`.
+
+    uv run python benchmarks/bench_liveness.py
+"""
+import asyncio
+import time
+import tracemalloc
+from typing import Any, Dict
+from wfir.compiler.cache import compile_ir
+from wfir.compiler.langgraph.pool import load_module
+from wfir.models import WorkflowIR
+from wfir.runner import WorkflowRunner
+from wfir.runtime.base import Context
+from wfir.runtime.nodes import EmptyParams, NodeDef, NodeImplementation
+from wfir.runtime.registry import NodeRegistry
+
+NODES = 50
+PAYLOAD_BYTES = 1 << 20
+
+class PayloadNode(NodeImplementation[EmptyParams]):
+    """Produces a new PAYLOAD_BYTES buffer, like a transform over its input."""
+    blocking = False
+    side_effects = False
+
+    def execute(self, inputs: Dict[str, Any], context: Context, node_def: NodeDef[EmptyParams]) -> Any:
+        return bytes(PAYLOAD_BYTES)
+
+def chain() -> WorkflowIR:
+    nodes = [{"id": "n0", "type": "Payload"}]
+    for i in range(1, NODES):
+        nodes.append({"id": f"n{i}", "type": "Payload", "inputs": {"data": {"valueFrom": {"nodeId": f"n{i - 1}"}}}})
+    nodes.append({"id": "end", "type": "EndNode", "inputs": {"size": {"value": PAYLOAD_BYTES}, "last": {"valueFrom": {"nodeId": f"n{NODES - 1}"}}}})
+    edges = [{"source": a["id"], "target": b["id"]} for a, b in zip(nodes, nodes[1:])]
+    return WorkflowIR.model_validate({"name": "Payload chain", "nodes": nodes, "edges": edges})
+
+def measure(run) -> tuple:
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = run()
+    seconds = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return peak, seconds
+
+def main():
+    NodeRegistry.register("Payload", PayloadNode)
+    workflow = chain()
+    print(f"{NODES}-node chain, {PAYLOAD_BYTES >> 10} KiB per output")
+    for release in (False, True):
+        def runner_run():
+            return asyncio.run(WorkflowRunner.from_runtime(workflow, release_outputs=release).run())
+
+        app = load_module(compile_ir(workflow, release_outputs=release), f"bench_liveness_{release}").build_graph().compile()
+        for label, run in (("runner", runner_run), ("langgraph", lambda: app.invoke({}))):
+            peak, seconds = measure(run)
+            print(f"{label:<10} release_outputs={str(release):<5}  peak {peak / (1 << 20):7.1f} MiB   {seconds * 1e3:7.1f} ms")
+
+if __name__ == "__main__":
+    main()
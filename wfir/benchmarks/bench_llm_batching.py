@@ -0,0 +1,76 @@
+"""
+Benchmark: latency/throughput trade-off of LLM micro-batching.
+
+CALLS requests arrive at RATE per second against the mock provider, given a cost model:
+each provider request takes REQUEST_OVERHEAD plus PER_ITEM per message it carries, and
+at most PROVIDER_CONCURRENCY requests run at once (a rate-limited API). Without batching
+every call is one request; with a window, calls within it share one `abatch` request.
+
+    uv run python benchmarks/bench_llm_batching.py
+"""
+import asyncio
+import statistics
+import time
+from typing import Any, List, Optional
+from langchain_core.messages import HumanMessage
+from wfir.runtime.llm import MicroBatcher, MockChatModel
+
+CALLS = 500
+RATE = 1000
+REQUEST_OVERHEAD = 0.02
+PER_ITEM = 0.001
+PROVIDER_CONCURRENCY = 4
+WINDOWS_MS = [0, 2, 5, 10, 25]
+
+_slots: Optional[asyncio.Semaphore] = None
+
+class SimulatedProvider(MockChatModel):
+    """The mock provider with request costs; `abatch` is one request for all inputs."""
+
+    async def ainvoke(self, input: Any, config: Any = None, **kwargs: Any) -> Any:
+        async with _slots:
+            await asyncio.sleep(REQUEST_OVERHEAD + PER_ITEM)
+        return self.invoke(input)
+
+    async def abatch(self, inputs: List[Any], config: Any = None, *, return_exceptions: bool = False, **kwargs: Any) -> List[Any]:
+        async with _slots:
+            await asyncio.sleep(REQUEST_OVERHEAD + PER_ITEM * len(inputs))
+        return [self.invoke(messages) for messages in inputs]
+
+async def run(window_ms: float):
+    global _slots
+    _slots = asyncio.Semaphore(PROVIDER_CONCURRENCY)
+    model = SimulatedProvider(model_name="sim")
+    batcher = MicroBatcher(window=window_ms / 1000, max_batch_size=64)
+    latencies: List[float] = []
+
+    async def call(i: int):
+        start = time.perf_counter()
+        messages = [HumanMessage(content=f"q{i}")]
+        if window_ms:
+            await batcher.ainvoke(model, messages)
+        else:
+            await model.ainvoke(messages)
+        latencies.append(time.perf_counter() - start)
+
+    tasks = []
+    start = time.perf_counter()
+    for i in range(CALLS):
+        tasks.append(asyncio.create_task(call(i)))
+        # Arrivals at RATE per second
+        await asyncio.sleep(max(0.0, start + (i + 1) / RATE - time.perf_counter()))
+    await asyncio.gather(*tasks)
+    wall = time.perf_counter() - start
+    latencies.sort()
+    requests = batcher.batches if window_ms else CALLS
+    return CALLS / wall, statistics.median(latencies), latencies[int(len(latencies) * 0.95)], requests
+
+def main():
+    print(f"{CALLS} calls at {RATE}/s; provider {REQUEST_OVERHEAD * 1e3:.0f} ms + {PER_ITEM * 1e3:.0f} ms/item, {PROVIDER_CONCURRENCY} concurrent")
+    for window_ms in WINDOWS_MS:
+        throughput, p50, p95, requests = asyncio.run(run(window_ms))
+        label = "no batching" if not window_ms else f"window {window_ms} ms"
+        print(f"{label:<14} {throughput:7.0f} calls/s   p50 {p50 * 1e3:7.1f} ms   p95 {p95 * 1e3:7.1f} ms   provider requests {requests}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Benchmark: strict vs trusted loading of large WFIR JSON files.
+
+    baseline  json.load + WorkflowIR(**data) (what the CLI used to do)
+    strict    WorkflowLoader.load: orjson + pydantic validation
+    trusted   WorkflowLoader.load(trusted=True): orjson + validation with the edge
+              check and graph index deferred to first use
+    cached    repeated load of identical content (hash lookup only)
+
+    uv run python benchmarks/bench_loader.py
+"""
+import gc
+import json
+import os
+import tempfile
+import time
+from wfir.models import WorkflowIR
+from wfir.loader import WorkflowLoader
+
+def large_ir(size: int) -> dict:
+    nodes = [{"id": "start", "type": "StartNode", "metadata": {"position": {"x": 0, "y": 0}}}]
+    edges = []
+    for i in range(1, size):
+        prev = nodes[-1]["id"]
+        nodes.append({
+            "id": f"llm-{i}",
+            "type": "LLM",
+            "inputs": {"prompt": {"valueFrom": {"nodeId": prev}}, "temperature": 0.5},
+            "params": {"provider": "openai", "model": "gpt-4o", "system_prompt": "Be brief."},
+            "metadata": {"position": {"x": i * 10, "y": 0}},
+        })
+        edges.append({"source": prev, "target": f"llm-{i}"})
+    return {"name": "Large", "nodes": nodes, "edges": edges}
+
+def timed(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main(sizes=(1_000, 10_000, 50_000), repeat: int = 5):
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in sizes:
+            path = os.path.join(tmp, f"ir-{size}.json")
+            with open(path, "w") as f:
+                json.dump(large_ir(size), f)
+
+            def read() -> bytes:
+                with open(path, "rb") as f:
+                    return f.read()
+
+            def baseline():
+                with open(path) as f:
+                    WorkflowIR(**json.load(f))
+
+            baseline_time = timed(baseline, repeat)
+            strict_time = timed(lambda: WorkflowLoader().load(read()), repeat)
+            trusted_time = timed(lambda: WorkflowLoader().load(read(), trusted=True), repeat)
+            loader = WorkflowLoader()
+            loader.load(read())
+            cached_time = timed(lambda: loader.load(read()), repeat)
+
+            print(f"{size} nodes ({os.path.getsize(path) / 1e6:.1f} MB)")
+            print(f"  baseline: {baseline_time * 1e3:8.1f} ms")
+            print(f"  strict:   {strict_time * 1e3:8.1f} ms")
+            print(f"  trusted:  {trusted_time * 1e3:8.1f} ms ({baseline_time / trusted_time:.1f}x)")
+            print(f"  cached:   {cached_time * 1e3:8.1f} ms ({baseline_time / cached_time:.1f}x)")
+
+if __name__ == "__main__":
+    main()
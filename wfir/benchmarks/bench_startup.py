@@ -0,0 +1,69 @@
+"""
+Benchmark: CLI startup time per command.
+
+For each command, reports the best wall time over a few runs and the slowest
+top-level imports from `python -X importtime` (cumulative, interpreter startup excluded).
+
+    --help     argparse only
+    validate   loader + pydantic models + verifier
+    compile    adds the transpiler and Jinja
+
+    uv run python benchmarks/bench_startup.py
+"""
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+RUNS = 5
+TOP = 5
+
+def write_workflow(path: str):
+    with open(path, "w") as f:
+        json.dump({
+            "name": "Startup",
+            "nodes": [
+                {"id": "start", "type": "StartNode"},
+                {"id": "llm", "type": "LLM", "inputs": {"prompt": {"valueFrom": {"nodeId": "start"}}}, "params": {"provider": "openai"}},
+                {"id": "end", "type": "EndNode", "inputs": {"x": {"valueFrom": {"nodeId": "llm"}}}},
+            ],
+            "edges": [{"source": "start", "target": "llm"}, {"source": "llm", "target": "end"}],
+        }, f)
+
+def wall_time(args) -> float:
+    best = float("inf")
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-m", "wfir.cli", *args], capture_output=True, check=True)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def top_imports(args):
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-m", "wfir.cli", *args], capture_output=True, text=True)
+    entries = []
+    for line in proc.stderr.splitlines():
+        if line.startswith("import time:"):
+            _, cumulative, name = line[len("import time:"):].split("|")
+            if cumulative.strip().isdigit():
+                entries.append((name[1:].rstrip(), int(cumulative)))
+    first = next(i for i, (name, _) in enumerate(entries) if name.strip().startswith("wfir"))
+    top_level = [(name, us) for name, us in entries[first:] if not name.startswith(" ")]
+    return sum(us for _, us in top_level), len(entries), sorted(top_level, key=lambda e: -e[1])[:TOP]
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "wf.json")
+        write_workflow(path)
+        commands = {"--help": ["--help"], "validate": ["validate", path], "compile": ["compile", path]}
+
+        for label, args in commands.items():
+            wall = wall_time(args)
+            total, modules, top = top_imports(args)
+            print(f"{label:<9} wall {wall * 1e3:7.1f} ms   imports {total / 1e3:7.1f} ms ({modules} modules)")
+            for name, us in top:
+                print(f"          {us / 1e3:7.1f} ms  {name.strip()}")
+
+if __name__ == "__main__":
+    main()
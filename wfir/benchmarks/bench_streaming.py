@@ -0,0 +1,67 @@
+"""
+Benchmark: time to first token with and without `stream` on an LLM-like node.
+
+A simulated provider takes FIRST_TOKEN_DELAY before its first token and
+TOKEN_DELAY per token after that. Without streaming, a client sees output only
+when the node ends; with streaming, `WorkflowRunner.events()` reports each
+token as it is produced.
+
+    uv run python benchmarks/bench_streaming.py
+"""
+import asyncio
+import time
+from typing import Any, AsyncIterator, Dict
+from wfir.models import WorkflowIR, Node, Edge, InputValue
+from wfir.runner import WorkflowRunner
+from wfir.runtime.base import Context
+from wfir.runtime.nodes import EmptyParams, NodeDef, NodeImplementation
+from wfir.runtime.registry import NodeRegistry
+
+FIRST_TOKEN_DELAY = 0.2
+TOKEN_DELAY = 0.01
+TOKENS = 200
+
+class SlowProviderNode(NodeImplementation[EmptyParams]):
+    blocking = False
+    streaming = True
+
+    async def astream(self, inputs: Dict[str, Any], context: Context, node_def: NodeDef[EmptyParams]) -> AsyncIterator[str]:
+        await asyncio.sleep(FIRST_TOKEN_DELAY)
+        for i in range(TOKENS):
+            if i:
+                await asyncio.sleep(TOKEN_DELAY)
+            yield f" t{i}"
+
+    async def aexecute(self, inputs: Dict[str, Any], context: Context, node_def: NodeDef[EmptyParams]) -> Any:
+        return "".join([chunk async for chunk in self.astream(inputs, context, node_def)])
+
+def workflow(stream: bool) -> WorkflowIR:
+    return WorkflowIR(
+        name="Stream",
+        nodes=[
+            Node(id="start", type="StartNode"),
+            Node(id="llm", type="SlowProvider", stream=stream, inputs={"prompt": InputValue(value="hi")}),
+            Node(id="end", type="EndNode"),
+        ],
+        edges=[Edge(source="start", target="llm"), Edge(source="llm", target="end")],
+    )
+
+async def first_output(stream: bool):
+    """Seconds until the client first sees LLM output, and until the run ends."""
+    runner = WorkflowRunner.from_runtime(workflow(stream))
+    start = time.perf_counter()
+    first = None
+    async for event in runner.events():
+        if first is None and event["node"] == "llm" and event["event"] in ("token", "node_end"):
+            first = time.perf_counter() - start
+    return first, time.perf_counter() - start
+
+def main():
+    NodeRegistry.register("SlowProvider", SlowProviderNode)
+    print(f"provider: {FIRST_TOKEN_DELAY * 1e3:.0f} ms to first token, {TOKENS} tokens every {TOKEN_DELAY * 1e3:.0f} ms")
+    for stream in (False, True):
+        first, total = asyncio.run(first_output(stream))
+        print(f"stream={str(stream):<5}  first output {first * 1e3:7.1f} ms   total {total * 1e3:7.1f} ms")
+
+if __name__ == "__main__":
+    main()
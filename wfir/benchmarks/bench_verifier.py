@@ -0,0 +1,72 @@
+"""
+Benchmark: WorkflowVerifier scaling at 1k, 10k and 100k nodes.
+
+The graph mixes linear chains, Condition diamonds and Loop back-edges, with every
+node reading from its predecessor. Verification (cycle detection, dominator-based
+data-flow and param checks) should stay at a roughly constant cost per node.
+
+    uv run python benchmarks/bench_verifier.py
+"""
+import time
+from wfir.models import WorkflowIR
+from wfir.verifier import WorkflowVerifier
+
+def large_workflow(size: int) -> WorkflowIR:
+    nodes = [{"id": "start", "type": "StartNode"}]
+    edges = []
+    prev = "start"
+    i = 1
+    while len(nodes) < size - 3:
+        if i % 20 == 0:
+            # Diamond: cond -> (yes | no) -> join
+            cond, yes, no, join = f"cond-{i}", f"yes-{i}", f"no-{i}", f"join-{i}"
+            nodes.append({"id": cond, "type": "Condition", "inputs": {"x": {"valueFrom": {"nodeId": prev}}},
+                          "params": {"expression": "x is not None", "true_target": yes, "false_target": no}})
+            nodes.append({"id": yes, "type": "LLM", "inputs": {"prompt": {"valueFrom": {"nodeId": cond}}}})
+            nodes.append({"id": no, "type": "LLM", "inputs": {"prompt": {"valueFrom": {"nodeId": cond}}}})
+            nodes.append({"id": join, "type": "LLM", "inputs": {"prompt": {"valueFrom": {"nodeId": cond}}}})
+            edges += [{"source": prev, "target": cond}, {"source": cond, "target": yes}, {"source": cond, "target": no},
+                      {"source": yes, "target": join}, {"source": no, "target": join}]
+            prev = join
+        elif i % 20 == 10:
+            # Loop: loop -> body -> loop, loop -> exit
+            loop, body = f"loop-{i}", f"body-{i}"
+            nodes.append({"id": loop, "type": "Loop", "inputs": {"x": {"valueFrom": {"nodeId": prev}}},
+                          "params": {"expression": "x < 3", "body_target": body, "end_target": f"after-{i}"}})
+            nodes.append({"id": body, "type": "LLM", "inputs": {"prompt": {"valueFrom": {"nodeId": loop}}}})
+            nodes.append({"id": f"after-{i}", "type": "LLM", "inputs": {"prompt": {"valueFrom": {"nodeId": loop}}}})
+            edges += [{"source": prev, "target": loop}, {"source": loop, "target": body},
+                      {"source": body, "target": loop}, {"source": loop, "target": f"after-{i}"}]
+            prev = f"after-{i}"
+        else:
+            node_id = f"llm-{i}"
+            nodes.append({"id": node_id, "type": "LLM", "inputs": {"prompt": {"valueFrom": {"nodeId": prev}}}})
+            edges.append({"source": prev, "target": node_id})
+            prev = node_id
+        i += 1
+    nodes.append({"id": "end", "type": "EndNode", "inputs": {"result": {"valueFrom": {"nodeId": prev}}}})
+    edges.append({"source": prev, "target": "end"})
+    return WorkflowIR(name="Large", nodes=nodes, edges=edges)
+
+def main(sizes=(1_000, 10_000, 100_000), repeat: int = 3):
+    print(f"{'nodes':>8} {'edges':>8} {'index':>10} {'verify':>10} {'per node':>10}")
+    for size in sizes:
+        workflow = large_workflow(size)
+
+        start = time.perf_counter()
+        workflow.invalidate_graph()
+        graph = workflow.graph
+        index_time = time.perf_counter() - start
+
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            errors = WorkflowVerifier(workflow).verify()
+            best = min(best, time.perf_counter() - start)
+        assert errors == [], errors[:3]
+
+        count = len(graph)
+        print(f"{count:>8} {len(workflow.edges):>8} {index_time * 1e3:>8.1f}ms {best * 1e3:>8.1f}ms {best / count * 1e6:>8.2f}us")
+
+if __name__ == "__main__":
+    main()
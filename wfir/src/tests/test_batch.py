@@ -0,0 +1,104 @@
+import json
+import os
+import pytest
+from wfir.compiler.batch import MANIFEST_NAME, collect_inputs, compile_many, output_paths
+
+def _write_workflow(path, name="Batch"):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        json.dump({
+            "name": name,
+            "nodes": [
+                {"id": "start", "type": "StartNode"},
+                {"id": "end", "type": "EndNode", "inputs": {"x": {"valueFrom": {"nodeId": "start"}}}},
+            ],
+            "edges": [{"source": "start", "target": "end"}],
+        }, f)
+
+def test_collect_inputs_and_output_paths(tmp_path):
+    _write_workflow(str(tmp_path / "a" / "wf.json"))
+    _write_workflow(str(tmp_path / "b" / "wf.json"))
+    (tmp_path / "b" / "notes.txt").write_text("ignored")
+
+    inputs = collect_inputs([str(tmp_path), str(tmp_path / "a" / "*.json")])
+    assert inputs == [str(tmp_path / "a" / "wf.json"), str(tmp_path / "b" / "wf.json")]
+
+    # Same file name in different directories doesn't collide
+    outputs = output_paths(inputs, "out")
+    assert outputs[inputs[0]] == os.path.join("out", "a", "wf.py")
+    assert outputs[inputs[1]] == os.path.join("out", "b", "wf.py")
+
+def test_inputs_sharing_an_output_are_rejected(tmp_path):
+    from wfir import binary
+    from wfir.loader import load_workflow
+
+    _write_workflow(str(tmp_path / "in" / "wf.json"))
+    with open(tmp_path / "in" / "wf.json", "rb") as f:
+        (tmp_path / "in" / "wf.wfirb").write_bytes(binary.dumps(load_workflow(f.read())))
+
+    inputs = collect_inputs([str(tmp_path / "in")])
+    with pytest.raises(ValueError, match="wf.py"):
+        compile_many(inputs, str(tmp_path / "out"))
+    assert not (tmp_path / "out").exists()
+
+def test_compile_many_skips_unchanged_inputs(tmp_path):
+    first, second = str(tmp_path / "in" / "first.json"), str(tmp_path / "in" / "second.json")
+    _write_workflow(first, "First")
+    _write_workflow(second, "Second")
+    (tmp_path / "in" / "bad.json").write_text('{"name": "Bad"}')
+    out = str(tmp_path / "out")
+    inputs = collect_inputs([str(tmp_path / "in")])
+
+    results, _ = compile_many(inputs, out, jobs=1)
+    assert [r.status for r in results] == ["failed", "compiled", "compiled"]
+    assert results[0].error.startswith("ValidationError")
+    assert "StateGraph" in (tmp_path / "out" / "first.py").read_text()
+
+    _write_workflow(second, "Second, edited")
+    results, _ = compile_many(inputs, out, jobs=1)
+    assert [r.status for r in results] == ["failed", "skipped", "compiled"]
+
+    # Options are part of the key
+    results, _ = compile_many(inputs, out, jobs=1, parallel=True)
+    assert [r.status for r in results] == ["failed", "compiled", "compiled"]
+
+    with open(os.path.join(out, MANIFEST_NAME)) as f:
+        assert sorted(json.load(f)["outputs"]) == ["first.py", "second.py"]
+
+def test_output_dir_inside_an_input_dir(tmp_path):
+    _write_workflow(str(tmp_path / "wf" / "a.json"))
+    out = str(tmp_path / "wf" / "out")
+    for status in ("compiled", "skipped"):
+        inputs = collect_inputs([str(tmp_path / "wf")], out)
+        assert inputs == [str(tmp_path / "wf" / "a.json")]
+        results, _ = compile_many(inputs, out, jobs=1)
+        assert [r.status for r in results] == [status]
+    # The manifest is never an input, even without knowing the output directory
+    assert collect_inputs([str(tmp_path / "wf")]) == inputs
+
+def test_compile_many_releases_outputs(tmp_path):
+    _write_workflow(str(tmp_path / "in" / "wf.json"))
+    inputs = collect_inputs([str(tmp_path / "in")])
+    out = str(tmp_path / "out")
+
+    results, _ = compile_many(inputs, out, jobs=1)
+    kept = (tmp_path / "out" / "wf.py").read_text()
+    results, _ = compile_many(inputs, out, jobs=1, release_outputs=True)
+    assert [r.status for r in results] == ["compiled"]
+    released = (tmp_path / "out" / "wf.py").read_text()
+    # End is the last reader of start's output, so it clears it
+    assert '"start_output": None' in released and '"start_output": None' not in kept
+    results, _ = compile_many(inputs, out, jobs=1, release_outputs=True)
+    assert [r.status for r in results] == ["skipped"]
+
+def test_compile_many_process_pool(tmp_path):
+    inputs = []
+    for i in range(4):
+        path = str(tmp_path / "in" / f"wf{i}.json")
+        _write_workflow(path, f"Workflow {i}")
+        inputs.append(path)
+
+    results, _ = compile_many(inputs, str(tmp_path / "out"), jobs=2)
+    assert [r.status for r in results] == ["compiled"] * 4
+    for i in range(4):
+        assert f"wf{i}.py" in os.listdir(tmp_path / "out")
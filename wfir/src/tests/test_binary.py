@@ -0,0 +1,84 @@
+import json
+import os
+import pytest
+from wfir import binary
+from wfir.cli import convert_workflow
+from wfir.loader import WorkflowLoader
+from wfir.models import WorkflowIR
+
+EXAMPLE = os.path.join(os.path.dirname(__file__), "..", "..", "..", "example.json")
+
+def _workflow() -> WorkflowIR:
+    return WorkflowIR(**{
+        "version": "0.2.0",
+        "name": "Binäry ✓",
+        "variables": {"topic": "String", "limit": 3},
+        "nodes": [
+            {"id": "start", "type": "StartNode", "metadata": {"position": {"x": 1.5, "y": -2}, "note": "keep"}},
+            {"id": "llm", "type": "LLM", "stream": True,
+             "inputs": {"prompt": {"valueFrom": {"nodeId": "start"}}, "empty": {"value": None}, "cfg": {"nested": [1, -2**40, 2.5, True, None, "s"]}},
+             "outputs": {"text": "String"},
+             "params": {"provider": "mock", "temperature": 0.0, "stop": [], "extra": {}}},
+            {"id": "end", "type": "EndNode", "inputs": {"result": {"valueFrom": {"nodeId": "llm"}}}},
+        ],
+        "edges": [
+            {"source": "start", "target": "llm", "sourceHandle": "out", "targetHandle": "in"},
+            {"source": "llm", "target": "end", "condition": "ok"},
+        ],
+    })
+
+def test_round_trip_is_exact():
+    workflow = _workflow()
+    decoded = binary.loads(binary.dumps(workflow))
+    assert decoded == workflow
+    # int/float distinction survives
+    assert type(decoded.nodes[1].params["temperature"]) is float
+    assert decoded.content_hash() == workflow.content_hash()
+
+def test_example_is_smaller_than_json():
+    with open(EXAMPLE) as f:
+        data = json.load(f)
+    workflow = WorkflowIR(**data)
+    encoded = binary.dumps(workflow)
+    assert len(encoded) < len(json.dumps(data, separators=(",", ":"))) / 2
+    assert binary.loads(encoded, trusted=True) == workflow
+
+def test_strings_with_nul_and_big_ints():
+    workflow = _workflow()
+    workflow.nodes[1].params.update({"sep": "a\x00b", "big": 2**80, "neg": -2**80})
+    decoded = binary.loads(binary.dumps(workflow))
+    assert decoded.nodes[1].params == workflow.nodes[1].params
+
+def test_strip_metadata_keeps_non_ui_keys():
+    encoded = binary.dumps(_workflow(), strip_metadata=True)
+    data, stripped = binary.decode(encoded)
+    assert stripped
+    assert data["nodes"][0]["metadata"] == {"note": "keep"}
+    assert len(encoded) < len(binary.dumps(_workflow()))
+
+def test_corrupt_input_is_rejected():
+    encoded = binary.dumps(_workflow())
+    with pytest.raises(ValueError, match="Corrupt"):
+        binary.decode(encoded[:-3])
+    with pytest.raises(ValueError, match="Corrupt"):
+        binary.decode(encoded + b"\x00")
+    # Section sizes intact but the op stream runs out early
+    blob_len, ops_len, _, _ = binary._SECTIONS.unpack_from(encoded, binary._PREAMBLE - binary._SECTIONS.size)
+    truncated = bytearray(encoded)
+    truncated[11:15] = (ops_len - 1).to_bytes(4, "little")
+    del truncated[binary._PREAMBLE + blob_len + ops_len - 1]
+    with pytest.raises(ValueError, match="unexpected end"):
+        binary.decode(bytes(truncated))
+    with pytest.raises(ValueError, match="bad magic"):
+        binary.decode(b"{}")
+
+def test_loader_and_cli_accept_binary(tmp_path):
+    encoded = binary.dumps(_workflow())
+    assert WorkflowLoader().load(encoded).name == "Binäry ✓"
+
+    source = tmp_path / "wf.json"
+    source.write_text(json.dumps(_workflow().model_dump(mode="json", by_alias=True)))
+    assert convert_workflow(str(source), str(tmp_path / "wf.wfirb")) == len(encoded)
+    convert_workflow(str(tmp_path / "wf.wfirb"), str(tmp_path / "back.json"))
+    back = WorkflowIR(**json.loads((tmp_path / "back.json").read_text()))
+    assert back == _workflow()
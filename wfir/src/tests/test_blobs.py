@@ -0,0 +1,79 @@
+import pickle
+from typing import Any, Dict
+import pytest
+from wfir.models import WorkflowIR
+from wfir.runner import WorkflowRunner
+from wfir.runtime.base import Blob, BlobStore, Context, resolve_blobs, set_blob_store
+from wfir.runtime.nodes import EmptyParams, NodeDef, NodeImplementation
+from wfir.runtime.registry import NodeRegistry
+
+SIZE = 4096
+
+@pytest.fixture
+def store(tmp_path):
+    store = BlobStore(threshold=1024, directory=str(tmp_path), mmap_threshold=8192)
+    set_blob_store(store)
+    yield store
+    set_blob_store(None)
+    store.clear()
+
+def test_store_wraps_large_values(store):
+    assert store.wrap("small") == "small"
+    text = store.wrap("é" * SIZE)
+    assert isinstance(text, Blob) and text.is_text and len(text) == 2 * SIZE
+    assert text.materialize() == "é" * SIZE
+
+    data = bytearray(b"x" * SIZE)
+    blob = store.wrap(data)
+    # In-memory blobs keep the caller's buffer; views don't copy it
+    assert blob.view().obj is data
+    assert resolve_blobs({"body": blob, "status": 200}, "view")["body"].obj is data
+
+    output = store.wrap({"status": 200, "body": "y" * SIZE})
+    assert output["status"] == 200 and isinstance(output["body"], Blob)
+    assert store.blobs == 3
+
+def test_file_backed_blobs_pickle_as_a_path(store, tmp_path):
+    blob = store.put(b"z" * 10000)
+    assert blob.path is not None and blob.path.startswith(str(tmp_path))
+    assert blob.view()[:3] == b"zzz"
+
+    copy = pickle.loads(pickle.dumps(blob))
+    assert len(pickle.dumps(blob)) < 500
+    assert copy.materialize() == b"z" * 10000
+
+    store.clear()
+    assert not list(tmp_path.iterdir())
+
+class SizeNode(NodeImplementation[EmptyParams]):
+    """Reads its input the way `blob_inputs` says."""
+    blocking = False
+    seen: Dict[str, Any] = {}
+
+    def execute(self, inputs: Dict[str, Any], context: Context, node_def: NodeDef[EmptyParams]) -> Any:
+        SizeNode.seen[node_def.node_id] = inputs.get("data")
+        if "make" in inputs:
+            return "d" * inputs["make"]
+        return len(inputs["data"])
+
+class ViewSizeNode(SizeNode):
+    blob_inputs = "view"
+
+@pytest.mark.asyncio
+async def test_runner_passes_handles_between_nodes(store, monkeypatch):
+    monkeypatch.setitem(NodeRegistry._registry, "Size", SizeNode)
+    monkeypatch.setitem(NodeRegistry._registry, "ViewSize", ViewSizeNode)
+    workflow = WorkflowIR(name="Blobs", nodes=[
+        {"id": "make", "type": "Size", "inputs": {"make": SIZE}},
+        {"id": "copy", "type": "Size", "inputs": {"data": {"valueFrom": {"nodeId": "make"}}}},
+        {"id": "view", "type": "ViewSize", "inputs": {"data": {"valueFrom": {"nodeId": "make"}}}},
+        {"id": "end", "type": "EndNode", "inputs": {"data": {"valueFrom": {"nodeId": "make"}}}},
+    ], edges=[])
+
+    results = await WorkflowRunner.from_runtime(workflow).run()
+    assert isinstance(results["make"], Blob)
+    assert SizeNode.seen["copy"] == "d" * SIZE
+    assert isinstance(SizeNode.seen["view"], memoryview)
+    assert results["copy"] == results["view"] == SIZE
+    # End nodes pass the handle through
+    assert results["end"]["data"] is results["make"]
@@ -0,0 +1,131 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict
+import pytest
+from wfir.runtime.base import Context
+from wfir.runtime.coalesce import SingleFlight, coalescer
+from wfir.runtime.nodes import HTTPNode, HTTPParams, LLMNode, LLMParams, NodeDef, NodeImplementation, ToolParams
+from wfir.runtime.registry import NodeRegistry, Runtime
+
+def test_threads_share_one_call():
+    flight = SingleFlight()
+    calls = []
+    release = threading.Event()
+
+    def upstream(x):
+        calls.append(x)
+        release.wait(5)
+        return {"value": x}
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        futures = [pool.submit(flight.do, "key", upstream, 1) for _ in range(8)]
+        while flight.shared < 7:
+            time.sleep(0.001)
+        release.set()
+        results = [f.result() for f in futures]
+
+    assert calls == [1]
+    assert all(r is results[0] for r in results)
+    assert flight.stats() == {"calls": 1, "shared": 7}
+    # The key is released once the call finishes
+    assert flight.do("key", upstream, 2) == {"value": 2}
+
+@pytest.mark.asyncio
+async def test_coroutines_share_result_and_errors():
+    flight = SingleFlight()
+    calls = 0
+
+    async def upstream(fail):
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        if fail:
+            raise RuntimeError("upstream down")
+        return calls
+
+    assert await asyncio.gather(*(flight.ado("a", upstream, False) for _ in range(5))) == [1] * 5
+    results = await asyncio.gather(*(flight.ado("b", upstream, True) for _ in range(3)), return_exceptions=True)
+    assert calls == 2
+    assert all(isinstance(r, RuntimeError) for r in results)
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_leaves_the_others_alone():
+    flight = SingleFlight()
+
+    async def upstream():
+        await asyncio.sleep(0.05)
+        return "done"
+
+    leader = asyncio.create_task(flight.ado("k", upstream))
+    await asyncio.sleep(0)
+    waiters = [asyncio.create_task(flight.ado("k", upstream)) for _ in range(3)]
+    await asyncio.sleep(0.01)
+    waiters[0].cancel()
+
+    assert await leader == "done"
+    assert [await w for w in waiters[1:]] == ["done", "done"]
+    with pytest.raises(asyncio.CancelledError):
+        await waiters[0]
+    assert flight.stats() == {"calls": 1, "shared": 3}
+
+@pytest.mark.asyncio
+async def test_async_waiter_joins_threaded_leader():
+    flight = SingleFlight()
+    started = threading.Event()
+
+    def upstream():
+        started.set()
+        time.sleep(0.05)
+        return "done"
+
+    leader = asyncio.get_running_loop().run_in_executor(None, flight.do, "k", upstream)
+    await asyncio.to_thread(started.wait, 5)
+    assert await flight.ado("k", asyncio.sleep, 0) == "done"
+    assert await leader == "done"
+    assert flight.stats() == {"calls": 1, "shared": 1}
+
+def test_coalesce_keys():
+    llm = LLMNode()
+    llm_def = NodeDef(params=LLMParams(provider="mock", model="m"), node_id="a")
+    assert llm.coalesce_key({"prompt": "hi"}, llm_def) == llm.coalesce_key({"prompt": "hi"}, llm_def.model_copy(update={"node_id": "b"}))
+    assert llm.coalesce_key({"prompt": "hi"}, llm_def) != llm.coalesce_key({"prompt": "hello"}, llm_def)
+    assert llm.coalesce_key({"prompt": "hi"}, llm_def.model_copy(update={"stream": True})) is None
+
+    http = HTTPNode()
+    assert http.coalesce_key({}, NodeDef(params=HTTPParams(url="http://x"), node_id="a")) is not None
+    assert http.coalesce_key({}, NodeDef(params=HTTPParams(url="http://x", method="POST"), node_id="a")) is None
+    # Stricter limits get their own request
+    loose = http.coalesce_key({}, NodeDef(params=HTTPParams(url="http://x"), node_id="a"))
+    assert http.coalesce_key({}, NodeDef(params=HTTPParams(url="http://x", max_body_bytes=10), node_id="a")) != loose
+    assert http.coalesce_key({}, NodeDef(params=HTTPParams(url="http://x", timeout=1), node_id="a")) != loose
+
+class SlowLookupNode(NodeImplementation[ToolParams]):
+    params_model = ToolParams
+    coalesce = True
+    calls = 0
+
+    def coalesce_key(self, inputs: Dict[str, Any], node_def: NodeDef[ToolParams]):
+        return (node_def.params.tool_name, inputs.get("q"))
+
+    async def aexecute(self, inputs: Dict[str, Any], context: Context, node_def: NodeDef[ToolParams]) -> Any:
+        SlowLookupNode.calls += 1
+        await asyncio.sleep(0.01)
+        return f"result for {inputs['q']}"
+
+@pytest.mark.asyncio
+async def test_prepared_nodes_coalesce_when_enabled(monkeypatch):
+    monkeypatch.setitem(NodeRegistry._registry, "SlowLookup", SlowLookupNode)
+    node = Runtime.prepare_node("SlowLookup", {"id": "n", "params": {"tool_name": "search"}})
+    before = coalescer.calls
+
+    results = await asyncio.gather(*(node.aexecute({"q": q}, Context({})) for q in ["a", "a", "a", "b"]))
+    assert results == ["result for a"] * 3 + ["result for b"]
+    assert SlowLookupNode.calls == 2
+    assert coalescer.calls - before == 2
+
+    # Opt-in per type: with it off every execution calls upstream
+    monkeypatch.setattr(SlowLookupNode, "coalesce", False)
+    await asyncio.gather(*(node.aexecute({"q": "a"}, Context({})) for _ in range(3)))
+    assert SlowLookupNode.calls == 5
@@ -0,0 +1,79 @@
+import os
+import pytest
+from wfir.models import WorkflowIR
+from wfir.compiler import cache as cache_module
+from wfir.compiler.cache import CompileCache, compile_key, compile_ir
+
+def _workflow(name: str = "Cached") -> WorkflowIR:
+    return WorkflowIR(**{
+        "name": name,
+        "nodes": [
+            {"id": "start", "type": "StartNode", "params": {"b": 1, "a": 2}},
+            {"id": "end", "type": "EndNode", "inputs": {"x": {"valueFrom": {"nodeId": "start"}}}},
+        ],
+        "edges": [{"source": "start", "target": "end"}],
+    })
+
+def test_key_is_content_addressed():
+    key = compile_key(_workflow())
+    assert key == compile_key(_workflow())
+    # Dict ordering does not matter, content does
+    reordered = _workflow()
+    reordered.nodes[0].params = {"a": 2, "b": 1}
+    assert compile_key(reordered) == key
+    assert compile_key(_workflow("Other")) != key
+    assert compile_key(_workflow(), async_nodes=True) != key
+
+def test_memory_tier_compiles_once(monkeypatch):
+    calls = []
+    real_compile = cache_module.compile_ir
+
+    def counting_compile(*args, **kwargs):
+        calls.append(args)
+        return real_compile(*args, **kwargs)
+
+    monkeypatch.setattr(cache_module, "compile_ir", counting_compile)
+    cache = CompileCache()
+
+    key, code = cache.compile(_workflow())
+    key2, code2 = cache.compile(_workflow())
+    assert (key, code) == (key2, code2)
+    assert code == compile_ir(_workflow())
+    assert len(calls) == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+
+def test_memory_tier_is_bounded():
+    cache = CompileCache(max_entries=1)
+    cache.compile(_workflow("a"))
+    cache.compile(_workflow("b"))
+    cache.compile(_workflow("a"))
+    assert cache.misses == 3
+
+def test_disk_tier_survives_new_cache(tmp_path):
+    first = CompileCache(cache_dir=str(tmp_path))
+    key, code = first.compile(_workflow())
+    assert os.path.exists(os.path.join(tmp_path, key[:2], f"{key}.py"))
+
+    second = CompileCache(cache_dir=str(tmp_path))
+    assert second.compile(_workflow()) == (key, code)
+    assert (second.hits, second.misses) == (1, 0)
+
+def test_session_reuses_its_transpiler():
+    cache = CompileCache(max_sessions=1)
+    cache.compile(_workflow(), session="wf-1")
+    (_, transpiler), = cache._sessions.values()
+    assert transpiler.rendered_nodes == 2
+
+    edited = _workflow()
+    edited.nodes[0].params = {"a": 3}
+    _, code = cache.compile(edited, session="wf-1")
+    assert code == compile_ir(edited)
+    # Only the edited node was rendered again
+    assert transpiler.rendered_nodes == 1
+
+    cache.compile(_workflow("Other"), session="wf-2")
+    assert [key[0] for key in cache._sessions] == ["wf-2"]
+
+def test_unsupported_target():
+    with pytest.raises(ValueError, match="Unsupported target"):
+        CompileCache().compile(_workflow(), target="dify")
@@ -0,0 +1,59 @@
+import pytest
+from wfir.runtime.expressions import compile_expression, evaluate_expression, ExpressionError
+from wfir.runtime.nodes import ConditionNode, ConditionParams, LoopNode, LoopParams, NodeDef
+from wfir.runtime.base import Context
+
+def test_evaluate_by_name_and_alias():
+    inputs = {"val": 10, "items": [1, 2, 3]}
+    assert evaluate_expression("val > 5", inputs) is True
+    assert evaluate_expression("input['val'] > 5 and len_ok", {**inputs, "len_ok": True}) is True
+    assert evaluate_expression("items[-1] == 3", inputs) is True
+    assert evaluate_expression("'a' in input", inputs) is False
+
+def test_compiled_once_per_expression():
+    first = compile_expression("count < 3")
+    second = compile_expression("count < 3")
+    assert first is second
+    assert first.evaluate({"count": 1}) is True
+    assert first.evaluate({"count": 5}) is False
+
+@pytest.mark.parametrize("source", [
+    "__import__('os')",
+    "input.__class__",
+    "(lambda: 1)()",
+    "[x for x in input]",
+    "x := 1",
+    "val >",
+])
+def test_rejects_unsafe_or_invalid(source):
+    with pytest.raises(ExpressionError):
+        compile_expression(source)
+
+def test_no_builtins_available():
+    with pytest.raises(NameError):
+        evaluate_expression("len(items)", {"items": []})
+
+def test_condition_and_loop_nodes_route():
+    cond = ConditionNode()
+    node_def = NodeDef(
+        params=ConditionParams(expression="input['val'] > 5", true_target="yes", false_target="no"),
+        node_id="check"
+    )
+    assert cond.execute({"val": 10}, Context({}), node_def) == "yes"
+    assert cond.execute({"val": 1}, Context({}), node_def) == "no"
+
+    loop = LoopNode()
+    loop_def = NodeDef(
+        params=LoopParams(expression="count < 3", body_target="body", end_target="end"),
+        node_id="loop"
+    )
+    assert loop.execute({"count": 0}, Context({}), loop_def) == "body"
+    assert loop.execute({"count": 3}, Context({}), loop_def) == "end"
+
+def test_invalid_expression_routes_false():
+    cond = ConditionNode()
+    node_def = NodeDef(
+        params=ConditionParams(expression="__import__('os')", true_target="yes", false_target="no"),
+        node_id="check"
+    )
+    assert cond.execute({}, Context({}), node_def) == "no"
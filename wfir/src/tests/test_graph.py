@@ -0,0 +1,83 @@
+import pytest
+from wfir.models import WorkflowIR, Node, Edge
+
+def _workflow() -> WorkflowIR:
+    return WorkflowIR(**{
+        "name": "Graph",
+        "nodes": [
+            {"id": "start", "type": "StartNode"},
+            {"id": "a", "type": "LLM", "inputs": {"prompt": {"valueFrom": {"nodeId": "start"}}}},
+            {"id": "b", "type": "LLM", "inputs": {"x": {"valueFrom": {"nodeId": "start"}}, "y": {"valueFrom": {"nodeId": "ghost"}}}},
+            {"id": "end", "type": "EndNode", "inputs": {"a": {"valueFrom": {"nodeId": "a"}}, "b": {"valueFrom": {"nodeId": "b"}}}},
+        ],
+        "edges": [
+            {"source": "start", "target": "a"},
+            {"source": "start", "target": "b"},
+            {"source": "a", "target": "end"},
+            {"source": "b", "target": "end"},
+        ],
+    })
+
+def test_graph_index_adjacency():
+    graph = _workflow().graph
+    assert graph.ids == ["start", "a", "b", "end"]
+    start, a, b, end = (graph.index[n] for n in graph.ids)
+
+    assert list(graph.successors(start)) == [a, b]
+    assert list(graph.predecessors(end)) == [a, b]
+    assert [graph.edge(e).target for e in graph.out_edges(start)] == ["a", "b"]
+    assert graph.in_degree(start) == 0 and graph.out_degree(start) == 2
+
+    assert list(graph.producers(end)) == [a, b]
+    assert list(graph.consumers(start)) == [a, b]
+    assert graph.missing_refs == [(b, "y", "ghost")]
+
+    assert graph.is_dag
+    assert list(graph.topological_order) == [start, a, b, end]
+
+def test_graph_index_is_cached_and_rebuilt_on_structural_change():
+    workflow = _workflow()
+    graph = workflow.graph
+    assert workflow.graph is graph
+
+    workflow.nodes = workflow.nodes + [Node(id="extra", type="EndNode")]
+    assert workflow.graph is not graph
+    assert "extra" in workflow.graph.index
+
+    copy = workflow.model_copy(update={"edges": workflow.edges[:1]})
+    assert len(copy.graph.edge_source) == 1
+    assert len(workflow.graph.edge_source) == 4
+
+    # In-place edits that keep sizes need an explicit invalidation
+    workflow.edges[0] = Edge(source="end", target="start")
+    workflow.invalidate_graph()
+    assert not workflow.graph.is_dag
+
+def test_cached_graph_and_hash_do_not_affect_equality():
+    first, second = _workflow(), _workflow()
+    assert first == second
+    first.graph, first.content_hash()
+    assert first == second and second == first
+    assert first != second.model_copy(update={"name": "Other"})
+
+def test_cycle_gives_partial_order():
+    workflow = WorkflowIR(**{
+        "name": "Cycle",
+        "nodes": [{"id": "s", "type": "StartNode"}, {"id": "x", "type": "LLM"}, {"id": "y", "type": "LLM"}],
+        "edges": [{"source": "s", "target": "x"}, {"source": "x", "target": "y"}, {"source": "y", "target": "x"}],
+    })
+    assert not workflow.graph.is_dag
+    assert list(workflow.graph.topological_order) == [0]
+
+def test_invalid_edges_still_rejected():
+    with pytest.raises(ValueError, match="Edge target 'missing' does not exist"):
+        WorkflowIR(name="Bad", nodes=[Node(id="a", type="StartNode")], edges=[Edge(source="a", target="missing")])
+
+def test_large_graph_index():
+    size = 20_000
+    nodes = [Node(id=f"n{i}", type="LLM") for i in range(size)]
+    edges = [Edge(source=f"n{i}", target=f"n{i + 1}") for i in range(size - 1)]
+    graph = WorkflowIR(name="Large", nodes=nodes, edges=edges).graph
+    assert graph.is_dag
+    assert graph.topological_order[-1] == size - 1
+    assert list(graph.predecessors(size - 1)) == [size - 2]
@@ -0,0 +1,52 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from wfir.models import WorkflowIR
+from wfir.compiler.langgraph.pool import GraphPool
+
+def _workflow(name="Pool", prompt="hi"):
+    return WorkflowIR.model_validate({
+        "name": name,
+        "nodes": [
+            {"id": "start", "type": "StartNode"},
+            {"id": "llm", "type": "LLM", "inputs": {"prompt": {"value": prompt}}, "params": {"provider": "mock", "model": "m"}},
+            {"id": "end", "type": "EndNode", "inputs": {"text": {"valueFrom": {"nodeId": "llm"}}}},
+        ],
+        "edges": [{"source": "start", "target": "llm"}, {"source": "llm", "target": "end"}],
+    })
+
+def test_pool_builds_each_workflow_once():
+    pool = GraphPool()
+    graph = pool.get(_workflow())
+    # Equal content hits the same warm graph, even through a different model instance
+    assert pool.get(_workflow()) is graph
+    assert pool.peek(pool.key(_workflow())) is graph
+    assert (pool.misses, pool.hits) == (1, 2)
+    assert pool.get(_workflow(prompt="other")) is not graph
+
+def test_pool_concurrent_misses_build_once():
+    pool = GraphPool()
+    workflow = _workflow()
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        graphs = list(executor.map(lambda _: pool.get(workflow), range(16)))
+    assert all(g is graphs[0] for g in graphs)
+    assert pool.misses == 1
+
+def test_pool_lru_eviction():
+    pool = GraphPool(max_entries=2)
+    a, b, c = _workflow(prompt="a"), _workflow(prompt="b"), _workflow(prompt="c")
+    graph_a = pool.get(a)
+    pool.get(b)
+    pool.get(a)  # refresh 'a'
+    pool.get(c)  # evicts 'b'
+    assert len(pool) == 2
+    assert pool.peek(pool.key(b)) is None
+    assert pool.get(a) is graph_a
+
+def test_pooled_graph_runs_concurrently():
+    graph = GraphPool().get(_workflow())
+
+    async def run_many():
+        return await asyncio.gather(*(graph.ainvoke({}) for _ in range(10)))
+
+    states = asyncio.run(run_many())
+    assert all(s["end_output"] == {"text": "Mock response from m: hi"} for s in states)
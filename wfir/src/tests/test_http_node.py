@@ -0,0 +1,191 @@
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+import httpx
+import pytest
+from wfir.runtime import http_client
+from wfir.runtime.base import Blob, BlobStore, Context, set_blob_store
+from wfir.runtime.http_client import HTTPClientPool, RequestOptions, ResponseTooLarge
+from wfir.runtime.nodes import HTTPNode, HTTPParams, NodeDef
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Routes: /json, /echo, /flaky (503 until the third call), /slow, /big?size=N, /drop (closes mid-body)."""
+    protocol_version = "HTTP/1.1"  # keep-alive
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, status, body: bytes, content_type="application/json", headers=None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _handle(self):
+        server = self.server
+        url = urlsplit(self.path)
+        query = parse_qs(url.query)
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length).decode() if length else ""
+        with server.lock:
+            server.ports.add(self.client_address[1])
+            server.calls[url.path] = server.calls.get(url.path, 0) + 1
+            calls = server.calls[url.path]
+            server.active += 1
+            server.peak = max(server.peak, server.active)
+        try:
+            if url.path == "/json":
+                self._send(200, json.dumps({"ok": True, "query": query}).encode())
+            elif url.path == "/echo":
+                self._send(200, f"{self.command} {body}".encode(), "text/plain; charset=utf-8")
+            elif url.path == "/flaky":
+                if calls < 3:
+                    self._send(503, b"busy", "text/plain", {"Retry-After": "0"})
+                else:
+                    self._send(200, b'{"attempt": 3}')
+            elif url.path == "/slow":
+                time.sleep(float(query.get("delay", ["0.2"])[0]))
+                self._send(200, b"{}")
+            elif url.path == "/big":
+                size = int(query["size"][0])
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+                chunk = b"x" * 8192
+                for start in range(0, size, len(chunk)):
+                    part = chunk[:min(len(chunk), size - start)]
+                    self.wfile.write(f"{len(part):x}\r\n".encode() + part + b"\r\n")
+                self.wfile.write(b"0\r\n\r\n")
+            elif url.path == "/drop":
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain")
+                self.send_header("Content-Length", "100")
+                self.end_headers()
+                self.wfile.write(b"PART-ONE ")
+                self.wfile.flush()
+                time.sleep(0.05)
+                self.close_connection = True
+            else:
+                self._send(404, b"{}")
+        finally:
+            with server.lock:
+                server.active -= 1
+
+    do_GET = do_POST = do_PUT = _handle
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+    httpd.daemon_threads = True
+    httpd.lock = threading.Lock()
+    httpd.ports, httpd.calls, httpd.active, httpd.peak = set(), {}, 0, 0
+    thread = threading.Thread(target=httpd.serve_forever, kwargs={"poll_interval": 0.01}, daemon=True)
+    thread.start()
+    httpd.url = f"http://127.0.0.1:{httpd.server_address[1]}"
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+@pytest.fixture
+def pool(monkeypatch):
+    pool = HTTPClientPool(max_per_host=2)
+    monkeypatch.setattr(http_client, "_default_pool", pool)
+    yield pool
+    pool.close()
+
+def _node_def(url, **params):
+    stream = params.pop("stream", False)
+    return NodeDef(params=HTTPParams(url=url, **params), node_id="http", stream=stream)
+
+def test_http_node_sync_reuses_connections(server, pool):
+    node = HTTPNode()
+    for _ in range(5):
+        result = node.execute({"query": {"q": "wfir"}}, Context({}), _node_def(f"{server.url}/json"))
+        assert result["status"] == 200
+        assert result["body"] == {"ok": True, "query": {"q": ["wfir"]}}
+    # One keep-alive connection served every request
+    assert len(server.ports) == 1
+
+@pytest.mark.asyncio
+async def test_http_node_async_body_and_errors(server, pool):
+    node = HTTPNode()
+    result = await node.aexecute({"body": {"a": 1}}, Context({}), _node_def(f"{server.url}/echo", method="POST"))
+    assert result["body"] == 'POST {"a":1}'
+    missing = await node.aexecute({}, Context({}), _node_def(f"{server.url}/missing"))
+    assert missing["status"] == 404
+    await pool.aclose()
+
+def test_retries_with_backoff(server, pool):
+    options = RequestOptions("GET", f"{server.url}/flaky", retries=2, backoff=0.001)
+    assert pool.request(options)["body"] == {"attempt": 3}
+    assert server.calls["/flaky"] == 3
+
+    # Writes are not retried on a status, only on connection failures
+    server.calls.clear()
+    assert pool.request(RequestOptions("POST", f"{server.url}/flaky", retries=2, backoff=0.001))["status"] == 503
+    assert server.calls["/flaky"] == 1
+
+@pytest.mark.asyncio
+async def test_stream_is_not_retried_after_the_first_chunk(server, pool):
+    options = RequestOptions("GET", f"{server.url}/drop", retries=2, backoff=0.001)
+    chunks = []
+    with pytest.raises(httpx.TransportError):
+        for chunk in pool.stream(options):
+            chunks.append(chunk)
+    assert chunks == ["PART-ONE "]
+    assert server.calls["/drop"] == 1
+
+    chunks = []
+    with pytest.raises(httpx.TransportError):
+        async for chunk in pool.astream(options):
+            chunks.append(chunk)
+    assert chunks == ["PART-ONE "]
+    assert server.calls["/drop"] == 2
+    await pool.aclose()
+
+def test_timeout_and_connection_errors_raise(server, pool):
+    with pytest.raises(httpx.TimeoutException):
+        pool.request(RequestOptions("GET", f"{server.url}/slow?delay=0.5", timeout=0.05, retries=1, backoff=0.001))
+    assert server.calls["/slow"] == 2
+
+    with pytest.raises(httpx.ConnectError):
+        pool.request(RequestOptions("GET", "http://127.0.0.1:9/", retries=1, backoff=0.001))
+
+@pytest.mark.asyncio
+async def test_per_host_concurrency_limit(server, pool):
+    options = RequestOptions("GET", f"{server.url}/slow?delay=0.05")
+    results = await asyncio.gather(*(pool.arequest(options) for _ in range(6)))
+    assert all(r["status"] == 200 for r in results)
+    assert server.peak == 2
+    await pool.aclose()
+
+@pytest.mark.asyncio
+async def test_large_bodies_are_limited_or_streamed(server, pool):
+    url = f"{server.url}/big?size=100000"
+    with pytest.raises(ResponseTooLarge):
+        await pool.arequest(RequestOptions("GET", url, max_body_bytes=50000))
+
+    events = []
+    node = HTTPNode()
+    text = await node.aexecute({}, Context({}, events.append), _node_def(url, max_body_bytes=1, stream=True))
+    assert len(text) == 100000
+    assert len(events) > 1
+    assert "".join(e["chunk"] for e in events) == text
+    await pool.aclose()
+
+def test_large_bodies_become_blobs(server, pool):
+    set_blob_store(BlobStore(threshold=50000))
+    try:
+        result = pool.request(RequestOptions("GET", f"{server.url}/big?size=100000"))
+    finally:
+        set_blob_store(None)
+    body = result["body"]
+    assert isinstance(body, Blob) and len(body) == 100000
+    assert body.materialize() == "x" * 100000
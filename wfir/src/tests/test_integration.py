@@ -167,3 +167,207 @@ def test_compile_loop_workflow():
         app = graph.compile()
     except Exception as e:
         pytest.fail(f"Failed to compile graph: {e}")
+
+def test_generated_nodes_resolve_inputs_from_state():
+    ir_data = {
+        "name": "Invoke Workflow",
+        "nodes": [
+            {"id": "start", "type": "StartNode", "inputs": {"val": {"value": "Hello"}, "cfg": {"value": {"k": [1]}}}},
+            {"id": "my-end", "type": "EndNode", "inputs": {"final_val": {"valueFrom": {"nodeId": "start"}}}}
+        ],
+        "edges": [{"source": "start", "target": "my-end"}]
+    }
+
+    code = LangGraphTranspiler().visit_workflow(WorkflowIR(**ir_data))
+    # Node definitions are embedded as Python literals, not re-parsed JSON
+    assert "json.loads" not in code
+
+    scope = {}
+    exec(code, scope)
+    app = scope["build_graph"]().compile()
+    state = app.invoke({})
+
+    assert state["start_output"] == {"val": "Hello", "cfg": {"k": [1]}}
+    assert state["my_end_output"] == {"final_val": {"val": "Hello", "cfg": {"k": [1]}}}
+
+def test_non_finite_floats_compile_to_valid_source():
+    def workflow(limit):
+        return WorkflowIR(**{
+            "name": "Limits",
+            "nodes": [
+                {"id": "start", "type": "StartNode", "params": {"limit": limit, "range": [float("-inf"), limit]},
+                 "inputs": {"limit": {"value": limit}}},
+                {"id": "end", "type": "EndNode", "inputs": {"r": {"valueFrom": {"nodeId": "start"}}}},
+            ],
+            "edges": [{"source": "start", "target": "end"}],
+        })
+
+    transpiler = LangGraphTranspiler()
+    code = transpiler.visit_workflow(workflow(float("inf")))
+    scope = {}
+    exec(code, scope)
+    assert scope["_start_node_def"]["params"]["range"] == [float("-inf"), float("inf")]
+    assert scope["build_graph"]().compile().invoke({})["start_output"] == {"limit": float("inf")}
+
+    # inf and nan both dump to null in JSON; neither the node cache nor the hash conflates them
+    code = transpiler.visit_workflow(workflow(float("nan")))
+    assert transpiler.rendered_nodes == 1
+    assert 'float("nan")' in code
+    assert workflow(float("inf")).content_hash() != workflow(float("nan")).content_hash()
+
+@pytest.mark.asyncio
+async def test_compile_async_nodes():
+    ir_data = {
+        "name": "Async Workflow",
+        "nodes": [
+            {"id": "start", "type": "StartNode", "inputs": {"prompt": {"value": "Hello"}}},
+            {"id": "llm", "type": "LLM", "params": {"provider": "mock", "model": "m"},
+             "inputs": {"prompt": {"value": "Hi"}}},
+        ],
+        "edges": [{"source": "start", "target": "llm"}]
+    }
+
+    code = LangGraphTranspiler(async_nodes=True).visit_workflow(WorkflowIR(**ir_data))
+    assert "async def llm(state: AgentState):" in code
+    assert "await _llm_node.aexecute(" in code
+
+    scope = {}
+    exec(code, scope)
+    app = scope["build_graph"]().compile()
+    state = await app.ainvoke({})
+    assert state["llm_output"] == "Mock response from m: Hi"
+
+def _chain_ir(ids, cond_targets=None):
+    nodes = [{"id": ids[0], "type": "StartNode"}]
+    for prev, node_id in zip(ids, ids[1:]):
+        nodes.append({"id": node_id, "type": "EndNode", "inputs": {"x": {"valueFrom": {"nodeId": prev}}}})
+    edges = [{"source": a, "target": b} for a, b in zip(ids, ids[1:])]
+    if cond_targets:
+        nodes.append({"id": "check", "type": "Condition", "params": {"expression": "True"}})
+        edges.append({"source": ids[-1], "target": "check"})
+        edges.extend({"source": "check", "target": t} for t in cond_targets)
+    return WorkflowIR(name="Incremental", nodes=nodes, edges=edges)
+
+def test_incremental_compile_matches_full_compile():
+    transpiler = LangGraphTranspiler()
+    first = _chain_ir(["start", "a", "b", "c"], cond_targets=["a", "b"])
+    assert transpiler.visit_workflow(first) == LangGraphTranspiler().visit_workflow(first)
+    assert transpiler.rendered_nodes == 5
+
+    # Unchanged workflow: nothing re-rendered, and definitions don't accumulate
+    again = transpiler.visit_workflow(first)
+    assert transpiler.rendered_nodes == 0
+    assert len(transpiler.node_definitions) == 5
+    assert again == LangGraphTranspiler().visit_workflow(first)
+
+    # Edit one node, add one, remove one, and retarget the condition
+    edited = _chain_ir(["start", "a", "c", "d"], cond_targets=["c"])
+    edited.nodes[1].params = {"note": "changed"}
+    assert transpiler.visit_workflow(edited) == LangGraphTranspiler().visit_workflow(edited)
+    assert transpiler.rendered_nodes == 3  # a (params), c (new input), d (new); start and check reused
+    assert "b" not in transpiler._node_cache
+
+def _fan_out_ir():
+    # Listed as a chain, but 'a' and 'b' only read from 'start'
+    return WorkflowIR(**{
+        "name": "Fan out",
+        "nodes": [
+            {"id": "start", "type": "StartNode", "inputs": {"q": {"value": "hi"}}},
+            {"id": "a", "type": "LLM", "params": {"provider": "mock", "model": "a"},
+             "inputs": {"prompt": {"valueFrom": {"nodeId": "start"}}}},
+            {"id": "b", "type": "LLM", "params": {"provider": "mock", "model": "b"},
+             "inputs": {"prompt": {"valueFrom": {"nodeId": "start"}}}},
+            {"id": "join", "type": "Tool", "params": {"tool_name": "t"},
+             "inputs": {"x": {"valueFrom": {"nodeId": "a"}}, "y": {"valueFrom": {"nodeId": "b"}}}},
+            {"id": "end", "type": "EndNode", "inputs": {"r": {"valueFrom": {"nodeId": "join"}}}},
+        ],
+        "edges": [
+            {"source": "start", "target": "a"},
+            {"source": "a", "target": "b"},
+            {"source": "b", "target": "join"},
+            {"source": "join", "target": "end"},
+        ],
+    })
+
+def test_parallel_fan_out_and_join():
+    code = LangGraphTranspiler(parallel=True).visit_workflow(_fan_out_ir())
+    assert 'workflow.add_edge("start", "a")' in code
+    assert 'workflow.add_edge("start", "b")' in code
+    assert 'workflow.add_edge(["a", "b"], "join")' in code
+    assert 'workflow.add_edge("a", "b")' not in code
+
+    scope = {}
+    exec(code, scope)
+    app = scope["build_graph"]().compile()
+    steps = {}
+    for event in app.stream({}, stream_mode="debug"):
+        if event["type"] == "task":
+            steps[event["payload"]["name"]] = event["step"]
+
+    assert steps["a"] == steps["b"]
+    assert steps["join"] == steps["a"] + 1
+    assert steps["end"] == steps["join"] + 1
+
+def test_parallel_keeps_side_effect_order():
+    ir = _fan_out_ir()
+    # Two HTTP calls listed in sequence keep their order even without a data dependency
+    ir.nodes[1] = ir.nodes[1].model_copy(update={"type": "HTTP", "params": {"url": "http://a"}})
+    ir.nodes[2] = ir.nodes[2].model_copy(update={"type": "HTTP", "params": {"url": "http://b"}})
+    code = LangGraphTranspiler(parallel=True).visit_workflow(ir)
+    assert 'workflow.add_edge(["start", "a"], "b")' in code
+
+def test_parallel_falls_back_with_control_nodes():
+    ir = _fan_out_ir()
+    ir.nodes.append(ir.nodes[0].model_copy(update={"id": "check", "type": "Condition", "params": {"expression": "True"}}))
+    code = LangGraphTranspiler(parallel=True).visit_workflow(ir)
+    assert code == LangGraphTranspiler().visit_workflow(ir)
+
+def test_release_outputs_after_last_reader():
+    ir = _fan_out_ir()
+    ir.nodes[1].metadata["pinned"] = True
+    transpiler = LangGraphTranspiler(release_outputs=True)
+    code = transpiler.visit_workflow(ir)
+    # 'b' always runs after 'a', so it is start's last reader; 'a' is pinned
+    assert transpiler.releases == {"b": ["start_output"], "join": ["b_output"], "end": ["join_output"]}
+
+    scope = {}
+    exec(code, scope)
+    state = scope["build_graph"]().compile().invoke({})
+    assert state["start_output"] is None and state["b_output"] is None and state["join_output"] is None
+    assert state["a_output"] == "Mock response from a: {'q': 'hi'}"
+    assert state["end_output"] is not None
+
+def test_release_outputs_parallel_and_loops():
+    # In the data-flow schedule 'a' and 'b' run side by side, so neither may release 'start'
+    transpiler = LangGraphTranspiler(parallel=True, release_outputs=True)
+    transpiler.visit_workflow(_fan_out_ir())
+    assert transpiler.releases == {"join": ["a_output", "b_output"], "end": ["join_output"]}
+
+    # Outputs read inside a loop are needed again on the next iteration
+    ir = _chain_ir(["start", "a", "b"], cond_targets=["a"])
+    transpiler = LangGraphTranspiler(release_outputs=True)
+    transpiler.visit_workflow(ir)
+    assert transpiler.releases == {}
+
+def test_release_plan_on_a_long_parallel_schedule():
+    # Each node reads the previous one and the one three back; the schedule is one long
+    # chain, so every output dies at its second reader
+    from wfir.compiler.analysis import parallel_dependencies, release_plan
+    size = 3000
+    nodes = [{"id": "n0", "type": "StartNode"}]
+    for i in range(1, size):
+        inputs = {"p": {"valueFrom": {"nodeId": f"n{i - 1}"}}, "q": {"valueFrom": {"nodeId": f"n{max(i - 3, 0)}"}}}
+        nodes.append({"id": f"n{i}", "type": "LLM", "inputs": inputs})
+    edges = [{"source": f"n{i}", "target": f"n{i + 1}"} for i in range(size - 1)]
+    ir = WorkflowIR(name="Long", nodes=nodes, edges=edges)
+    plan = release_plan(ir, dependencies=parallel_dependencies(ir))
+    assert all(plan[f"n{i + 3}"][0] == f"n{i}" for i in range(size - 3))
+
+def test_release_outputs_skips_joins_of_unconditional_branches():
+    ir = _fan_out_ir()
+    # start fans out to a and b; join is triggered by each of them and may run twice
+    ir.edges = [e for e in ir.edges if e.source != "a"]
+    ir.edges += [ir.edges[0].model_copy(update={"target": "b"}), ir.edges[0].model_copy(update={"source": "a", "target": "join"})]
+    transpiler = LangGraphTranspiler(release_outputs=True)
+    transpiler.visit_workflow(ir)
+    assert transpiler.releases == {}
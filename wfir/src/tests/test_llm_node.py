@@ -25,7 +25,7 @@ def test_llm_node_mock_execution():
     )
     
     inputs = {"prompt": "How are you?"}
-    context = Context(initial_vars={})
+    context = Context(state={})
     
     result = node.execute(inputs, context, node_def)
     
@@ -39,3 +39,121 @@ def test_llm_node_missing_prompt():
     
     result = node.execute({}, Context(), node_def)
     assert "Error: 'prompt' input missing" in result
+
+def test_model_factory_caches_clients():
+    ModelFactory.clear_cache()
+    first = ModelFactory.create("mock", "cached-model", temperature=0.0)
+    assert ModelFactory.create("MOCK", "cached-model", temperature=0.0) is first
+    assert ModelFactory.create("mock", "cached-model", temperature=0.5) is not first
+    assert ModelFactory.create("mock", "other-model", temperature=0.0) is not first
+
+def test_model_factory_lru_eviction(monkeypatch):
+    ModelFactory.clear_cache()
+    monkeypatch.setattr(ModelFactory, "max_cached_clients", 2)
+    a = ModelFactory.create("mock", "a")
+    b = ModelFactory.create("mock", "b")
+    assert ModelFactory.create("mock", "a") is a  # refresh 'a'
+    ModelFactory.create("mock", "c")  # evicts 'b'
+    assert ModelFactory.create("mock", "a") is a
+    assert ModelFactory.create("mock", "b") is not b
+
+def test_model_factory_concurrent_create():
+    from concurrent.futures import ThreadPoolExecutor
+
+    ModelFactory.clear_cache()
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        clients = list(pool.map(lambda _: ModelFactory.create("mock", "shared"), range(32)))
+    assert all(c is clients[0] for c in clients)
+
+def test_llm_node_streams_tokens():
+    node = LLMNode()
+    node_def = NodeDef(params=LLMParams(provider="mock", model="m"), node_id="n1", stream=True)
+    events = []
+
+    result = node.execute({"prompt": "one two"}, Context({}, events.append), node_def)
+
+    assert result == "Mock response from m: one two"
+    assert len(events) > 1
+    assert all(e["node"] == "n1" for e in events)
+    assert "".join(e["chunk"] for e in events) == result
+
+@pytest.mark.asyncio
+async def test_llm_node_astream():
+    node = LLMNode()
+    node_def = NodeDef(params=LLMParams(provider="mock", model="m"), node_id="n1", stream=True)
+
+    chunks = [chunk async for chunk in node.astream({"prompt": "hi"}, Context({}), node_def)]
+    assert len(chunks) > 1
+    assert "".join(chunks) == "Mock response from m: hi"
+    # aexecute of a streaming node returns the full text
+    assert await node.aexecute({"prompt": "hi"}, Context({}), node_def) == "".join(chunks)
+
+def _batch_node_def(prompt_model="m"):
+    return NodeDef(params=LLMParams(provider="mock", model=prompt_model, batch=True), node_id="n1")
+
+@pytest.mark.asyncio
+async def test_llm_node_batches_concurrent_async_calls(monkeypatch):
+    import asyncio
+    from wfir.runtime import llm
+    batcher = llm.MicroBatcher(window=0.05)
+    monkeypatch.setattr(llm, "llm_batcher", batcher)
+
+    node = LLMNode()
+    results = await asyncio.gather(*(node.aexecute({"prompt": f"p{i}"}, Context({}), _batch_node_def()) for i in range(5)))
+    assert results == [f"Mock response from m: p{i}" for i in range(5)]
+    assert (batcher.batches, batcher.calls) == (1, 5)
+
+def test_llm_node_batches_threads_up_to_max_size(monkeypatch):
+    import time
+    from concurrent.futures import ThreadPoolExecutor
+    from wfir.runtime import llm
+    # A long window: batches must be sent as soon as they are full
+    batcher = llm.MicroBatcher(window=5, max_batch_size=4)
+    monkeypatch.setattr(llm, "llm_batcher", batcher)
+
+    node = LLMNode()
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(lambda i: node.execute({"prompt": f"p{i}"}, Context({}), _batch_node_def()), range(8)))
+    assert time.perf_counter() - start < 5
+    assert results == [f"Mock response from m: p{i}" for i in range(8)]
+    assert (batcher.batches, batcher.calls) == (2, 8)
+
+class FlakyChatModel(MockChatModel):
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        if messages[-1].content == "fail":
+            raise RuntimeError("provider rejected the request")
+        return super()._generate(messages, stop, run_manager, **kwargs)
+
+@pytest.mark.asyncio
+async def test_micro_batcher_returns_errors_to_their_callers():
+    import asyncio
+    from wfir.runtime.llm import MicroBatcher
+    batcher = MicroBatcher(window=0.05)
+    model = FlakyChatModel(model_name="flaky")
+
+    ok, failed = await asyncio.gather(
+        batcher.ainvoke(model, [HumanMessage(content="fine")]),
+        batcher.ainvoke(model, [HumanMessage(content="fail")]),
+        return_exceptions=True,
+    )
+    assert ok.content == "Mock response from flaky: fine"
+    assert isinstance(failed, RuntimeError)
+    assert batcher.batches == 1
+
+@pytest.mark.asyncio
+async def test_micro_batcher_keeps_its_flush_tasks_alive():
+    import asyncio
+    import gc
+    from wfir.runtime.llm import MicroBatcher
+    batcher = MicroBatcher(window=0.05)
+    model = FlakyChatModel(model_name="flaky")
+
+    call = asyncio.ensure_future(batcher.ainvoke(model, [HumanMessage(content="fine")]))
+    await asyncio.sleep(0)
+    # The loop only holds the flush task weakly; the batcher must keep it
+    assert len(batcher._tasks) == 1
+    gc.collect()
+    assert (await call).content == "Mock response from flaky: fine"
+    await asyncio.sleep(0)
+    assert not batcher._tasks
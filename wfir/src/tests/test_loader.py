@@ -0,0 +1,77 @@
+import json
+import os
+import pytest
+from pydantic import ValidationError
+from wfir.models import WorkflowIR
+from wfir.loader import WorkflowLoader, validate_trusted
+
+EXAMPLE = os.path.join(os.path.dirname(__file__), "..", "..", "..", "example.json")
+
+def _data() -> dict:
+    return {
+        "name": "Loaded",
+        "variables": {"topic": "String"},
+        "nodes": [
+            {"id": "start", "type": "StartNode", "metadata": {"position": {"x": 0, "y": 0}}},
+            {"id": "llm", "type": "LLM", "stream": True, "params": {"provider": "mock"},
+             "inputs": {"prompt": {"valueFrom": {"nodeId": "start"}}, "n": 3, "opts": {"k": "v"}, "s": {"value": "x"}}},
+            {"id": "end", "type": "EndNode", "inputs": {"result": {"valueFrom": {"nodeId": "llm"}}}},
+        ],
+        "edges": [
+            {"source": "start", "target": "llm", "sourceHandle": "out"},
+            {"source": "llm", "target": "end", "condition": "ok"},
+        ],
+    }
+
+def test_trusted_load_matches_strict_load():
+    data = _data()
+    strict = WorkflowIR(**data)
+    trusted = validate_trusted(data)
+    # The graph index is built lazily instead of during validation
+    assert trusted._graph is None
+    assert trusted.model_dump(by_alias=True) == strict.model_dump(by_alias=True)
+    assert trusted.content_hash() == strict.content_hash()
+    assert list(trusted.graph.successors(0)) == [1]
+
+def test_trusted_load_matches_example_file():
+    with open(EXAMPLE) as f:
+        data = json.load(f)
+    assert validate_trusted(data).model_dump(by_alias=True) == WorkflowIR(**data).model_dump(by_alias=True)
+
+def test_loader_caches_by_content():
+    loader = WorkflowLoader()
+    raw = json.dumps(_data())
+    first = loader.load(raw)
+    assert loader.load(raw.encode("utf-8")) is first
+    assert loader.load(_data()) is not None
+    assert (loader.hits, loader.misses) == (1, 2)
+
+def test_dict_key_order_does_not_change_the_key():
+    data = _data()
+    reordered = {key: data[key] for key in reversed(list(data))}
+    reordered["nodes"] = [{key: node[key] for key in reversed(list(node))} for node in data["nodes"]]
+    assert json.dumps(reordered) != json.dumps(data)
+    assert WorkflowLoader.source_key(reordered) == WorkflowLoader.source_key(data)
+
+    loader = WorkflowLoader()
+    assert loader.load(reordered) is loader.load(data)
+    assert (loader.hits, loader.misses) == (1, 1)
+
+def test_strict_load_never_returns_unvalidated_model():
+    loader = WorkflowLoader()
+    bad = json.dumps({"name": "Bad", "nodes": [], "edges": [{"source": "a", "target": "b"}]})
+    # Trusted loads defer the edge check to the first use of the graph...
+    trusted = loader.load(bad, trusted=True)
+    with pytest.raises(ValueError, match="Edge source 'a' does not exist"):
+        trusted.graph
+    # ...but a strict load of the same content still validates
+    with pytest.raises(ValidationError):
+        loader.load(bad)
+
+def test_loader_evicts_least_recently_used():
+    loader = WorkflowLoader(max_entries=1)
+    a = dict(_data(), name="A")
+    loader.load(a)
+    loader.load(dict(_data(), name="B"))
+    loader.load(a)
+    assert (loader.hits, loader.misses) == (0, 3)
@@ -0,0 +1,151 @@
+import json
+import os
+from wfir.models import WorkflowIR
+from wfir.compiler.optimizer import (
+    Optimizer, ConstantConditionPass, UnreachableNodePass, DeadNodePass,
+)
+from wfir.compiler.langgraph.transpiler import LangGraphTranspiler
+
+def _ids(workflow: WorkflowIR):
+    return [n.id for n in workflow.nodes]
+
+def _edges(workflow: WorkflowIR):
+    return [(e.source, e.target) for e in workflow.edges]
+
+def test_unreachable_nodes_removed():
+    workflow = WorkflowIR(**{
+        "name": "Unreachable",
+        "nodes": [
+            {"id": "start", "type": "StartNode"},
+            {"id": "end", "type": "EndNode", "inputs": {"x": {"valueFrom": {"nodeId": "producer"}}}},
+            {"id": "producer", "type": "LLM"},
+            {"id": "orphan", "type": "HTTP", "params": {"url": "http://x"}},
+            {"id": "orphan-child", "type": "EndNode"},
+        ],
+        "edges": [
+            {"source": "start", "target": "end"},
+            {"source": "orphan", "target": "orphan-child"},
+        ],
+    })
+    optimized, report = UnreachableNodePass().run(workflow)
+    # 'producer' has no incoming edge but feeds a reachable node, so it stays
+    assert _ids(optimized) == ["start", "end", "producer"]
+    assert report.removed_nodes == ["orphan", "orphan-child"]
+    assert report.removed_edges == ["orphan->orphan-child"]
+    # Input is untouched
+    assert len(workflow.nodes) == 5
+
+EXAMPLE = os.path.join(os.path.dirname(__file__), "..", "..", "..", "example.json")
+
+def test_unread_outputs_are_results_and_kept():
+    with open(EXAMPLE) as f:
+        workflow = WorkflowIR(**json.load(f))
+    # Nothing reads the LLM outputs: they are what the workflow produces
+    optimized, reports = Optimizer().optimize(workflow)
+    assert reports == []
+    assert _ids(optimized) == _ids(workflow)
+
+def test_dead_nodes_orphaned_or_discardable():
+    workflow = WorkflowIR(**{
+        "name": "Dead",
+        "nodes": [
+            {"id": "start", "type": "StartNode"},
+            {"id": "draft", "type": "LLM"},
+            {"id": "route", "type": "Condition",
+             "params": {"expression": "False", "true_target": "summary", "false_target": "end"}},
+            {"id": "summary", "type": "LLM", "inputs": {"prompt": {"valueFrom": {"nodeId": "draft"}}}},
+            {"id": "scratch", "type": "LLM", "metadata": {"discardable": True}},
+            {"id": "notify", "type": "HTTP", "params": {"url": "http://x"}, "metadata": {"discardable": True}},
+            {"id": "end", "type": "EndNode"},
+        ],
+        "edges": [
+            {"source": "start", "target": "draft"},
+            {"source": "draft", "target": "route"},
+            {"source": "route", "target": "summary"},
+            {"source": "route", "target": "end"},
+            {"source": "summary", "target": "end"},
+            {"source": "start", "target": "scratch"},
+            {"source": "scratch", "target": "notify"},
+            {"source": "notify", "target": "end"},
+        ],
+    })
+    optimized, reports = Optimizer().optimize(workflow)
+    # The folded condition leaves 'summary' unreachable, which orphans 'draft';
+    # 'scratch' is marked discardable; HTTP has side effects even when marked
+    assert _ids(optimized) == ["start", "notify", "end"]
+    dead = next(r for r in reports if r.pass_name == "dead-nodes")
+    assert set(dead.removed_nodes) == {"draft", "scratch"}
+
+    kept, _ = Optimizer([ConstantConditionPass(), UnreachableNodePass(), DeadNodePass(keep=["draft"])]).optimize(workflow)
+    assert "draft" in _ids(kept)
+
+    # Run on its own, the pass only removes what is marked
+    alone, _ = DeadNodePass().run(workflow)
+    assert "draft" in _ids(alone) and "scratch" not in _ids(alone)
+
+def test_constant_condition_folded_and_branch_pruned():
+    workflow = WorkflowIR(**{
+        "name": "Constant",
+        "nodes": [
+            {"id": "start", "type": "StartNode"},
+            {"id": "check", "type": "Condition",
+             "params": {"expression": "1 + 1 == 3", "true_target": "yes", "false_target": "no"}},
+            {"id": "yes", "type": "LLM", "inputs": {"prompt": {"value": "a"}}},
+            {"id": "no", "type": "EndNode"},
+            {"id": "dynamic", "type": "Condition",
+             "params": {"expression": "val > 1", "true_target": "no", "false_target": "no"}},
+        ],
+        "edges": [
+            {"source": "start", "target": "check"},
+            {"source": "check", "target": "yes"},
+            {"source": "check", "target": "no"},
+        ],
+    })
+    folded, report = ConstantConditionPass().run(workflow)
+    assert "check" not in _ids(folded)
+    assert ("start", "no") in _edges(folded)
+    assert report.notes == ["Condition 'check' is always False; routed to 'no'"]
+
+    optimized, reports = Optimizer().optimize(workflow)
+    assert _ids(optimized) == ["start", "no"]
+    assert _edges(optimized) == [("start", "no")]
+    assert [r.pass_name for r in reports] == ["constant-conditions", "unreachable-nodes"]
+
+    # The optimized IR still compiles
+    code = LangGraphTranspiler().visit_workflow(optimized)
+    assert 'workflow.add_edge("start", "no")' in code
+
+def test_condition_predecessor_is_retargeted():
+    workflow = WorkflowIR(**{
+        "name": "Retarget",
+        "nodes": [
+            {"id": "start", "type": "StartNode"},
+            {"id": "route", "type": "Condition",
+             "params": {"expression": "x", "true_target": "unused", "false_target": "end"},
+             "inputs": {"x": {"valueFrom": {"nodeId": "start"}}}},
+            {"id": "unused", "type": "LLM", "metadata": {"discardable": True}},
+            {"id": "after", "type": "EndNode"},
+            {"id": "end", "type": "EndNode"},
+        ],
+        "edges": [
+            {"source": "start", "target": "route"},
+            {"source": "route", "target": "unused"},
+            {"source": "route", "target": "end"},
+            {"source": "unused", "target": "after"},
+        ],
+    })
+    optimized, _ = Optimizer().optimize(workflow)
+    route = next(n for n in optimized.nodes if n.id == "route")
+    assert route.params["true_target"] == "after"
+    assert ("route", "after") in _edges(optimized)
+    assert "unused" not in _ids(optimized)
+
+def test_optimizer_noop_on_clean_workflow():
+    workflow = WorkflowIR(**{
+        "name": "Clean",
+        "nodes": [{"id": "start", "type": "StartNode"}, {"id": "end", "type": "EndNode"}],
+        "edges": [{"source": "start", "target": "end"}],
+    })
+    optimized, reports = Optimizer().optimize(workflow)
+    assert reports == []
+    assert optimized.content_hash() == workflow.content_hash()
@@ -0,0 +1,82 @@
+import types
+import pytest
+from wfir.runtime import response_cache
+from wfir.runtime.base import Context
+from wfir.runtime.llm import MockChatModel
+from wfir.runtime.nodes import LLMNode, LLMParams, NodeDef
+from wfir.runtime.response_cache import MemoryResponseCache, SQLiteResponseCache, llm_cache_key, set_response_cache
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(response_cache, "time", types.SimpleNamespace(monotonic=lambda: now[0], time=lambda: now[0]))
+    return now
+
+@pytest.fixture
+def cache():
+    cache = MemoryResponseCache()
+    set_response_cache(cache)
+    yield cache
+    set_response_cache(None)
+
+def test_cache_key_covers_request_fields():
+    base = llm_cache_key("openai", "gpt-4o", 0.0, "sys", "hi")
+    assert llm_cache_key("OpenAI", "gpt-4o", 0.0, "sys", "hi") == base
+    assert len({base,
+                llm_cache_key("ollama", "gpt-4o", 0.0, "sys", "hi"),
+                llm_cache_key("openai", "gpt-4o-mini", 0.0, "sys", "hi"),
+                llm_cache_key("openai", "gpt-4o", 0.5, "sys", "hi"),
+                llm_cache_key("openai", "gpt-4o", 0.0, "", "hi"),
+                llm_cache_key("openai", "gpt-4o", 0.0, "sys", "hello")}) == 6
+
+def test_memory_cache_lru_and_ttl(clock):
+    cache = MemoryResponseCache(max_entries=2, ttl=60)
+    cache.set("a", "A")
+    cache.set("b", "B")
+    assert cache.get("a") == "A"  # refresh 'a'
+    cache.set("c", "C")  # evicts 'b'
+    assert cache.get("b") is None
+    clock[0] += 61
+    assert cache.get("a") is None
+    assert cache.stats() == {"hits": 1, "misses": 2}
+
+def test_sqlite_cache_persists(tmp_path, clock):
+    path = str(tmp_path / "llm.sqlite")
+    first = SQLiteResponseCache(path, ttl=60)
+    first.set("k", ["structured", {"content": 1}])
+    first.close()
+
+    second = SQLiteResponseCache(path, ttl=60)
+    assert second.get("k") == ["structured", {"content": 1}]
+    clock[0] += 61
+    assert second.get("k") is None
+    assert second.stats() == {"hits": 1, "misses": 1}
+
+def test_llm_node_uses_cache_when_enabled(cache, monkeypatch):
+    calls = []
+    generate = MockChatModel._generate
+    monkeypatch.setattr(MockChatModel, "_generate", lambda self, *a, **kw: calls.append(1) or generate(self, *a, **kw))
+
+    node = LLMNode()
+    node_def = NodeDef(params=LLMParams(provider="mock", model="m", temperature=0.0, cache=True), node_id="n1")
+    first = node.execute({"prompt": "hi"}, Context({}), node_def)
+    assert node.execute({"prompt": "hi"}, Context({}), node_def) == first
+    assert len(calls) == 1
+    assert cache.stats() == {"hits": 1, "misses": 1}
+
+    # Streaming nodes replay a hit as one chunk
+    events = []
+    stream_def = node_def.model_copy(update={"stream": True})
+    assert node.execute({"prompt": "hi"}, Context({}, events.append), stream_def) == first
+    assert [e["chunk"] for e in events] == [first]
+
+    # Off by default: no lookups
+    node.execute({"prompt": "hi"}, Context({}), NodeDef(params=LLMParams(provider="mock", model="m"), node_id="n2"))
+    assert cache.stats() == {"hits": 2, "misses": 1}
+
+@pytest.mark.asyncio
+async def test_llm_node_async_errors_are_not_cached(cache):
+    node = LLMNode()
+    node_def = NodeDef(params=LLMParams(provider="unknown", model="m", cache=True), node_id="n1")
+    assert (await node.aexecute({"prompt": "hi"}, Context({}), node_def)).startswith("Error executing LLMNode")
+    assert len(cache) == 0
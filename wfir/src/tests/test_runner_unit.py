@@ -1,3 +1,4 @@
+import asyncio
 import pytest
 from wfir.models import WorkflowIR, Node, Edge, InputValue, ValueFrom
 from wfir.runner import WorkflowRunner
@@ -29,28 +30,177 @@ async def test_linear_execution():
 
 @pytest.mark.asyncio
 async def test_missing_dependency():
-    # n2 depends on n1, but n1 is not in the list (or executed after n2 in this simple runner)
-    # In our simple runner, order matters. If we put n2 first, it should fail.
-    
+    # n2 reads from a node that is not part of the workflow, so it can never be resolved.
     node1 = Node(id="n1", type="Echo", inputs={"val": InputValue(value=1)})
-    node2 = Node(id="n2", type="AddOne", inputs={"val": InputValue(valueFrom=ValueFrom(nodeId="n1", outputKey="output"))})
-    
+    node2 = Node(id="n2", type="AddOne", inputs={"val": InputValue(valueFrom=ValueFrom(nodeId="ghost", outputKey="output"))})
+
     wf = WorkflowIR(
         name="Test Fail",
-        nodes=[node2, node1], # Wrong order for simple runner
+        nodes=[node2, node1],
         edges=[Edge(source="n1", target="n2")]
     )
-    
+
     runner = WorkflowRunner(wf)
-    
+
     async def echo_handler(i, c, n):
         return {"output": i["val"]}
-    
+
     async def add_one_handler(i, c, n):
         return {"output": i["val"] + 1}
 
     runner.register_handler("Echo", echo_handler)
     runner.register_handler("AddOne", add_one_handler)
-    
-    with pytest.raises(RuntimeError, match="depends on 'n1' which has not executed yet"):
+
+    with pytest.raises(RuntimeError, match="depends on 'ghost' which has not executed yet"):
         await runner.run()
+
+@pytest.mark.asyncio
+async def test_out_of_order_nodes_follow_dependencies():
+    # The list order no longer matters: n2 waits for n1 through its valueFrom reference.
+    node1 = Node(id="n1", type="Echo", inputs={"val": InputValue(value=1)})
+    node2 = Node(id="n2", type="Echo", inputs={"val": InputValue(valueFrom=ValueFrom(nodeId="n1"))})
+
+    wf = WorkflowIR(name="Out of order", nodes=[node2, node1], edges=[])
+    runner = WorkflowRunner(wf)
+
+    async def echo_handler(i, c, n):
+        return i["val"]
+
+    runner.register_handler("Echo", echo_handler)
+
+    results = await runner.run()
+    assert results == {"n1": 1, "n2": 1}
+
+@pytest.mark.asyncio
+async def test_release_outputs_after_last_reader():
+    nodes = [Node(id="n1", type="Echo", inputs={"val": InputValue(value=1)})]
+    for i in range(2, 5):
+        nodes.append(Node(id=f"n{i}", type="Echo", inputs={"val": InputValue(valueFrom=ValueFrom(nodeId=f"n{i - 1}"))}))
+    nodes.append(Node(id="audit", type="Echo", inputs={"val": InputValue(valueFrom=ValueFrom(nodeId="n1"))}))
+    wf = WorkflowIR(name="Chain", nodes=nodes, edges=[])
+    runner = WorkflowRunner(wf, release_outputs=True, pinned=["n2"])
+    live = {}
+
+    async def echo_handler(i, c, n):
+        live[n["id"]] = set(runner.node_outputs)
+        return i["val"]
+
+    runner.register_handler("Echo", echo_handler)
+
+    results = await runner.run()
+    # n1 lives until both of its readers (n2, audit) ran; n2 is pinned
+    assert "n1" in live["audit"]
+    assert live["n4"] == {"n2", "n3", "audit"}
+    assert results == {"n2": 1, "n4": 1, "audit": 1}
+
+def _fan_out_workflow(branches: int) -> WorkflowIR:
+    nodes = [Node(id="start", type="Echo", inputs={"val": InputValue(value=0)})]
+    edges = []
+    for i in range(branches):
+        nodes.append(Node(id=f"b{i}", type="Sleep"))
+        edges.append(Edge(source="start", target=f"b{i}"))
+    return WorkflowIR(name="Fan out", nodes=nodes, edges=edges)
+
+@pytest.mark.asyncio
+async def test_independent_branches_run_concurrently():
+    runner = WorkflowRunner(_fan_out_workflow(4))
+    active = 0
+    peak = 0
+
+    async def echo_handler(i, c, n):
+        return i["val"]
+
+    async def sleep_handler(i, c, n):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+        return n["id"]
+
+    runner.register_handler("Echo", echo_handler)
+    runner.register_handler("Sleep", sleep_handler)
+
+    results = await runner.run()
+    assert peak == 4
+    assert set(results) == {"start", "b0", "b1", "b2", "b3"}
+
+@pytest.mark.asyncio
+async def test_max_concurrency_limit():
+    runner = WorkflowRunner(_fan_out_workflow(5), max_concurrency=2)
+    active = 0
+    peak = 0
+
+    async def echo_handler(i, c, n):
+        return i["val"]
+
+    async def sleep_handler(i, c, n):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+        return n["id"]
+
+    runner.register_handler("Echo", echo_handler)
+    runner.register_handler("Sleep", sleep_handler)
+
+    results = await runner.run()
+    assert peak == 2
+    assert len(results) == 6
+
+@pytest.mark.asyncio
+async def test_cycle_is_reported():
+    wf = WorkflowIR(
+        name="Cycle",
+        nodes=[Node(id="a", type="Echo"), Node(id="b", type="Echo")],
+        edges=[Edge(source="a", target="b"), Edge(source="b", target="a")]
+    )
+    runner = WorkflowRunner(wf)
+
+    with pytest.raises(RuntimeError, match="dependency cycle"):
+        await runner.run()
+
+@pytest.mark.asyncio
+async def test_events_stream_tokens_from_registry_nodes():
+    wf = WorkflowIR(
+        name="Stream",
+        nodes=[
+            Node(id="start", type="StartNode"),
+            Node(id="llm", type="LLM", stream=True, inputs={"prompt": InputValue(value="a b")}, params={"provider": "mock", "model": "m"}),
+            Node(id="end", type="EndNode", inputs={"text": InputValue(valueFrom=ValueFrom(nodeId="llm"))}),
+        ],
+        edges=[Edge(source="start", target="llm"), Edge(source="llm", target="end")]
+    )
+    events = [e async for e in WorkflowRunner.from_runtime(wf).events()]
+
+    tokens = [e["data"] for e in events if e["event"] == "token"]
+    assert len(tokens) > 1
+    assert all(e["node"] == "llm" for e in events if e["event"] == "token")
+    # Tokens arrive between the node's start and end events
+    kinds = [(e["event"], e["node"]) for e in events]
+    assert kinds.index(("node_start", "llm")) < kinds.index(("token", "llm")) < kinds.index(("node_end", "llm"))
+    assert events[-1]["event"] == "workflow_end"
+    assert events[-1]["data"]["end"] == {"text": "".join(tokens)}
+
+@pytest.mark.asyncio
+async def test_events_raise_handler_errors():
+    wf = WorkflowIR(name="Fail", nodes=[Node(id="a", type="Gen"), Node(id="b", type="Boom")], edges=[Edge(source="a", target="b")])
+    runner = WorkflowRunner(wf)
+
+    async def gen_handler(i, c, n):
+        yield "x"
+        yield "y"
+
+    async def boom_handler(i, c, n):
+        raise ValueError("boom")
+
+    runner.register_handler("Gen", gen_handler)
+    runner.register_handler("Boom", boom_handler)
+
+    events = []
+    with pytest.raises(ValueError, match="boom"):
+        async for event in runner.events():
+            events.append(event)
+    assert [e["data"] for e in events if e["event"] == "token"] == ["x", "y"]
+    assert runner.node_outputs["a"] == "xy"
@@ -0,0 +1,132 @@
+import threading
+import pytest
+from pydantic import ValidationError
+from wfir.models import WorkflowIR
+from wfir.runtime.base import Context, InputPlan
+from wfir.runtime.nodes import LLMParams, NodeImplementation, EmptyParams
+from wfir.runtime.registry import Runtime, NodeRegistry
+
+def _workflow(model: str = "test-model") -> WorkflowIR:
+    return WorkflowIR(**{
+        "name": "Plan",
+        "nodes": [
+            {"id": "start", "type": "StartNode"},
+            {"id": "llm", "type": "LLM", "params": {"provider": "mock", "model": model}},
+        ],
+        "edges": [{"source": "start", "target": "llm"}],
+    })
+
+def test_prepare_builds_nodes_once():
+    runtime = Runtime()
+    workflow = _workflow()
+
+    plan = runtime.prepare(workflow)
+    assert plan is runtime.prepare(workflow)
+    # Identical content from a separately parsed IR reuses the plan as well
+    assert plan is runtime.prepare(_workflow())
+
+    llm = plan["llm"]
+    assert isinstance(llm.node_def.params, LLMParams)
+    assert llm.node_def.node_id == "llm"
+    assert llm.node_def.params.model == "test-model"
+
+def test_prepare_hashes_a_workflow_once(monkeypatch):
+    runtime = Runtime()
+    workflow = _workflow()
+    plan = runtime.prepare(workflow)
+
+    calls = []
+    compute = WorkflowIR._compute_hash
+    monkeypatch.setattr(WorkflowIR, "_compute_hash", lambda self: calls.append(1) or compute(self))
+    assert runtime.prepare(workflow) is plan
+    assert not calls
+
+    # Replacing a node is seen; in-place edits need `invalidate_graph()`
+    workflow.nodes[1] = workflow.nodes[1].model_copy(update={"params": {"provider": "mock", "model": "other"}})
+    assert runtime.prepare(workflow) is not plan
+    workflow.nodes[1].params["model"] = "third"
+    assert runtime.prepare(workflow).workflow_hash == workflow.content_hash()
+    edited = workflow.content_hash()
+    workflow.invalidate_graph()
+    assert workflow.content_hash() != edited
+    assert len(calls) == 2
+
+def test_prepared_execution_skips_validation(monkeypatch):
+    runtime = Runtime()
+    plan = runtime.prepare(_workflow())
+
+    def fail(*args, **kwargs):
+        raise AssertionError("registry should not be consulted on the hot path")
+
+    monkeypatch.setattr(NodeRegistry, "get", fail)
+    result = plan.execute("start", {"val": 1}, Context({}))
+    assert result == {"val": 1}
+
+def test_new_version_gets_new_plan_and_lru_is_bounded():
+    runtime = Runtime(max_plans=1)
+    first = runtime.prepare(_workflow("a"))
+    second = runtime.prepare(_workflow("b"))
+    assert first is not second
+    assert first.workflow_hash != second.workflow_hash
+    assert runtime.prepare(_workflow("a")) is not first
+
+def test_prepare_reports_invalid_params():
+    workflow = WorkflowIR(**{
+        "name": "Bad",
+        "nodes": [{"id": "llm", "type": "LLM", "params": {"temperature": 5}}],
+        "edges": [],
+    })
+    with pytest.raises(ValidationError):
+        Runtime().prepare(workflow)
+
+def test_execute_still_validates_per_call():
+    result = Runtime().execute("EndNode", {"x": 1}, Context({}), {"id": "end", "params": {}})
+    assert result == {"x": 1}
+
+class _BlockingNode(NodeImplementation[EmptyParams]):
+    def execute(self, inputs, context, node_def):
+        return threading.current_thread().name
+
+@pytest.mark.asyncio
+async def test_aexecute_offloads_blocking_sync_nodes(monkeypatch):
+    monkeypatch.setitem(NodeRegistry._registry, "Blocking", _BlockingNode)
+    runtime = Runtime()
+
+    thread_name = await runtime.aexecute("Blocking", {}, Context({}), {"id": "b"})
+    assert thread_name != threading.current_thread().name
+
+    # Non-blocking built-ins run inline on the event loop thread
+    assert await runtime.aexecute("StartNode", {"x": 1}, Context({}), {"id": "s"}) == {"x": 1}
+
+@pytest.mark.asyncio
+async def test_llm_node_native_aexecute():
+    plan = Runtime().prepare(_workflow())
+    result = await plan.aexecute("llm", {"prompt": "Hi"}, Context({}))
+    assert "Mock response from test-model: Hi" == result
+
+def test_context_resolves_inputs_with_compiled_plan(capsys):
+    inputs_def = {
+        "literal": {"value": [1]},
+        "ref": {"valueFrom": {"nodeId": "my-node"}},
+        "missing": {"valueFrom": {"nodeId": "other"}},
+        "empty": {},
+    }
+    context = Context({"my_node_output": "hi"})
+    expected = {"literal": [1], "ref": "hi", "missing": None, "empty": None}
+    assert context.resolve_inputs(inputs_def) == expected
+    assert capsys.readouterr().out == ""
+    # Plain dicts aren't cached: an in-place edit is seen on the next call
+    inputs_def["literal"] = {"value": 2}
+    assert context.resolve_inputs(inputs_def)["literal"] == 2
+    inputs_def["literal"] = {"value": [1]}
+
+    # Plans compile from IR models too, and prepared nodes carry theirs
+    del inputs_def["empty"], expected["empty"]  # {} is a dict literal in the IR
+    node = WorkflowIR(name="w", nodes=[{"id": "n", "type": "EndNode", "inputs": inputs_def}], edges=[]).nodes[0]
+    assert context.resolve_inputs(InputPlan.compile(node.inputs)) == expected
+    prepared = Runtime.prepare_node("EndNode", node.model_dump(by_alias=True))
+    assert prepared.resolve_inputs(context) == expected
+
+    context.set_node_output("other", 2)
+    assert context.get_node_output("other") == 2
+    assert not hasattr(context, "__dict__")
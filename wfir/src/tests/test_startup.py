@@ -0,0 +1,86 @@
+import json
+import os
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+import pytest
+
+# Modules that commands other than `compile`/`run` must never import
+HEAVY_MODULES = ("langchain", "langchain_core", "langchain_openai", "langchain_ollama", "langgraph", "openai", "jinja2", "httpx")
+
+# Cumulative import time budgets (microseconds) for what `wfir.cli` pulls in, excluding
+# interpreter startup (site, encodings). The loose budgets always apply and catch a heavy
+# dependency creeping back in on any machine; the tight ones depend on the machine, so they
+# are only checked when WFIR_STARTUP_BUDGETS is set (e.g. on a quiet benchmark box).
+LOOSE_HELP_BUDGET_US = 500_000
+LOOSE_VALIDATE_BUDGET_US = 2_000_000
+HELP_BUDGET_US = 150_000
+VALIDATE_BUDGET_US = 600_000
+check_budgets = pytest.mark.skipif(not os.environ.get("WFIR_STARTUP_BUDGETS"), reason="set WFIR_STARTUP_BUDGETS to check import time budgets")
+
+def run_cli(*args: str) -> Tuple[subprocess.CompletedProcess, Dict[str, int]]:
+    """Run `python -X importtime -m wfir.cli ...`; returns the process and cumulative µs per top-level import."""
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-m", "wfir.cli", *args],
+                          capture_output=True, text=True)
+    imports: Dict[str, int] = {}
+    stderr: List[str] = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:"):
+            stderr.append(line)
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if cumulative.strip().isdigit():
+            imports[name[1:].rstrip()] = int(cumulative)
+    proc.stderr = "\n".join(stderr)
+    return proc, imports
+
+def cli_import_time(imports: Dict[str, int]) -> int:
+    """Sum of top-level imports from the first wfir module on (interpreter startup comes before)."""
+    names = list(imports)
+    first = next(i for i, name in enumerate(names) if name.strip().startswith("wfir"))
+    return sum(imports[name] for name in names[first:] if not name.startswith(" "))
+
+def loaded_heavy_modules(imports: Dict[str, int], heavy: Tuple[str, ...] = HEAVY_MODULES) -> List[str]:
+    return sorted({name.strip() for name in imports if name.strip().split(".")[0] in heavy})
+
+def _write_workflow(path, end_ref="start"):
+    path.write_text(json.dumps({
+        "name": "Startup",
+        "nodes": [
+            {"id": "start", "type": "StartNode"},
+            {"id": "end", "type": "EndNode", "inputs": {"x": {"valueFrom": {"nodeId": end_ref}}}},
+        ],
+        "edges": [{"source": "start", "target": "end"}],
+    }))
+    return str(path)
+
+def test_help_starts_without_heavy_imports():
+    proc, imports = run_cli("--help")
+    assert proc.returncode == 0
+    assert "compile-many" in proc.stdout
+    # Not even the IR models: --help only builds the argument parser
+    assert loaded_heavy_modules(imports, HEAVY_MODULES + ("pydantic",)) == []
+
+def test_validate_starts_without_heavy_imports(tmp_path):
+    proc, imports = run_cli("validate", _write_workflow(tmp_path / "wf.json"))
+    assert proc.returncode == 0, proc.stderr
+    assert "valid" in proc.stdout
+    assert loaded_heavy_modules(imports) == []
+
+def test_startup_stays_within_loose_budgets(tmp_path):
+    _, imports = run_cli("--help")
+    assert cli_import_time(imports) < LOOSE_HELP_BUDGET_US
+    _, imports = run_cli("validate", _write_workflow(tmp_path / "wf.json"))
+    assert cli_import_time(imports) < LOOSE_VALIDATE_BUDGET_US
+
+@check_budgets
+def test_startup_import_time_budgets(tmp_path):
+    _, imports = run_cli("--help")
+    assert cli_import_time(imports) < HELP_BUDGET_US
+    _, imports = run_cli("validate", _write_workflow(tmp_path / "wf.json"))
+    assert cli_import_time(imports) < VALIDATE_BUDGET_US
+
+def test_validate_reports_errors(tmp_path):
+    proc, _ = run_cli("validate", _write_workflow(tmp_path / "wf.json", end_ref="missing"))
+    assert proc.returncode == 1
+    assert "references missing node 'missing'" in proc.stderr
@@ -0,0 +1,134 @@
+import asyncio
+import pytest
+from wfir.models import WorkflowIR
+from wfir.runner import WorkflowRunner
+from wfir.verifier import WorkflowVerifier
+
+def _verify(nodes, edges):
+    return WorkflowVerifier(WorkflowIR(name="Verify", nodes=nodes, edges=edges)).verify()
+
+def _ref(node_id):
+    return {"valueFrom": {"nodeId": node_id}}
+
+def test_valid_linear_workflow():
+    nodes = [
+        {"id": "start", "type": "StartNode"},
+        {"id": "llm", "type": "LLM", "inputs": {"prompt": _ref("start")}},
+        {"id": "end", "type": "EndNode", "inputs": {"result": _ref("llm")}},
+    ]
+    edges = [{"source": "start", "target": "llm"}, {"source": "llm", "target": "end"}]
+    assert _verify(nodes, edges) == []
+
+def test_cycle_through_loop_node_is_allowed():
+    nodes = [
+        {"id": "start", "type": "StartNode"},
+        {"id": "loop", "type": "Loop", "inputs": {"count": _ref("start")}, "params": {"expression": "count < 3", "body_target": "body", "end_target": "end"}},
+        {"id": "body", "type": "LLM", "inputs": {"prompt": _ref("loop")}},
+        {"id": "end", "type": "EndNode", "inputs": {"result": _ref("loop")}},
+    ]
+    edges = [
+        {"source": "start", "target": "loop"},
+        {"source": "loop", "target": "body"},
+        {"source": "body", "target": "loop"},
+        {"source": "loop", "target": "end"},
+    ]
+    assert _verify(nodes, edges) == []
+
+def test_cycle_without_loop_node_is_reported():
+    nodes = [
+        {"id": "start", "type": "StartNode"},
+        {"id": "a", "type": "LLM"},
+        {"id": "b", "type": "LLM"},
+        {"id": "end", "type": "EndNode"},
+    ]
+    edges = [
+        {"source": "start", "target": "a"},
+        {"source": "a", "target": "b"},
+        {"source": "b", "target": "a"},
+        {"source": "b", "target": "end"},
+    ]
+    assert _verify(nodes, edges) == ["Workflow contains a cycle without a Loop node: ['a', 'b']"]
+
+def test_self_loop_is_reported():
+    nodes = [{"id": "start", "type": "StartNode"}, {"id": "a", "type": "LLM"}]
+    edges = [{"source": "start", "target": "a"}, {"source": "a", "target": "a"}]
+    assert _verify(nodes, edges) == ["Workflow contains a cycle without a Loop node: ['a']"]
+
+def test_input_from_single_branch_is_not_available():
+    nodes = [
+        {"id": "start", "type": "StartNode"},
+        {"id": "cond", "type": "Condition", "params": {"expression": "True", "true_target": "yes", "false_target": "no"}},
+        {"id": "yes", "type": "LLM"},
+        {"id": "no", "type": "LLM"},
+        {"id": "end", "type": "EndNode", "inputs": {"a": _ref("yes"), "s": _ref("start"), "m": _ref("missing")}},
+    ]
+    edges = [
+        {"source": "start", "target": "cond"},
+        {"source": "cond", "target": "yes"},
+        {"source": "cond", "target": "no"},
+        {"source": "yes", "target": "end"},
+        {"source": "no", "target": "end"},
+    ]
+    assert _verify(nodes, edges) == [
+        "Node 'end' input 'a' references node 'yes', which does not run before it on every path",
+        "Node 'end' input 'm' references missing node 'missing'",
+    ]
+
+def test_unreachable_loop_is_reported():
+    nodes = [
+        {"id": "start", "type": "StartNode"},
+        {"id": "loop", "type": "Loop", "params": {"expression": "True"}},
+        {"id": "body", "type": "LLM"},
+    ]
+    edges = [{"source": "loop", "target": "body"}, {"source": "body", "target": "loop"}]
+    assert _verify(nodes, edges) == [
+        "Node 'loop' is unreachable from the entry node",
+        "Node 'body' is unreachable from the entry node",
+    ]
+
+def test_deep_graph_does_not_recurse():
+    size = 20_000
+    nodes = [{"id": "n0", "type": "StartNode"}]
+    nodes += [{"id": f"n{i}", "type": "LLM", "inputs": {"prompt": _ref(f"n{i - 1}")}} for i in range(1, size)]
+    edges = [{"source": f"n{i}", "target": f"n{i + 1}"} for i in range(size - 1)]
+    edges.append({"source": f"n{size - 1}", "target": "n0"})
+    assert _verify(nodes, edges) == [f"Workflow contains a cycle without a Loop node: {[f'n{i}' for i in range(size)]}"]
+
+def test_runner_target_accepts_value_from_only_workflows():
+    # No edges: the runner orders nodes by their valueFrom dependencies alone
+    nodes = [
+        {"id": "start", "type": "StartNode"},
+        {"id": "a", "type": "LLM", "inputs": {"prompt": _ref("start")}},
+        {"id": "b", "type": "LLM", "inputs": {"prompt": _ref("start")}},
+        {"id": "end", "type": "EndNode", "inputs": {"a": _ref("a"), "b": _ref("b")}},
+    ]
+    workflow = WorkflowIR(name="Verify", nodes=nodes, edges=[])
+    assert WorkflowVerifier(workflow, target="runner").verify() == []
+    assert WorkflowVerifier(workflow).verify() != []
+
+    results = asyncio.run(WorkflowRunner.from_runtime(workflow).run())
+    assert set(results) == {"start", "a", "b", "end"}
+
+def test_runner_target_rejects_cycles_through_a_loop():
+    nodes = [
+        {"id": "start", "type": "StartNode"},
+        {"id": "loop", "type": "Loop", "params": {"expression": "True"}},
+        {"id": "body", "type": "LLM", "inputs": {"prompt": _ref("loop")}},
+        {"id": "self", "type": "EndNode", "inputs": {"result": _ref("self"), "x": _ref("missing")}},
+    ]
+    edges = [
+        {"source": "start", "target": "loop"},
+        {"source": "loop", "target": "body"},
+        {"source": "body", "target": "loop"},
+    ]
+    workflow = WorkflowIR(name="Verify", nodes=nodes, edges=edges)
+    assert WorkflowVerifier(workflow, target="runner").verify() == [
+        "Workflow contains a dependency cycle; nodes never become ready: ['loop', 'body']",
+        "Node 'self' input 'result' references the node itself",
+        "Node 'self' input 'x' references missing node 'missing'",
+    ]
+
+    del nodes[3]
+    workflow = WorkflowIR(name="Verify", nodes=nodes, edges=edges)
+    with pytest.raises(RuntimeError, match="dependency cycle"):
+        asyncio.run(WorkflowRunner(workflow).run())
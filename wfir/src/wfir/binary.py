@@ -0,0 +1,353 @@
+"""
+Compact binary encoding for WorkflowIR.
+
+The document is split into columns (the point is size: about 5x smaller than JSON
+for editor workflows; decoding is pure Python and no faster than orjson):
+
+    header      b"WFIR", format version, flags byte, int column width (1/2/4/8)
+    sections    little-endian u32 sizes: string blob bytes, ops, ints, floats
+    strings     every distinct string once, UTF-8, NUL-separated
+                (length-prefixed through the int column if a string contains NUL)
+    ops         one byte per tag: value tags, node/edge presence flags, input kinds
+    ints        fixed-width unsigned column: string refs, counts, node positions, zigzag ints
+    floats      float64 column
+
+Strings (ids, types, dict keys, string values) are interned in the table and
+referenced by position; edges reference nodes by position. Values are tagged
+(None, booleans, ints, floats, strings, lists, dicts), which keeps int/float
+distinctions and key order, so `loads(dumps(wf))` is exact.
+"""
+import struct
+import sys
+from array import array
+from typing import Any, Dict, List, Tuple
+
+from wfir.models import TRUSTED, WorkflowIR
+
+MAGIC = b"WFIR"
+FORMAT_VERSION = 1
+HEADER = MAGIC + bytes([FORMAT_VERSION])
+
+# Node metadata keys that only matter to the editor
+UI_METADATA_KEYS = ("position",)
+
+# Header flags
+_FLAG_STRIPPED = 0x01
+_FLAG_LENGTH_PREFIXED = 0x02
+
+# Value tags
+_NONE, _FALSE, _TRUE, _INT, _FLOAT, _STR, _LIST, _DICT, _BIGINT = range(9)
+
+# Node presence flags
+_HAS_INPUTS, _HAS_OUTPUTS, _HAS_PARAMS, _HAS_METADATA, _STREAM = 0x01, 0x02, 0x04, 0x08, 0x10
+# Edge presence flags
+_HAS_SOURCE_HANDLE, _HAS_TARGET_HANDLE, _HAS_CONDITION = 0x01, 0x02, 0x04
+
+# Input kinds
+_INPUT_VALUE, _INPUT_REF = 0, 1
+
+_DEFAULT_OUTPUTS = {"output": "Any"}
+
+# Section lengths: string blob bytes, op count, int count, float count
+_SECTIONS = struct.Struct("<IIII")
+_PREAMBLE = len(HEADER) + 2 + _SECTIONS.size
+# Zigzag-encoded ints must fit the widest int column; larger ones are stored as strings
+_MAX_INT = 1 << 63
+# Array typecode for each int column width
+_INT_TYPECODES = {array(code).itemsize: code for code in "QLIHB"}
+
+def is_binary(data: bytes) -> bool:
+    return data[:len(MAGIC)] == MAGIC
+
+def strip_ui_metadata(workflow: WorkflowIR) -> WorkflowIR:
+    """Copy of the workflow without editor-only node metadata (see `UI_METADATA_KEYS`)."""
+    nodes = []
+    for node in workflow.nodes:
+        if any(key in node.metadata for key in UI_METADATA_KEYS):
+            metadata = {k: v for k, v in node.metadata.items() if k not in UI_METADATA_KEYS}
+            node = node.model_copy(update={"metadata": metadata})
+        nodes.append(node)
+    return workflow.model_copy(update={"nodes": nodes})
+
+# --- Encoding ---
+
+class _Writer:
+    def __init__(self):
+        self.ops = bytearray()
+        self.ints: List[int] = []
+        self.floats: List[float] = []
+        self.strings: Dict[str, int] = {}
+
+    def string(self, s: str):
+        idx = self.strings.get(s)
+        if idx is None:
+            idx = self.strings[s] = len(self.strings)
+        self.ints.append(idx)
+
+    def value(self, v: Any):
+        ops = self.ops
+        if v is None:
+            ops.append(_NONE)
+        elif v is True:
+            ops.append(_TRUE)
+        elif v is False:
+            ops.append(_FALSE)
+        elif isinstance(v, str):
+            ops.append(_STR)
+            self.string(v)
+        elif isinstance(v, int):
+            if -_MAX_INT <= v < _MAX_INT:
+                ops.append(_INT)
+                self.ints.append(v << 1 if v >= 0 else ((-v) << 1) - 1)
+            else:
+                ops.append(_BIGINT)
+                self.string(str(v))
+        elif isinstance(v, float):
+            ops.append(_FLOAT)
+            self.floats.append(v)
+        elif isinstance(v, dict):
+            ops.append(_DICT)
+            self.ints.append(len(v))
+            for key, item in v.items():
+                if not isinstance(key, str):
+                    raise TypeError(f"Cannot encode non-string dict key {key!r}")
+                self.string(key)
+                self.value(item)
+        elif isinstance(v, (list, tuple)):
+            ops.append(_LIST)
+            self.ints.append(len(v))
+            for item in v:
+                self.value(item)
+        else:
+            raise TypeError(f"Cannot encode value of type {type(v).__name__}")
+
+    def finish(self, flags: int) -> bytes:
+        strings = list(self.strings)
+        if any("\x00" in s for s in strings):
+            # Rare: fall back to length-prefixed strings at the front of the int stream
+            flags |= _FLAG_LENGTH_PREFIXED
+            encoded = [s.encode("utf-8") for s in strings]
+            ints = [len(strings)] + [len(e) for e in encoded] + self.ints
+            blob = b"".join(encoded)
+        else:
+            ints = self.ints
+            blob = "\x00".join(strings).encode("utf-8")
+
+        typecode = _INT_TYPECODES[max(_width(max(ints, default=0)), 1)]
+        int_array = array(typecode, ints)
+        float_array = array("d", self.floats)
+        if sys.byteorder == "big":
+            int_array.byteswap()
+            float_array.byteswap()
+
+        return b"".join([
+            HEADER,
+            bytes([flags, int_array.itemsize]),
+            _SECTIONS.pack(len(blob), len(self.ops), len(int_array), len(float_array)),
+            blob,
+            self.ops,
+            int_array.tobytes(),
+            float_array.tobytes(),
+        ])
+
+def _width(n: int) -> int:
+    for size in (1, 2, 4, 8):
+        if n < 1 << (8 * size):
+            return size
+    raise OverflowError(n)
+
+def dumps(workflow: WorkflowIR, strip_metadata: bool = False) -> bytes:
+    """Encode a workflow. With `strip_metadata`, editor-only node metadata is dropped."""
+    if strip_metadata:
+        workflow = strip_ui_metadata(workflow)
+    index = workflow.graph.index
+    w = _Writer()
+    ops = w.ops
+    ints = w.ints
+
+    w.string(workflow.version)
+    w.string(workflow.name)
+    w.value(workflow.variables)
+
+    ints.append(len(workflow.nodes))
+    for node in workflow.nodes:
+        w.string(node.id)
+        w.string(node.type)
+        flags = 0
+        if node.inputs:
+            flags |= _HAS_INPUTS
+        if node.outputs != _DEFAULT_OUTPUTS:
+            flags |= _HAS_OUTPUTS
+        if node.params:
+            flags |= _HAS_PARAMS
+        if node.metadata:
+            flags |= _HAS_METADATA
+        if node.stream:
+            flags |= _STREAM
+        ops.append(flags)
+
+        if node.inputs:
+            ints.append(len(node.inputs))
+            for name, input_val in node.inputs.items():
+                w.string(name)
+                if input_val.value_from is not None:
+                    ops.append(_INPUT_REF)
+                    w.string(input_val.value_from.node_id)
+                else:
+                    ops.append(_INPUT_VALUE)
+                    w.value(input_val.value)
+        if flags & _HAS_OUTPUTS:
+            w.value(node.outputs)
+        if node.params:
+            w.value(node.params)
+        if node.metadata:
+            w.value(node.metadata)
+
+    ints.append(len(workflow.edges))
+    for edge in workflow.edges:
+        ints.append(index[edge.source])
+        ints.append(index[edge.target])
+        flags = 0
+        if edge.source_handle is not None:
+            flags |= _HAS_SOURCE_HANDLE
+        if edge.target_handle is not None:
+            flags |= _HAS_TARGET_HANDLE
+        if edge.condition is not None:
+            flags |= _HAS_CONDITION
+        ops.append(flags)
+        if edge.source_handle is not None:
+            w.string(edge.source_handle)
+        if edge.target_handle is not None:
+            w.string(edge.target_handle)
+        if edge.condition is not None:
+            w.string(edge.condition)
+
+    return w.finish(_FLAG_STRIPPED if strip_metadata else 0)
+
+# --- Decoding ---
+
+def decode(data: bytes) -> Tuple[Dict[str, Any], bool]:
+    """
+    Decode to the JSON-shaped dict `WorkflowIR` validates from.
+    Returns (data, metadata_stripped).
+    """
+    if not is_binary(data):
+        raise ValueError("Not a WFIR binary document (bad magic)")
+    if len(data) < _PREAMBLE or data[len(MAGIC)] != FORMAT_VERSION:
+        raise ValueError("Unsupported WFIR binary format version")
+
+    flags, itemsize = data[len(HEADER)], data[len(HEADER) + 1]
+    if itemsize not in _INT_TYPECODES:
+        raise ValueError(f"Corrupt WFIR binary: bad int width {itemsize}")
+    blob_len, ops_len, ints_len, floats_len = _SECTIONS.unpack_from(data, len(HEADER) + 2)
+    pos = _PREAMBLE
+    sections = []
+    for size in (blob_len, ops_len, ints_len * itemsize, floats_len * 8):
+        sections.append(data[pos:pos + size])
+        pos += size
+    if pos != len(data):
+        raise ValueError(f"Corrupt WFIR binary: expected {pos} bytes, got {len(data)}")
+    blob, ops_bytes, int_bytes, float_bytes = sections
+
+    int_array = array(_INT_TYPECODES[itemsize])
+    int_array.frombytes(int_bytes)
+    float_array = array("d")
+    float_array.frombytes(float_bytes)
+    if sys.byteorder == "big":
+        int_array.byteswap()
+        float_array.byteswap()
+
+    # Each stream is consumed through an iterator, so reading a value is a single call
+    streams = (iter(ops_bytes), iter(int_array.tolist()), iter(float_array.tolist()))
+    op, num, flt = (stream.__next__ for stream in streams)
+
+    try:
+        if flags & _FLAG_LENGTH_PREFIXED:
+            strings = []
+            offset = 0
+            for length in [num() for _ in range(num())]:
+                strings.append(str(blob[offset:offset + length], "utf-8"))
+                offset += length
+        else:
+            strings = str(blob, "utf-8").split("\x00")
+        # Ids and types repeat across workflows; interning shares them process-wide
+        strings = list(map(sys.intern, strings))
+
+        def value() -> Any:
+            tag = op()
+            if tag == _STR:
+                return strings[num()]
+            if tag == _DICT:
+                return {strings[num()]: value() for _ in range(num())}
+            if tag == _INT:
+                z = num()
+                return z >> 1 if not z & 1 else -((z + 1) >> 1)
+            if tag == _FLOAT:
+                return flt()
+            if tag == _NONE:
+                return None
+            if tag == _TRUE:
+                return True
+            if tag == _FALSE:
+                return False
+            if tag == _LIST:
+                return [value() for _ in range(num())]
+            if tag == _BIGINT:
+                return int(strings[num()])
+            raise ValueError(f"Corrupt WFIR binary: unknown value tag {tag}")
+
+        result: Dict[str, Any] = {"version": strings[num()], "name": strings[num()], "variables": value()}
+
+        nodes = []
+        ids = []
+        for _ in range(num()):
+            node_id = strings[num()]
+            node: Dict[str, Any] = {"id": node_id, "type": strings[num()]}
+            node_flags = op()
+            if node_flags & _HAS_INPUTS:
+                inputs = {}
+                for _ in range(num()):
+                    name = strings[num()]
+                    if op() == _INPUT_REF:
+                        inputs[name] = {"valueFrom": {"nodeId": strings[num()]}}
+                    else:
+                        inputs[name] = {"value": value()}
+                node["inputs"] = inputs
+            if node_flags & _HAS_OUTPUTS:
+                node["outputs"] = value()
+            if node_flags & _HAS_PARAMS:
+                node["params"] = value()
+            if node_flags & _HAS_METADATA:
+                node["metadata"] = value()
+            if node_flags & _STREAM:
+                node["stream"] = True
+            nodes.append(node)
+            ids.append(node_id)
+        result["nodes"] = nodes
+
+        edges = []
+        for _ in range(num()):
+            edge: Dict[str, Any] = {"source": ids[num()], "target": ids[num()]}
+            edge_flags = op()
+            if edge_flags & _HAS_SOURCE_HANDLE:
+                edge["sourceHandle"] = strings[num()]
+            if edge_flags & _HAS_TARGET_HANDLE:
+                edge["targetHandle"] = strings[num()]
+            if edge_flags & _HAS_CONDITION:
+                edge["condition"] = strings[num()]
+            edges.append(edge)
+        result["edges"] = edges
+    except (StopIteration, IndexError):
+        raise ValueError("Corrupt WFIR binary: unexpected end of data")
+
+    if any(next(stream, None) is not None for stream in streams):
+        raise ValueError("Corrupt WFIR binary: trailing data")
+    return result, bool(flags & _FLAG_STRIPPED)
+
+def loads(data: bytes, trusted: bool = False) -> WorkflowIR:
+    """
+    Decode a workflow written by `dumps`.
+    With `trusted`, structural validation is deferred as in `wfir.loader`.
+    """
+    result, _ = decode(data)
+    return WorkflowIR.model_validate(result, context=TRUSTED if trusted else None)
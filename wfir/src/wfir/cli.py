@@ -1,53 +1,202 @@
 import argparse
 import json
+import os
 import sys
-from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, List, Optional
 
-from wfir.models import WorkflowIR
-from wfir.compiler.langgraph.transpiler import LangGraphTranspiler
+# wfir modules are imported inside the commands that need them, so that `wfir --help`
+# doesn't pay for pydantic, and only compile commands pay for Jinja and the runtime.
+if TYPE_CHECKING:
+    from wfir.models import WorkflowIR
+
+BINARY_SUFFIX = ".wfirb"
+
+def read_workflow(input_path: str, trusted: bool = False) -> "WorkflowIR":
+    """Load a WFIR file (JSON or binary), exiting with an error message on failure."""
+    from wfir.loader import load_workflow
 
-def compile_workflow(input_path: str, target: str = "langgraph") -> str:
-    """
-    Compile a WFIR JSON file to the target language.
-    """
     try:
-        with open(input_path, "r") as f:
-            data = json.load(f)
+        with open(input_path, "rb") as f:
+            raw = f.read()
     except FileNotFoundError:
         print(f"Error: Input file '{input_path}' not found.", file=sys.stderr)
         sys.exit(1)
+
+    try:
+        return load_workflow(raw, trusted=trusted)
     except json.JSONDecodeError as e:
         print(f"Error: Failed to parse JSON file '{input_path}': {e}", file=sys.stderr)
         sys.exit(1)
-
-    try:
-        workflow = WorkflowIR(**data)
     except Exception as e:
         print(f"Error: Invalid WFIR format: {e}", file=sys.stderr)
         sys.exit(1)
 
-    if target == "langgraph":
-        transpiler = LangGraphTranspiler()
-        return transpiler.visit_workflow(workflow)
-    else:
+def validate_workflow(input_path: str, trusted: bool = False, target: str = "langgraph") -> List[str]:
+    """
+    Validate a WFIR file: schema, graph structure, data flow and node params
+    (see `WorkflowVerifier`), plus node types unknown to the registry.
+    `target` is what will execute it: the compiled "langgraph" graph or the dependency "runner".
+    Returns the list of errors; empty means valid.
+    """
+    from wfir.verifier import WorkflowVerifier
+    from wfir.runtime.registry import NodeRegistry
+
+    workflow = read_workflow(input_path, trusted)
+    errors = [
+        f"Node '{node.id}' has unknown type '{node.type}'"
+        for node in workflow.nodes
+        if not NodeRegistry.has(node.type)
+    ]
+    errors.extend(WorkflowVerifier(workflow, target).verify())
+    return errors
+
+def compile_workflow(input_path: str, target: str = "langgraph", async_nodes: bool = False, cache_dir: Optional[str] = None, optimize: bool = False, parallel: bool = False, trusted: bool = False,
+                     release_outputs: bool = False) -> str:
+    """
+    Compile a WFIR file (JSON or binary) to the target language.
+    With `cache_dir`, output is cached on disk by workflow content, target and compiler version.
+    With `optimize`, the IR optimizer runs first and its report is printed to stderr.
+    With `parallel`, edges are derived from data dependencies so independent nodes run concurrently.
+    With `trusted`, the IR is built without pydantic validation (for IR that was validated when stored).
+    With `release_outputs`, intermediate outputs are dropped from the state after their last reader.
+    """
+    from wfir.compiler.cache import CompileCache, SUPPORTED_TARGETS
+
+    workflow = read_workflow(input_path, trusted)
+
+    if target not in SUPPORTED_TARGETS:
         print(f"Error: Unsupported target '{target}'. Currently only 'langgraph' is supported.", file=sys.stderr)
         sys.exit(1)
 
+    if optimize:
+        from wfir.compiler.optimizer import Optimizer
+        workflow, reports = Optimizer().optimize(workflow)
+        for report in reports:
+            print(f"Optimizer [{report.pass_name}]: removed nodes {report.removed_nodes}", file=sys.stderr)
+            for note in report.notes:
+                print(f"  {note}", file=sys.stderr)
+
+    # Memory tier is useless for a one-shot process; the disk tier is what saves work here
+    cache = CompileCache(max_entries=1, cache_dir=cache_dir)
+    _, code = cache.compile(workflow, target, async_nodes, parallel, release_outputs=release_outputs)
+    return code
+
+def convert_workflow(input_path: str, output_path: str, to: Optional[str] = None, strip_metadata: bool = False) -> int:
+    """
+    Convert a WFIR file between JSON and the compact binary format (`wfir.binary`).
+    The output format is `to` ("json" or "binary"), or inferred from the output extension
+    (`.wfirb` is binary, anything else JSON). Returns the number of bytes written.
+    """
+    from wfir import binary
+
+    workflow = read_workflow(input_path)
+    if to is None:
+        to = "binary" if os.path.splitext(output_path)[1] == BINARY_SUFFIX else "json"
+
+    if to == "binary":
+        data = binary.dumps(workflow, strip_metadata=strip_metadata)
+    else:
+        if strip_metadata:
+            workflow = binary.strip_ui_metadata(workflow)
+        data = json.dumps(workflow.model_dump(mode="json", by_alias=True), indent=2).encode("utf-8")
+
+    with open(output_path, "wb") as f:
+        f.write(data)
+    return len(data)
+
+def compile_many_workflows(patterns: List[str], output_dir: str, target: str = "langgraph", async_nodes: bool = False, parallel: bool = False, optimize: bool = False, trusted: bool = False, jobs: Optional[int] = None, force: bool = False,
+                           release_outputs: bool = False) -> int:
+    """
+    Compile every file matched by `patterns` (globs or directories) into `output_dir`
+    and print a per-file timing summary. Returns the number of failed files.
+    """
+    from wfir.compiler.batch import collect_inputs, compile_many
+
+    inputs = collect_inputs(patterns, output_dir)
+    if not inputs:
+        print(f"Error: No input files matched {patterns}.", file=sys.stderr)
+        sys.exit(1)
+
+    try:
+        results, wall = compile_many(inputs, output_dir, target, async_nodes, parallel, optimize, trusted, jobs, force, release_outputs)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    counts = {"compiled": 0, "skipped": 0, "failed": 0}
+    for result in results:
+        counts[result.status] += 1
+        line = f"{result.status:>8} {result.seconds * 1e3:9.1f} ms  {result.input_path}"
+        if result.error:
+            line += f"  ({result.error})"
+        print(line)
+
+    busy = sum(r.seconds for r in results)
+    print(f"{len(results)} files: {counts['compiled']} compiled, {counts['skipped']} skipped, {counts['failed']} failed "
+          f"in {wall:.2f}s ({busy:.2f}s of work)")
+    return counts["failed"]
+
 def main():
     parser = argparse.ArgumentParser(description="WFIR Compiler CLI")
     subparsers = parser.add_subparsers(dest="command", help="Available commands")
 
     # Compile command
     compile_parser = subparsers.add_parser("compile", help="Compile WFIR to target code")
-    compile_parser.add_argument("input_file", help="Path to the input WFIR JSON file")
+    compile_parser.add_argument("input_file", help="Path to the input WFIR file (JSON or binary)")
     compile_parser.add_argument("--target", default="langgraph", help="Target platform (default: langgraph)")
+    compile_parser.add_argument("--async", dest="async_nodes", action="store_true", help="Emit async node functions (langgraph target)")
+    compile_parser.add_argument("--parallel", action="store_true", help="Run independent nodes in the same superstep based on data dependencies")
+    compile_parser.add_argument("--optimize", action="store_true", help="Run IR optimizer passes (pruning, constant conditions) before compiling")
+    compile_parser.add_argument("--trusted", action="store_true", help="Skip IR validation for already-validated input (faster loading)")
+    compile_parser.add_argument("--release-outputs", action="store_true", help="Drop intermediate outputs from the state once no node reads them (final and pinned outputs are kept)")
+    compile_parser.add_argument("--cache-dir", default=os.environ.get("WFIR_CACHE_DIR"), help="Directory for the on-disk compile cache (default: $WFIR_CACHE_DIR, disabled if unset)")
+
+    # Validate command
+    validate_parser = subparsers.add_parser("validate", help="Check a WFIR file for structural and data-flow errors")
+    validate_parser.add_argument("input_file", help="Path to the input WFIR file (JSON or binary)")
+    validate_parser.add_argument("--target", choices=["langgraph", "runner"], default="langgraph",
+                                 help="What will execute the workflow: the compiled graph (default) or the dependency runner")
+
+    # Convert command
+    convert_parser = subparsers.add_parser("convert", help="Convert WFIR between JSON and the compact binary format")
+    convert_parser.add_argument("input_file", help="Path to the input WFIR file (JSON or binary)")
+    convert_parser.add_argument("output_file", help=f"Path to write; '{BINARY_SUFFIX}' files are binary unless --to is given")
+    convert_parser.add_argument("--to", choices=["json", "binary"], help="Output format (default: inferred from the output extension)")
+    convert_parser.add_argument("--strip-metadata", action="store_true", help="Drop editor-only node metadata (positions)")
+
+    # Compile-many command
+    many_parser = subparsers.add_parser("compile-many", help="Compile many WFIR files in parallel into a directory")
+    many_parser.add_argument("inputs", nargs="+", help="Input files, globs (quote them; ** is supported) or directories")
+    many_parser.add_argument("-o", "--output-dir", required=True, help="Directory for the generated files")
+    many_parser.add_argument("--target", default="langgraph", help="Target platform (default: langgraph)")
+    many_parser.add_argument("--async", dest="async_nodes", action="store_true", help="Emit async node functions (langgraph target)")
+    many_parser.add_argument("--parallel", action="store_true", help="Run independent nodes in the same superstep based on data dependencies")
+    many_parser.add_argument("--optimize", action="store_true", help="Run IR optimizer passes before compiling")
+    many_parser.add_argument("--trusted", action="store_true", help="Skip IR validation for already-validated input (faster loading)")
+    many_parser.add_argument("--release-outputs", action="store_true", help="Drop intermediate outputs from the state once no node reads them (final and pinned outputs are kept)")
+    many_parser.add_argument("-j", "--jobs", type=int, default=None, help="Worker processes (default: CPU count)")
+    many_parser.add_argument("--force", action="store_true", help="Recompile inputs even if unchanged since the last run")
 
     args = parser.parse_args()
 
     if args.command == "compile":
-        result = compile_workflow(args.input_file, args.target)
+        result = compile_workflow(args.input_file, args.target, args.async_nodes, args.cache_dir, args.optimize, args.parallel, args.trusted, args.release_outputs)
         print(result)
+    elif args.command == "compile-many":
+        failed = compile_many_workflows(args.inputs, args.output_dir, args.target, args.async_nodes, args.parallel,
+                                        args.optimize, args.trusted, args.jobs, args.force, args.release_outputs)
+        if failed:
+            sys.exit(1)
+    elif args.command == "validate":
+        errors = validate_workflow(args.input_file, target=args.target)
+        for error in errors:
+            print(f"Error: {error}", file=sys.stderr)
+        if errors:
+            sys.exit(1)
+        print(f"{args.input_file}: valid")
+    elif args.command == "convert":
+        size = convert_workflow(args.input_file, args.output_file, args.to, args.strip_metadata)
+        print(f"Wrote {size} bytes to {args.output_file}", file=sys.stderr)
     else:
         parser.print_help()
 
@@ -0,0 +1,210 @@
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Set
+from wfir.graph import DominatorTree, depth_first
+from wfir.models import WorkflowIR, Node
+from wfir.runtime.registry import NodeRegistry
+
+# Nodes whose output drives routing; their outgoing edges are conditional
+CONTROL_TYPES = ("Condition", "Loop")
+
+def is_ordered(node: Node) -> bool:
+    """
+    Whether a node's position in the control flow is observable.
+    Nodes with side effects, unknown node types and End nodes keep their ordering;
+    side-effect-free nodes only need their data to be ready.
+    """
+    if node.type == "EndNode":
+        return True
+    node_cls = NodeRegistry.get_class(node.type)
+    return node_cls is None or node_cls.side_effects
+
+def parallel_dependencies(workflow: WorkflowIR) -> Optional[Dict[str, List[str]]]:
+    """
+    Compute the minimal set of nodes each node must wait for, based on data flow.
+
+    A node depends on the producers of its `valueFrom` inputs. Ordered nodes
+    (see `is_ordered`) additionally wait for the nearest ordered nodes before them
+    in the original edges, and End nodes keep all their incoming edges. Nodes left
+    without dependencies hang off the entry node (the first node).
+    Independent nodes therefore share a predecessor and can run concurrently.
+
+    Returns None when the rewrite isn't known to be safe: control nodes or
+    conditional edges, cycles, or nodes unreachable from the entry node.
+    The result maps every non-entry node id to its ordered list of dependencies.
+    """
+    if not workflow.nodes:
+        return None
+    if any(n.type in CONTROL_TYPES for n in workflow.nodes):
+        return None
+    if any(e.condition for e in workflow.edges):
+        return None
+
+    graph = workflow.graph
+    if graph.duplicate_ids or not graph.is_dag:
+        return None
+    count = len(graph)
+    entry = 0
+    ordered = [is_ordered(graph.node(i)) for i in range(count)]
+
+    # Every node must be reachable from the entry, otherwise relaxing edges would start it
+    reachable = bytearray(count)
+    reachable[entry] = 1
+    queue = deque([entry])
+    while queue:
+        for succ in graph.successors(queue.popleft()):
+            if not reachable[succ]:
+                reachable[succ] = 1
+                queue.append(succ)
+    if sum(reachable) != count:
+        return None
+
+    # Nearest ordered ancestors of each node, following original edges through unordered nodes
+    # (lists are never modified once built, so a node with one predecessor shares its list)
+    frontier: List[List[int]] = [[] for _ in range(count)]
+    for i in graph.topological_order:
+        if graph.in_degree(i) == 1:
+            pred = next(graph.predecessors(i))
+            frontier[i] = [pred] if ordered[pred] else frontier[pred]
+            continue
+        nearest: Dict[int, None] = {}
+        for pred in graph.predecessors(i):
+            if ordered[pred]:
+                nearest[pred] = None
+            else:
+                nearest.update(dict.fromkeys(frontier[pred]))
+        frontier[i] = list(nearest)
+
+    dep_index: Dict[int, List[int]] = {}
+    for i in graph.topological_order:
+        if i == entry:
+            continue
+        node_deps: Dict[int, None] = dict.fromkeys(graph.producers(i))
+        if graph.node(i).type == "EndNode":
+            node_deps.update(dict.fromkeys(graph.predecessors(i)))
+        elif ordered[i]:
+            node_deps.update(dict.fromkeys(frontier[i]))
+        node_deps.pop(i, None)
+        dep_index[i] = list(node_deps) or [entry]
+
+    # Data references against the edge direction could introduce a cycle
+    remaining = {i: len(d) for i, d in dep_index.items()}
+    dependents: List[List[int]] = [[] for _ in range(count)]
+    for i, node_deps in dep_index.items():
+        for dep in node_deps:
+            dependents[dep].append(i)
+    queue = deque([entry])
+    visited = 0
+    while queue:
+        visited += 1
+        for dependent in dependents[queue.popleft()]:
+            remaining[dependent] -= 1
+            if remaining[dependent] == 0:
+                queue.append(dependent)
+    if visited != count:
+        return None
+
+    ids = graph.ids
+    return {ids[i]: [ids[d] for d in node_deps] for i, node_deps in dep_index.items()}
+
+def retained_outputs(workflow: WorkflowIR, pinned: Iterable[str] = ()) -> Set[str]:
+    """
+    Nodes whose output is kept for the whole run even when nothing reads it anymore:
+    final outputs (those no node reads through `valueFrom`), control nodes (routing
+    reads their output), nodes pinned with `metadata.pinned` and the `pinned` ids.
+    """
+    graph = workflow.graph
+    kept = set(pinned)
+    for i, node in enumerate(workflow.nodes):
+        if len(graph.consumers(i)) == 0 or node.type in CONTROL_TYPES or node.metadata.get("pinned"):
+            kept.add(node.id)
+    return kept
+
+def release_plan(workflow: WorkflowIR, pinned: Iterable[str] = (), dependencies: Optional[Dict[str, List[str]]] = None) -> Dict[str, List[str]]:
+    """
+    Liveness of node outputs: which outputs each node can release once it has run.
+
+    The output of node P is dead after its last reader R (through `valueFrom`) when every
+    other reader of P always runs before R, and neither P nor R can run again afterwards.
+    With the listed edges (`dependencies` None), "always before" is dominance from the entry
+    node, and nodes that may run more than once (in a cycle, or at or after a join of
+    unconditional branches) never release or get released. With `dependencies` (as
+    returned by `parallel_dependencies`, an acyclic schedule run in supersteps) it is running
+    in an earlier superstep than R. Neither needs more than near-linear time and memory.
+    Outputs in `retained_outputs` are never released, and neither is an output without
+    a reader that qualifies, so every live output stays available.
+
+    Returns reader id -> ids of the outputs it releases, for readers that release any.
+    """
+    graph = workflow.graph
+    count = len(graph)
+    if not count or graph.duplicate_ids:
+        return {}
+    kept = retained_outputs(workflow, pinned)
+
+    if dependencies is None:
+        components, postorder, reached = depth_first(graph, [0])
+        dominators = DominatorTree(graph, [0], postorder[:reached])
+        repeats = bytearray(count)
+        for component in components:
+            if len(component) > 1:
+                for i in component:
+                    repeats[i] = 1
+        for e in range(len(graph.edge_source)):
+            if graph.edge_source[e] == graph.edge_target[e]:
+                repeats[graph.edge_source[e]] = 1
+        # After an unconditional fan-out several branches are active at once, and a node
+        # joining them is triggered by each branch: joins and what follows may run again
+        if any(graph.out_degree(i) > 1 and graph.node(i).type not in CONTROL_TYPES for i in range(count)):
+            joins = [i for i in range(count) if graph.in_degree(i) > 1]
+            seen = bytearray(count)
+            queue = deque(joins)
+            while queue:
+                i = queue.popleft()
+                if not seen[i]:
+                    seen[i] = repeats[i] = 1
+                    queue.extend(graph.successors(i))
+
+        def before(a: int, b: int) -> bool:
+            return a != b and dominators.dominates(a, b)
+    else:
+        # The schedule runs as LangGraph supersteps: a node runs in the step after its last
+        # dependency, and a step starts once every node of the previous one has finished.
+        # A reader in a later step than all the other readers runs after them. Steps come
+        # from one pass in topological order, instead of comparing ancestor sets.
+        index = graph.index
+        deps_of = {index[node_id]: [index[d] for d in deps] for node_id, deps in dependencies.items()}
+        dependents: List[List[int]] = [[] for _ in range(count)]
+        remaining = [0] * count
+        for i, deps in deps_of.items():
+            remaining[i] = len(deps)
+            for d in deps:
+                dependents[d].append(i)
+        step = [0] * count
+        repeats = bytearray(count)
+        queue = deque(i for i in range(count) if remaining[i] == 0)
+        while queue:
+            i = queue.popleft()
+            for dependent in dependents[i]:
+                step[dependent] = max(step[dependent], step[i] + 1)
+                remaining[dependent] -= 1
+                if remaining[dependent] == 0:
+                    queue.append(dependent)
+
+        def before(a: int, b: int) -> bool:
+            return step[a] < step[b]
+
+    plan: Dict[str, List[str]] = {}
+    for p in range(count):
+        producer = graph.ids[p]
+        if producer in kept or repeats[p]:
+            continue
+        readers = list(dict.fromkeys(graph.consumers(p)))
+        last = readers[0]
+        for r in readers[1:]:
+            if before(last, r):
+                last = r
+        if repeats[last] or not before(p, last):
+            continue
+        if all(before(r, last) for r in readers if r != last):
+            plan.setdefault(graph.ids[last], []).append(producer)
+    return plan
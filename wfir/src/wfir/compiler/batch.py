@@ -0,0 +1,201 @@
+import glob
+import hashlib
+import json
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple
+from pydantic import BaseModel
+from wfir.compiler.cache import SUPPORTED_TARGETS, compiler_version
+
+# Input files picked up when a directory is given
+INPUT_SUFFIXES = (".json", ".wfirb")
+# Records the input hash each output was built from, for skipping unchanged inputs
+MANIFEST_NAME = ".wfir-manifest.json"
+
+class BatchResult(BaseModel):
+    """Outcome of compiling one input file."""
+    input_path: str
+    output_path: str
+    status: str # "compiled", "skipped" or "failed"
+    seconds: float = 0.0
+    error: Optional[str] = None
+    key: Optional[str] = None
+
+def collect_inputs(patterns: Iterable[str], output_dir: Optional[str] = None) -> List[str]:
+    """
+    Expand directories (searched recursively for `INPUT_SUFFIXES`) and globs
+    into a sorted, de-duplicated list of files.
+    Manifests and anything under `output_dir` are left out, so an output directory
+    inside an input directory isn't picked up on the next run.
+    """
+    excluded = os.path.abspath(output_dir) if output_dir else None
+
+    def wanted(path: str) -> bool:
+        if os.path.basename(path) == MANIFEST_NAME:
+            return False
+        if excluded is None:
+            return True
+        return os.path.commonpath([excluded, os.path.abspath(path)]) != excluded
+
+    paths: Dict[str, None] = {}
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            for root, dirs, files in os.walk(pattern):
+                dirs.sort()
+                for name in sorted(files):
+                    path = os.path.join(root, name)
+                    if name.endswith(INPUT_SUFFIXES) and wanted(path):
+                        paths[path] = None
+        else:
+            for path in sorted(glob.glob(pattern, recursive=True)):
+                if os.path.isfile(path) and wanted(path):
+                    paths[path] = None
+    return sorted(paths)
+
+def output_paths(inputs: List[str], output_dir: str) -> Dict[str, str]:
+    """
+    Map each input to `<output_dir>/<path relative to the inputs' common directory>.py`,
+    so inputs with the same file name in different directories don't collide.
+    Raises ValueError if inputs still share an output, e.g. `wf.json` next to its `wf.wfirb`.
+    """
+    if not inputs:
+        return {}
+    base = os.path.commonpath([os.path.dirname(os.path.abspath(p)) for p in inputs])
+    outputs = {
+        p: os.path.join(output_dir, os.path.splitext(os.path.relpath(os.path.abspath(p), base))[0] + ".py")
+        for p in inputs
+    }
+    claimed: Dict[str, str] = {}
+    for input_path, output_path in outputs.items():
+        other = claimed.setdefault(output_path, input_path)
+        if other != input_path:
+            raise ValueError(f"'{other}' and '{input_path}' would both be compiled to '{output_path}'; compile them separately")
+    return outputs
+
+def input_key(raw: bytes, target: str, async_nodes: bool, parallel: bool, optimize: bool, release_outputs: bool = False) -> str:
+    """Hash of the raw input and everything else that affects the output, computed without parsing."""
+    digest = hashlib.sha256(raw)
+    digest.update(f"\0{target}\0async={async_nodes}\0parallel={parallel}\0optimize={optimize}\0{compiler_version()}".encode("utf-8"))
+    if release_outputs:
+        # Only when set, so existing manifest entries stay valid (as in `compile_key`)
+        digest.update(b"\0release_outputs")
+    return digest.hexdigest()
+
+def _write_atomic(path: str, data: str):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+def _error_summary(error: Exception) -> str:
+    """First line of the message; pydantic errors span many lines."""
+    lines = str(error).splitlines()
+    return f"{type(error).__name__}: {lines[0] if lines else ''}"
+
+def _warm_worker():
+    """Pay the transpiler/Jinja/pydantic imports once per worker process, not per file."""
+    import wfir.compiler.langgraph.transpiler
+    import wfir.compiler.optimizer # noqa: F401
+
+def _compile_one(input_path: str, output_path: str, target: str, async_nodes: bool, parallel: bool, optimize: bool, trusted: bool,
+                 release_outputs: bool = False) -> BatchResult:
+    """Worker: load, optionally optimize, compile and write one file."""
+    from wfir.compiler.cache import compile_ir
+    from wfir.loader import load_workflow
+
+    start = time.perf_counter()
+    try:
+        with open(input_path, "rb") as f:
+            raw = f.read()
+        key = input_key(raw, target, async_nodes, parallel, optimize, release_outputs)
+        workflow = load_workflow(raw, trusted=trusted)
+        if optimize:
+            from wfir.compiler.optimizer import Optimizer
+            workflow, _ = Optimizer().optimize(workflow)
+        code = compile_ir(workflow, target, async_nodes, parallel, release_outputs)
+        _write_atomic(output_path, code)
+    except Exception as e:
+        return BatchResult(input_path=input_path, output_path=output_path, status="failed",
+                           seconds=time.perf_counter() - start, error=_error_summary(e))
+    return BatchResult(input_path=input_path, output_path=output_path, status="compiled",
+                       seconds=time.perf_counter() - start, key=key)
+
+def _load_manifest(output_dir: str) -> Dict[str, str]:
+    try:
+        with open(os.path.join(output_dir, MANIFEST_NAME), "r", encoding="utf-8") as f:
+            return json.load(f).get("outputs", {})
+    except (FileNotFoundError, ValueError):
+        return {}
+
+def compile_many(
+    inputs: List[str],
+    output_dir: str,
+    target: str = "langgraph",
+    async_nodes: bool = False,
+    parallel: bool = False,
+    optimize: bool = False,
+    trusted: bool = False,
+    jobs: Optional[int] = None,
+    force: bool = False,
+    release_outputs: bool = False,
+) -> Tuple[List[BatchResult], float]:
+    """
+    Compile many files into `output_dir` using a process pool (`jobs` workers, default: CPU count).
+
+    Inputs whose hash (raw bytes plus options and compiler version) matches the manifest
+    entry of an existing output are skipped unless `force` is set. Files that fail are
+    reported, not raised. `release_outputs` is passed to the transpiler (see `compile_ir`). Returns (results in input order, wall-clock seconds).
+    """
+    if target not in SUPPORTED_TARGETS:
+        raise ValueError(f"Unsupported target '{target}'. Currently only 'langgraph' is supported.")
+
+    start = time.perf_counter()
+    manifest = {} if force else _load_manifest(output_dir)
+    results: Dict[str, BatchResult] = {}
+    pending: List[Tuple[str, str]] = []
+
+    for input_path, output_path in output_paths(inputs, output_dir).items():
+        rel_output = os.path.relpath(output_path, output_dir)
+        if rel_output in manifest and os.path.exists(output_path):
+            hash_start = time.perf_counter()
+            try:
+                with open(input_path, "rb") as f:
+                    key = input_key(f.read(), target, async_nodes, parallel, optimize, release_outputs)
+            except OSError:
+                key = None
+            if key == manifest[rel_output]:
+                results[input_path] = BatchResult(input_path=input_path, output_path=output_path, status="skipped",
+                                                  seconds=time.perf_counter() - hash_start, key=key)
+                continue
+        pending.append((input_path, output_path))
+
+    options = (target, async_nodes, parallel, optimize, trusted, release_outputs)
+    workers = min(jobs or os.cpu_count() or 1, len(pending))
+    if workers <= 1:
+        # No point starting a pool (and re-importing everything) for a single worker
+        for input_path, output_path in pending:
+            results[input_path] = _compile_one(input_path, output_path, *options)
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_warm_worker) as pool:
+            futures = {pool.submit(_compile_one, i, o, *options): i for i, o in pending}
+            for future, input_path in futures.items():
+                results[input_path] = future.result()
+
+    # Remember what each output was built from; failed outputs are forgotten
+    os.makedirs(output_dir, exist_ok=True)
+    for result in results.values():
+        rel_output = os.path.relpath(result.output_path, output_dir)
+        if result.status == "failed":
+            manifest.pop(rel_output, None)
+        else:
+            manifest[rel_output] = result.key
+    _write_atomic(os.path.join(output_dir, MANIFEST_NAME), json.dumps({"outputs": manifest}, indent=2, sort_keys=True))
+
+    return [results[p] for p in inputs], time.perf_counter() - start
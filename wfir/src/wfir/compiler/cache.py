@@ -0,0 +1,152 @@
+import hashlib
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from importlib import metadata
+from typing import Any, Hashable, Optional, Tuple
+from wfir.models import WorkflowIR
+
+SUPPORTED_TARGETS = ("langgraph",)
+
+@lru_cache(maxsize=None)
+def compiler_version() -> str:
+    """
+    Version string folded into every cache key.
+    Combines the package version with a digest of the bundled templates,
+    so editing a template invalidates previously cached output.
+    """
+    try:
+        version = metadata.version("wfir")
+    except metadata.PackageNotFoundError:
+        version = "0.0.0"
+
+    digest = hashlib.sha256()
+    template_root = os.path.dirname(__file__)
+    for root, dirs, files in os.walk(template_root):
+        dirs.sort()
+        for name in sorted(files):
+            if name.endswith(".j2"):
+                path = os.path.join(root, name)
+                digest.update(os.path.relpath(path, template_root).encode("utf-8"))
+                with open(path, "rb") as f:
+                    digest.update(f.read())
+    return f"{version}+{digest.hexdigest()[:12]}"
+
+def compile_key(workflow: WorkflowIR, target: str = "langgraph", async_nodes: bool = False, parallel: bool = False, release_outputs: bool = False) -> str:
+    """Content-addressed key for a compilation: IR content, target, options and compiler version."""
+    parts = [workflow.content_hash(), target, f"async={async_nodes}", f"parallel={parallel}", compiler_version()]
+    if release_outputs:
+        # Only when set, so keys of existing cache entries stay valid
+        parts.append("release_outputs")
+    return hashlib.sha256("\0".join(parts).encode("utf-8")).hexdigest()
+
+def compile_ir(workflow: WorkflowIR, target: str = "langgraph", async_nodes: bool = False, parallel: bool = False, release_outputs: bool = False) -> str:
+    """Compile without caching. Raises ValueError for unsupported targets."""
+    if target == "langgraph":
+        from wfir.compiler.langgraph.transpiler import LangGraphTranspiler
+        return LangGraphTranspiler(async_nodes=async_nodes, parallel=parallel, release_outputs=release_outputs).visit_workflow(workflow)
+    raise ValueError(f"Unsupported target '{target}'. Currently only 'langgraph' is supported.")
+
+class CompileCache:
+    """
+    Two-tier cache of generated code.
+    The in-memory tier is an LRU bounded by `max_entries`; the optional on-disk
+    tier under `cache_dir` persists across processes (CLI runs, API restarts).
+    """
+
+    def __init__(self, max_entries: int = 256, cache_dir: Optional[str] = None, max_sessions: int = 64):
+        self.max_entries = max_entries
+        self.cache_dir = cache_dir
+        self.max_sessions = max_sessions
+        self._memory: "OrderedDict[str, str]" = OrderedDict()
+        # (session, options) -> (lock, transpiler) kept across compiles of one edited workflow
+        self._sessions: "OrderedDict[Hashable, Tuple[threading.Lock, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], f"{key}.py")
+
+    def _remember(self, key: str, code: str):
+        with self._lock:
+            self._memory[key] = code
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            code = self._memory.get(key)
+            if code is not None:
+                self._memory.move_to_end(key)
+                return code
+
+        if self.cache_dir:
+            try:
+                with open(self._disk_path(key), "r", encoding="utf-8") as f:
+                    code = f.read()
+            except FileNotFoundError:
+                return None
+            self._remember(key, code)
+            return code
+        return None
+
+    def put(self, key: str, code: str):
+        self._remember(key, code)
+        if self.cache_dir:
+            path = self._disk_path(key)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Write atomically so concurrent readers never see a partial file
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    f.write(code)
+                os.replace(tmp_path, path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+
+    def _session_transpiler(self, session: Hashable, async_nodes: bool, parallel: bool, release_outputs: bool) -> Tuple[threading.Lock, Any]:
+        """The transpiler kept for `session`, created on first use; the least recently used ones are dropped."""
+        from wfir.compiler.langgraph.transpiler import LangGraphTranspiler
+
+        key = (session, async_nodes, parallel, release_outputs)
+        with self._lock:
+            entry = self._sessions.get(key)
+            if entry is None:
+                transpiler = LangGraphTranspiler(async_nodes=async_nodes, parallel=parallel, release_outputs=release_outputs)
+                entry = self._sessions[key] = (threading.Lock(), transpiler)
+            self._sessions.move_to_end(key)
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+            return entry
+
+    def compile(self, workflow: WorkflowIR, target: str = "langgraph", async_nodes: bool = False, parallel: bool = False, key: Optional[str] = None,
+                release_outputs: bool = False, session: Optional[Hashable] = None) -> Tuple[str, str]:
+        """
+        Return (key, code), compiling only on a cache miss.
+        The key doubles as an ETag for HTTP callers; pass it in if already computed.
+        `session` (e.g. the id of a workflow being edited) keeps one transpiler per session,
+        so a miss after an edit only re-renders the nodes that changed.
+        """
+        if target not in SUPPORTED_TARGETS:
+            raise ValueError(f"Unsupported target '{target}'. Currently only 'langgraph' is supported.")
+
+        key = key or compile_key(workflow, target, async_nodes, parallel, release_outputs)
+        code = self.get(key)
+        if code is not None:
+            self.hits += 1
+            return key, code
+
+        self.misses += 1
+        if session is None:
+            code = compile_ir(workflow, target, async_nodes, parallel, release_outputs)
+        else:
+            lock, transpiler = self._session_transpiler(session, async_nodes, parallel, release_outputs)
+            with lock:
+                code = transpiler.visit_workflow(workflow)
+        self.put(key, code)
+        return key, code
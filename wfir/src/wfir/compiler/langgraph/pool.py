@@ -0,0 +1,95 @@
+import threading
+import types
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+from wfir.models import WorkflowIR
+from wfir.compiler.cache import CompileCache, compile_key
+
+def load_module(code: str, key: str) -> types.ModuleType:
+    """Execute generated code as a fresh module (not added to `sys.modules`)."""
+    module = types.ModuleType(f"wfir_graph_{key[:12]}")
+    exec(compile(code, f"<wfir-graph {key[:12]}>", "exec"), module.__dict__)
+    return module
+
+class GraphPool:
+    """
+    Bounded LRU of compiled LangGraph graphs, keyed by `compile_key` (workflow content,
+    options and compiler version), so that serving a workflow doesn't rebuild its graph per request.
+
+    On a miss the IR is transpiled (through `compile_cache`, if given), the generated module
+    is executed in-process and `build_graph().compile()` is called once. Concurrent misses
+    for the same key build it once. Compiled graphs keep no per-run state and can be
+    invoked concurrently.
+    """
+
+    def __init__(self, max_entries: int = 64, async_nodes: bool = True, parallel: bool = False, compile_cache: Optional[CompileCache] = None,
+                 release_outputs: bool = False):
+        """
+        Args:
+            async_nodes: Generate async node functions (for `ainvoke`), so concurrent runs
+                share the event loop instead of blocking it.
+            release_outputs: Drop intermediate outputs from the state once no node needs them
+                (see `LangGraphTranspiler`); the returned state then holds only final and pinned outputs.
+        """
+        self.max_entries = max_entries
+        self.async_nodes = async_nodes
+        self.parallel = parallel
+        self.release_outputs = release_outputs
+        self.compile_cache = compile_cache or CompileCache(max_entries=max_entries)
+        self._graphs: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        # key -> lock held while that key is being built
+        self._building: Dict[str, threading.Lock] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, workflow: WorkflowIR) -> str:
+        return compile_key(workflow, "langgraph", self.async_nodes, self.parallel, self.release_outputs)
+
+    def peek(self, key: str) -> Optional[Any]:
+        """The compiled graph for `key` if it is warm, without building it."""
+        with self._lock:
+            graph = self._graphs.get(key)
+            if graph is not None:
+                self._graphs.move_to_end(key)
+                self.hits += 1
+            return graph
+
+    def get(self, workflow: WorkflowIR, key: Optional[str] = None, session: Optional[Hashable] = None) -> Any:
+        """
+        Return the compiled graph for the workflow, building it on a miss.
+        `session` is passed to `CompileCache.compile`, so rebuilding an edited workflow
+        re-renders only its changed nodes.
+        """
+        key = key or self.key(workflow)
+        graph = self.peek(key)
+        if graph is not None:
+            return graph
+
+        with self._lock:
+            build_lock = self._building.setdefault(key, threading.Lock())
+        with build_lock:
+            # Another caller may have built it while we waited
+            graph = self.peek(key)
+            if graph is None:
+                graph = self._build(workflow, key, session)
+                with self._lock:
+                    self.misses += 1
+                    self._graphs[key] = graph
+                    while len(self._graphs) > self.max_entries:
+                        self._graphs.popitem(last=False)
+        with self._lock:
+            self._building.pop(key, None)
+        return graph
+
+    def _build(self, workflow: WorkflowIR, key: str, session: Optional[Hashable] = None) -> Any:
+        _, code = self.compile_cache.compile(workflow, "langgraph", self.async_nodes, self.parallel, key=key,
+                                             release_outputs=self.release_outputs, session=session)
+        return load_module(code, key).build_graph().compile()
+
+    def __len__(self) -> int:
+        return len(self._graphs)
+
+    def clear(self):
+        with self._lock:
+            self._graphs.clear()
@@ -1,14 +1,61 @@
+import math
 import os
-from typing import List, Dict, Any
+from functools import lru_cache
+from typing import List, Dict, Any, Tuple
 from jinja2 import Environment, FileSystemLoader
 from wfir.models import WorkflowIR, Node, Edge
 from wfir.compiler.base import IRVisitor
+from wfir.compiler.analysis import parallel_dependencies, release_plan
+from wfir.runtime.base import state_key
+
+TEMPLATE_DIR = os.path.join(os.path.dirname(__file__), "templates")
+
+def py_literal(value: Any) -> str:
+    """
+    Python source for a JSON-like value.
+    Like `repr`, except that non-finite floats become `float("inf")`/`float("nan")`,
+    since their repr (`inf`, `nan`) isn't a valid expression.
+    """
+    if isinstance(value, float) and not math.isfinite(value):
+        return f'float("{value}")'
+    if isinstance(value, dict):
+        return "{" + ", ".join(f"{py_literal(k)}: {py_literal(v)}" for k, v in value.items()) + "}"
+    if isinstance(value, list):
+        return "[" + ", ".join(py_literal(v) for v in value) + "]"
+    if isinstance(value, tuple):
+        items = [py_literal(v) for v in value]
+        return "(" + ", ".join(items) + ("," if len(items) == 1 else "") + ")"
+    return repr(value)
+
+@lru_cache(maxsize=None)
+def _template_env() -> Environment:
+    """
+    Shared Jinja environment.
+    Templates are loaded from disk and compiled once per process instead of per transpiler.
+    """
+    env = Environment(loader=FileSystemLoader(TEMPLATE_DIR), auto_reload=False)
+    env.filters["repr"] = repr
+    return env
 
 class LangGraphTranspiler(IRVisitor):
-    def __init__(self):
-        template_dir = os.path.join(os.path.dirname(__file__), "templates")
-        self.env = Environment(loader=FileSystemLoader(template_dir))
-        self.env.filters["repr"] = repr
+    def __init__(self, async_nodes: bool = False, parallel: bool = False, release_outputs: bool = False):
+        """
+        Args:
+            async_nodes: Emit `async def` node functions that await `aexecute`,
+                for hosts running the graph with `ainvoke`/`astream`.
+            parallel: Derive edges from data dependencies instead of the listed edges,
+                so independent nodes fan out into the same superstep and joins wait
+                for all their inputs. Falls back to the listed edges when unsafe
+                (see `wfir.compiler.analysis.parallel_dependencies`).
+            release_outputs: Reset a node's `<id>_output` state key to None once its last
+                reader has run (see `wfir.compiler.analysis.release_plan`), so large
+                intermediate outputs aren't held for the rest of the run. Final outputs
+                and nodes with `metadata.pinned` keep their value.
+        """
+        self.async_nodes = async_nodes
+        self.parallel = parallel
+        self.release_outputs = release_outputs
+        self.env = _template_env()
         
         self.node_definitions: List[str] = []
         self.edge_definitions: List[str] = []
@@ -16,6 +63,15 @@ class LangGraphTranspiler(IRVisitor):
         self.edges: List[Edge] = []
         self.variables: Dict[str, str] = {}
         self.start_node_id: str = ""
+        # Reader id -> state keys it resets to None
+        self.releases: Dict[str, List[str]] = {}
+
+        # Incremental compilation: node id -> (fingerprint, rendered code).
+        # Reusing a transpiler across edits only re-renders nodes whose definition changed.
+        self._node_cache: Dict[str, Tuple[str, str]] = {}
+        # Condition node id -> (outgoing targets, rendered conditional edge block)
+        self._conditional_edge_cache: Dict[str, Tuple[Tuple[str, ...], str]] = {}
+        self.rendered_nodes: int = 0
 
     def _map_type(self, wfir_type: str) -> str:
         type_map = {
@@ -36,6 +92,11 @@ class LangGraphTranspiler(IRVisitor):
         return type_map.get(wfir_type, "Any")
 
     def visit_workflow(self, workflow: WorkflowIR) -> str:
+        # Per-call output; reset so a reused transpiler doesn't accumulate definitions
+        self.node_definitions = []
+        self.edge_definitions = []
+        self.rendered_nodes = 0
+
         self.nodes = workflow.nodes
         self.edges = workflow.edges
         self.variables = {k: self._map_type(str(v)) for k, v in workflow.variables.items()}
@@ -43,6 +104,12 @@ class LangGraphTranspiler(IRVisitor):
         if self.nodes:
             self.start_node_id = self.nodes[0].id # Naive assumption for now
 
+        parallel_deps = parallel_dependencies(workflow) if self.parallel else None
+        self.releases = {}
+        if self.release_outputs:
+            plan = release_plan(workflow, dependencies=parallel_deps)
+            self.releases = {reader: [self._state_key(p) for p in dead] for reader, dead in plan.items()}
+
         # 1. Visit Nodes to generate definitions
         for node in self.nodes:
             self.visit_node(node)
@@ -60,19 +127,32 @@ class LangGraphTranspiler(IRVisitor):
         # Let's process edges.
         # First, identify Condition nodes.
         condition_nodes = {n.id: n for n in self.nodes if n.type in ["Condition", "Loop"]}
-        
-        # Standard edges (Source is NOT a condition node)
-        for edge in self.edges:
-            if edge.source not in condition_nodes:
-                # Standard edge
-                # Check if target is a condition node? No, that's fine.
-                self.edge_definitions.append(f'workflow.add_edge("{edge.source}", "{edge.target}")')
+        graph = workflow.graph
+
+        if parallel_deps is not None:
+            # Fan-out: several nodes waiting on the same node start together.
+            # Fan-in: a list of sources makes LangGraph wait for all of them.
+            # Each node writes only its own `<id>_output` key, so concurrent updates
+            # in one superstep never collide and the default last-value reducer is correct.
+            for target, deps in parallel_deps.items():
+                if len(deps) == 1:
+                    self.edge_definitions.append(f'workflow.add_edge("{deps[0]}", "{target}")')
+                else:
+                    sources = ", ".join(f'"{dep}"' for dep in deps)
+                    self.edge_definitions.append(f'workflow.add_edge([{sources}], "{target}")')
+        else:
+            # Standard edges (Source is NOT a condition node)
+            for edge in self.edges:
+                if edge.source not in condition_nodes:
+                    # Standard edge
+                    # Check if target is a condition node? No, that's fine.
+                    self.edge_definitions.append(f'workflow.add_edge("{edge.source}", "{edge.target}")')
 
         # Conditional edges (Source IS a condition node)
         # We need to group outgoing edges from a condition node.
         for cond_id, cond_node in condition_nodes.items():
             # Find edges starting from this condition node
-            outgoing = [e for e in self.edges if e.source == cond_id]
+            outgoing = [graph.edge(e) for e in graph.out_edges(graph.index[cond_id])]
             
             # In LangGraph, a conditional edge usually requires a routing function.
             # Since we mapped Condition Node to a python function (in visit_node),
@@ -89,10 +169,19 @@ class LangGraphTranspiler(IRVisitor):
             
             # Let's assume visit_node for Condition generates code that returns the target ID.
             
-            mapping_str = ", ".join([f'"{tgt}": "{tgt}"' for tgt in path_map.keys()])
-            self.edge_definitions.append(
-                f'workflow.add_conditional_edges("{cond_id}", lambda x: x["{cond_id.replace("-", "_")}_output"], {{{mapping_str}}})'
-            )
+            targets = tuple(path_map.keys())
+            cached = self._conditional_edge_cache.get(cond_id)
+            if cached is None or cached[0] != targets:
+                mapping_str = ", ".join([f'"{tgt}": "{tgt}"' for tgt in targets])
+                cached = (targets, f'workflow.add_conditional_edges("{cond_id}", lambda x: x["{cond_id.replace("-", "_")}_output"], {{{mapping_str}}})')
+                self._conditional_edge_cache[cond_id] = cached
+            self.edge_definitions.append(cached[1])
+
+        # Forget nodes that were removed since the previous compile
+        if len(self._node_cache) > len(self.nodes) or len(self._conditional_edge_cache) > len(condition_nodes):
+            node_ids = {n.id for n in self.nodes}
+            self._node_cache = {k: v for k, v in self._node_cache.items() if k in node_ids}
+            self._conditional_edge_cache = {k: v for k, v in self._conditional_edge_cache.items() if k in condition_nodes}
 
         # 3. Render Workflow
         template = self.env.get_template("workflow.py.j2")
@@ -104,13 +193,52 @@ class LangGraphTranspiler(IRVisitor):
             start_node_id=self.start_node_id
         )
 
+    @staticmethod
+    def _state_key(node_id: str) -> str:
+        """State key holding a node's output, matching Context.get_node_output."""
+        return state_key(node_id)
+
+    def _input_plan(self, node: Node) -> List[Tuple[str, str]]:
+        """
+        Resolve each input to a Python expression at compile time,
+        so the generated function only reads state instead of walking input dicts.
+        """
+        plan = []
+        for name, input_val in node.inputs.items():
+            if input_val.value_from:
+                source = f"state.get({self._state_key(input_val.value_from.node_id)!r})"
+            else:
+                # None for missing values, same as Context.resolve_inputs
+                source = py_literal(input_val.value)
+            plan.append((name, source))
+        return plan
+
     def visit_node(self, node: Node) -> Any:
+        release_keys = self.releases.get(node.id, [])
+        # The definition's source is also the fingerprint: JSON would map inf and nan to null
+        node_def = py_literal(node.model_dump(by_alias=True))
+        fingerprint = node_def + repr(release_keys)
+        cached = self._node_cache.get(node.id)
+        if cached is not None and cached[0] == fingerprint:
+            self.node_definitions.append(cached[1])
+            return
+
         node_func_name = node.id.replace("-", "_")
         
         # Use standard template for all nodes, including Condition and Loop
         # The runtime implementation will handle the logic and return the next node ID
         template = self.env.get_template("node.py.j2")
-        code = template.render(node=node, node_func_name=node_func_name)
+        code = template.render(
+            node=node,
+            node_def=node_def,
+            node_func_name=node_func_name,
+            input_plan=self._input_plan(node),
+            output_key=self._state_key(node.id),
+            release_keys=release_keys,
+            async_nodes=self.async_nodes,
+        )
+        self._node_cache[node.id] = (fingerprint, code)
+        self.rendered_nodes += 1
         self.node_definitions.append(code)
 
     def visit_edge(self, edge: Edge) -> Any:
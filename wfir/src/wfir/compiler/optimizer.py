@@ -0,0 +1,316 @@
+import ast
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from pydantic import BaseModel, Field
+from wfir.models import WorkflowIR, Node, Edge
+from wfir.compiler.analysis import CONTROL_TYPES
+from wfir.runtime.expressions import compile_expression
+from wfir.runtime.registry import NodeRegistry
+
+# Params of control nodes that name a target node
+TARGET_PARAMS = ("true_target", "false_target", "body_target", "end_target")
+
+class PassReport(BaseModel):
+    """What a single optimizer pass changed."""
+    pass_name: str
+    removed_nodes: List[str] = Field(default_factory=list)
+    removed_edges: List[str] = Field(default_factory=list)
+    added_edges: List[str] = Field(default_factory=list)
+    notes: List[str] = Field(default_factory=list)
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.removed_nodes or self.removed_edges or self.added_edges)
+
+class OptimizerPass(ABC):
+    """
+    A transformation from WorkflowIR to WorkflowIR.
+    Passes never mutate their input; they return a new workflow and a report.
+    """
+    name: str = "pass"
+
+    def begin(self, workflow: WorkflowIR):
+        """Called by `Optimizer` with the unoptimized workflow before the first round."""
+
+    @abstractmethod
+    def run(self, workflow: WorkflowIR) -> Tuple[WorkflowIR, PassReport]:
+        pass
+
+# --- Graph helpers ---
+
+def entry_node_ids(workflow: WorkflowIR) -> Set[str]:
+    """The first node (the transpiler's entry point) plus every StartNode."""
+    entries = {n.id for n in workflow.nodes if n.type == "StartNode"}
+    if workflow.nodes:
+        entries.add(workflow.nodes[0].id)
+    return entries
+
+def consumed_counts(workflow: WorkflowIR) -> Dict[str, int]:
+    """How many inputs read each node's output through `valueFrom`."""
+    graph = workflow.graph
+    return {node_id: len(graph.consumers(i)) for i, node_id in enumerate(graph.ids)}
+
+def _edge_label(edge: Edge) -> str:
+    return f"{edge.source}->{edge.target}"
+
+class _EditableGraph:
+    """
+    Mutable adjacency view used by passes to remove and bypass nodes.
+    `build()` turns it back into a WorkflowIR, keeping the original order of
+    surviving nodes and edges and appending new edges at the end.
+    """
+
+    def __init__(self, workflow: WorkflowIR, report: PassReport):
+        self.workflow = workflow
+        self.report = report
+        self.nodes: Dict[str, Node] = {n.id: n for n in workflow.nodes}
+        self.edges: Dict[int, Edge] = dict(enumerate(workflow.edges))
+        graph = workflow.graph
+        self.out_edges: Dict[str, List[int]] = {node_id: list(graph.out_edges(i)) for i, node_id in enumerate(graph.ids)}
+        self.in_edges: Dict[str, List[int]] = {node_id: list(graph.in_edges(i)) for i, node_id in enumerate(graph.ids)}
+        self._next_edge = len(workflow.edges)
+
+    def successors(self, node_id: str) -> List[str]:
+        return [self.edges[i].target for i in self.out_edges[node_id]]
+
+    def predecessors(self, node_id: str) -> List[str]:
+        return [self.edges[i].source for i in self.in_edges[node_id]]
+
+    def _has_edge(self, source: str, target: str) -> bool:
+        return any(self.edges[i].target == target for i in self.out_edges[source])
+
+    def _drop_edge(self, idx: int):
+        edge = self.edges.pop(idx)
+        self.out_edges[edge.source].remove(idx)
+        self.in_edges[edge.target].remove(idx)
+        self.report.removed_edges.append(_edge_label(edge))
+
+    def _add_edge(self, template: Edge, target: str):
+        if template.source == target or self._has_edge(template.source, target):
+            return
+        edge = template.model_copy(update={"target": target})
+        idx = self._next_edge
+        self._next_edge += 1
+        self.edges[idx] = edge
+        self.out_edges[edge.source].append(idx)
+        self.in_edges[target].append(idx)
+        self.report.added_edges.append(_edge_label(edge))
+
+    def _retarget_params(self, node_id: str, old: str, new: str):
+        node = self.nodes[node_id]
+        params = dict(node.params)
+        for key in TARGET_PARAMS:
+            if params.get(key) == old:
+                params[key] = new
+        if isinstance(params.get("targets"), list):
+            params["targets"] = [new if t == old else t for t in params["targets"]]
+        self.nodes[node_id] = node.model_copy(update={"params": params})
+
+    def can_bypass(self, node_id: str) -> bool:
+        """A node can be spliced out unless a control node would need to route to several targets."""
+        if len(set(self.successors(node_id))) <= 1:
+            return True
+        return not any(self.nodes[p].type in CONTROL_TYPES for p in self.predecessors(node_id))
+
+    def bypass(self, node_id: str, targets: Optional[List[str]] = None):
+        """
+        Remove a node, connecting each predecessor to its successors (or to `targets`).
+        Control-node predecessors also get their target params rewritten.
+        """
+        if targets is None:
+            targets = list(dict.fromkeys(self.successors(node_id)))
+        for idx in list(self.in_edges[node_id]):
+            edge = self.edges[idx]
+            for target in targets:
+                self._add_edge(edge, target)
+            if self.nodes[edge.source].type in CONTROL_TYPES and len(targets) == 1:
+                self._retarget_params(edge.source, node_id, targets[0])
+        self.remove(node_id)
+
+    def remove(self, node_id: str):
+        for idx in list(self.in_edges[node_id]) + list(self.out_edges[node_id]):
+            if idx in self.edges:
+                self._drop_edge(idx)
+        del self.nodes[node_id]
+        del self.in_edges[node_id]
+        del self.out_edges[node_id]
+        self.report.removed_nodes.append(node_id)
+
+    def build(self) -> WorkflowIR:
+        nodes = [self.nodes[n.id] for n in self.workflow.nodes if n.id in self.nodes]
+        edges = [self.edges[i] for i in sorted(self.edges)]
+        return self.workflow.model_copy(update={"nodes": nodes, "edges": edges})
+
+# --- Passes ---
+
+class ConstantConditionPass(OptimizerPass):
+    """
+    Fold Condition nodes whose expression doesn't depend on any input.
+    Predecessors are wired straight to the branch that would always be taken;
+    the other branch is left for UnreachableNodePass to remove.
+    """
+    name = "constant-conditions"
+
+    @staticmethod
+    def _constant_value(expression: str) -> Tuple[bool, bool]:
+        """Returns (is_constant, truthiness)."""
+        try:
+            compiled = compile_expression(expression)
+            tree = ast.parse(expression.strip(), mode="eval")
+        except Exception:
+            return False, False
+        if any(isinstance(n, ast.Name) for n in ast.walk(tree)):
+            return False, False
+        try:
+            return True, bool(compiled.evaluate({}))
+        except Exception:
+            return False, False
+
+    def run(self, workflow: WorkflowIR) -> Tuple[WorkflowIR, PassReport]:
+        report = PassReport(pass_name=self.name)
+        graph = _EditableGraph(workflow, report)
+        consumed = consumed_counts(workflow)
+        entries = entry_node_ids(workflow)
+
+        for node in workflow.nodes:
+            if node.type != "Condition" or node.id in entries or consumed.get(node.id):
+                continue
+            expression = node.params.get("expression", "True")
+            if not isinstance(expression, str):
+                continue
+            is_constant, value = self._constant_value(expression)
+            if not is_constant:
+                continue
+
+            target = node.params.get("true_target" if value else "false_target")
+            if target not in graph.nodes:
+                continue
+
+            graph.bypass(node.id, targets=[target])
+            report.notes.append(f"Condition '{node.id}' is always {value}; routed to '{target}'")
+
+        return graph.build(), report
+
+class UnreachableNodePass(OptimizerPass):
+    """
+    Remove nodes that can't be reached from the entry node.
+    Traversal follows edges, control-node targets and `valueFrom` producers,
+    so data sources of reachable nodes are always kept.
+    """
+    name = "unreachable-nodes"
+
+    def run(self, workflow: WorkflowIR) -> Tuple[WorkflowIR, PassReport]:
+        report = PassReport(pass_name=self.name)
+        graph = _EditableGraph(workflow, report)
+
+        reachable: Set[str] = set()
+        queue = deque(entry_node_ids(workflow))
+        while queue:
+            node_id = queue.popleft()
+            if node_id in reachable or node_id not in graph.nodes:
+                continue
+            reachable.add(node_id)
+            node = graph.nodes[node_id]
+            queue.extend(graph.successors(node_id))
+            if node.type in CONTROL_TYPES:
+                queue.extend(node.params[k] for k in TARGET_PARAMS if isinstance(node.params.get(k), str))
+            for input_val in node.inputs.values():
+                if input_val.value_from:
+                    queue.append(input_val.value_from.node_id)
+
+        for node in workflow.nodes:
+            if node.id not in reachable:
+                graph.remove(node.id)
+
+        return graph.build(), report
+
+class DeadNodePass(OptimizerPass):
+    """
+    Remove side-effect-free nodes whose output is no longer read.
+
+    An output nobody reads is a result of the workflow (End nodes take no inputs), so a
+    node is only dead if it lost its readers: they were removed by another pass (e.g. a
+    folded condition's branch) or by this one. Nodes with `metadata.discardable` set may
+    be removed without ever having had a reader.
+    Entry, End and control nodes are always kept, as are node types the
+    registry doesn't know (their side effects are unknown) and ids in `keep`.
+    Removed nodes are spliced out of the control flow.
+    """
+    name = "dead-nodes"
+
+    def __init__(self, keep: Iterable[str] = ()):
+        self.keep = set(keep)
+        # Node id -> readers in the workflow the optimizer started from
+        self._original_readers: Dict[str, int] = {}
+
+    def begin(self, workflow: WorkflowIR):
+        self._original_readers = consumed_counts(workflow)
+
+    def _removable(self, node: Node, entries: Set[str], had_readers: bool) -> bool:
+        if node.id in entries or node.id in self.keep:
+            return False
+        if node.type in CONTROL_TYPES or node.type in ("StartNode", "EndNode"):
+            return False
+        if not had_readers and not node.metadata.get("discardable"):
+            return False
+        node_cls = NodeRegistry.get_class(node.type)
+        return node_cls is not None and not node_cls.side_effects
+
+    def run(self, workflow: WorkflowIR) -> Tuple[WorkflowIR, PassReport]:
+        report = PassReport(pass_name=self.name)
+        graph = _EditableGraph(workflow, report)
+        consumed = consumed_counts(workflow)
+        entries = entry_node_ids(workflow)
+        orphaned = {node_id for node_id, count in self._original_readers.items() if count and not consumed.get(node_id)}
+
+        worklist = deque(n.id for n in workflow.nodes if not consumed.get(n.id))
+        while worklist:
+            node_id = worklist.popleft()
+            node = graph.nodes.get(node_id)
+            if node is None or consumed.get(node_id) or not self._removable(node, entries, node_id in orphaned):
+                continue
+            if not graph.can_bypass(node_id):
+                continue
+
+            graph.bypass(node_id)
+            # Producers feeding only this node are orphaned by its removal
+            for input_val in node.inputs.values():
+                if input_val.value_from:
+                    ref = input_val.value_from.node_id
+                    consumed[ref] = consumed.get(ref, 0) - 1
+                    if consumed[ref] <= 0:
+                        orphaned.add(ref)
+                        worklist.append(ref)
+
+        return graph.build(), report
+
+# --- Pipeline ---
+
+def default_passes() -> List[OptimizerPass]:
+    return [ConstantConditionPass(), UnreachableNodePass(), DeadNodePass()]
+
+class Optimizer:
+    """
+    Runs a sequence of passes, repeating the sequence until nothing changes
+    (folding a condition can make a branch unreachable, which can make its producers dead).
+    """
+
+    def __init__(self, passes: Optional[List[OptimizerPass]] = None, max_rounds: int = 10):
+        self.passes = passes if passes is not None else default_passes()
+        self.max_rounds = max_rounds
+
+    def optimize(self, workflow: WorkflowIR) -> Tuple[WorkflowIR, List[PassReport]]:
+        reports: List[PassReport] = []
+        for optimizer_pass in self.passes:
+            optimizer_pass.begin(workflow)
+        for _ in range(self.max_rounds):
+            changed = False
+            for optimizer_pass in self.passes:
+                workflow, report = optimizer_pass.run(workflow)
+                if report.changed:
+                    reports.append(report)
+                    changed = True
+            if not changed:
+                break
+        return workflow, reports
@@ -0,0 +1,311 @@
+from array import array
+from collections import deque
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+if TYPE_CHECKING:
+    from wfir.models import WorkflowIR, Node, Edge
+
+def _csr(count: int, keys: array, values: array) -> Tuple[array, array]:
+    """
+    Compressed sparse row layout: entries for row `i` are
+    `data[offsets[i]:offsets[i + 1]]`, in the order they were given.
+    """
+    offsets = array("i", bytes(4 * (count + 1)))
+    for key in keys:
+        offsets[key + 1] += 1
+    for i in range(count):
+        offsets[i + 1] += offsets[i]
+
+    data = array("i", bytes(4 * len(values)))
+    cursor = array("i", offsets[:-1])
+    for key, value in zip(keys, values):
+        data[cursor[key]] = value
+        cursor[key] += 1
+    return offsets, data
+
+class GraphIndex:
+    """
+    Compact, read-only index over a WorkflowIR.
+
+    Nodes are numbered by their position in `workflow.nodes`. Edges are stored as
+    integer arrays, with CSR adjacency for successors and predecessors (by edge id,
+    so edge attributes stay reachable) and for `valueFrom` producers and consumers.
+    A topological order over edges is computed once (partial if edges form a cycle).
+
+    Obtain it through `WorkflowIR.graph` rather than constructing it directly.
+    """
+    __slots__ = (
+        "workflow", "ids", "index", "duplicate_ids",
+        "edge_source", "edge_target",
+        "_out_offsets", "_out_edges", "_in_offsets", "_in_edges",
+        "_producer_offsets", "_producers", "_consumer_offsets", "_consumers",
+        "missing_refs", "topological_order",
+    )
+
+    def __init__(self, workflow: "WorkflowIR"):
+        self.workflow = workflow
+        self.ids: List[str] = [n.id for n in workflow.nodes]
+        self.index: Dict[str, int] = {}
+        self.duplicate_ids: List[str] = []
+        for i, node_id in enumerate(self.ids):
+            if node_id in self.index:
+                self.duplicate_ids.append(node_id)
+            else:
+                self.index[node_id] = i
+        count = len(self.ids)
+
+        # --- Edges ---
+        self.edge_source = array("i")
+        self.edge_target = array("i")
+        for edge in workflow.edges:
+            source = self.index.get(edge.source)
+            if source is None:
+                raise ValueError(f"Edge source '{edge.source}' does not exist in nodes.")
+            target = self.index.get(edge.target)
+            if target is None:
+                raise ValueError(f"Edge target '{edge.target}' does not exist in nodes.")
+            self.edge_source.append(source)
+            self.edge_target.append(target)
+
+        edge_ids = array("i", range(len(self.edge_source)))
+        self._out_offsets, self._out_edges = _csr(count, self.edge_source, edge_ids)
+        self._in_offsets, self._in_edges = _csr(count, self.edge_target, edge_ids)
+
+        # --- Data dependencies (valueFrom) ---
+        # (consumer index, input name, referenced id) for references to unknown nodes
+        self.missing_refs: List[Tuple[int, str, str]] = []
+        ref_consumers = array("i")
+        ref_producers = array("i")
+        for i, node in enumerate(workflow.nodes):
+            for name, input_val in node.inputs.items():
+                if input_val.value_from is None:
+                    continue
+                producer = self.index.get(input_val.value_from.node_id)
+                if producer is None:
+                    self.missing_refs.append((i, name, input_val.value_from.node_id))
+                    continue
+                ref_consumers.append(i)
+                ref_producers.append(producer)
+        self._producer_offsets, self._producers = _csr(count, ref_consumers, ref_producers)
+        self._consumer_offsets, self._consumers = _csr(count, ref_producers, ref_consumers)
+
+        # --- Topological order over edges (Kahn) ---
+        in_degree = array("i", (self._in_offsets[i + 1] - self._in_offsets[i] for i in range(count)))
+        queue = deque(i for i in range(count) if in_degree[i] == 0)
+        order = array("i")
+        while queue:
+            u = queue.popleft()
+            order.append(u)
+            for e in self._out_edges[self._out_offsets[u]:self._out_offsets[u + 1]]:
+                v = self.edge_target[e]
+                in_degree[v] -= 1
+                if in_degree[v] == 0:
+                    queue.append(v)
+        # Partial when edges form a cycle: nodes on or after a cycle are missing
+        self.topological_order: array = order
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @property
+    def is_dag(self) -> bool:
+        return len(self.topological_order) == len(self.ids)
+
+    def node(self, i: int) -> "Node":
+        return self.workflow.nodes[i]
+
+    def edge(self, e: int) -> "Edge":
+        return self.workflow.edges[e]
+
+    def out_edges(self, i: int) -> array:
+        """Edge ids leaving node `i`, in listed order."""
+        return self._out_edges[self._out_offsets[i]:self._out_offsets[i + 1]]
+
+    def in_edges(self, i: int) -> array:
+        """Edge ids entering node `i`, in listed order."""
+        return self._in_edges[self._in_offsets[i]:self._in_offsets[i + 1]]
+
+    def successors(self, i: int) -> Iterator[int]:
+        for e in self.out_edges(i):
+            yield self.edge_target[e]
+
+    def predecessors(self, i: int) -> Iterator[int]:
+        for e in self.in_edges(i):
+            yield self.edge_source[e]
+
+    def out_degree(self, i: int) -> int:
+        return self._out_offsets[i + 1] - self._out_offsets[i]
+
+    def in_degree(self, i: int) -> int:
+        return self._in_offsets[i + 1] - self._in_offsets[i]
+
+    def producers(self, i: int) -> array:
+        """Nodes whose output node `i` reads through `valueFrom` (one entry per input)."""
+        return self._producers[self._producer_offsets[i]:self._producer_offsets[i + 1]]
+
+    def consumers(self, i: int) -> array:
+        """Nodes reading node `i`'s output through `valueFrom` (one entry per input)."""
+        return self._consumers[self._consumer_offsets[i]:self._consumer_offsets[i + 1]]
+
+    def dependencies(self, i: int) -> Set[int]:
+        """
+        Nodes that must finish before node `i` under dependency-driven execution
+        (`WorkflowRunner`): sources of incoming edges and `valueFrom` producers, except `i`.
+        """
+        deps = set(self.predecessors(i))
+        deps.update(self.producers(i))
+        deps.discard(i)
+        return deps
+
+# --- Traversals ---
+
+def depth_first(graph: GraphIndex, roots: Iterable[int]) -> Tuple[List[List[int]], array, int]:
+    """
+    One iterative depth-first search computing Tarjan's strongly connected components.
+
+    Starts from `roots`, then from any node not yet visited, so every node is covered.
+    Returns (components, postorder, reached): components in reverse topological order
+    of the condensation, the DFS postorder, and how many postorder entries were
+    reached from `roots` (`postorder[:reached]`).
+    """
+    count = len(graph)
+    offsets, out_edges, edge_target = graph._out_offsets, graph._out_edges, graph.edge_target
+    index = array("i", [-1]) * count
+    low = array("i", bytes(4 * count))
+    on_stack = bytearray(count)
+    stack: List[int] = []
+    components: List[List[int]] = []
+    postorder = array("i")
+    counter = 0
+    reached = -1
+
+    roots = list(roots)
+    for n, root in enumerate(roots + list(range(count))):
+        if n == len(roots):
+            reached = len(postorder)
+        if index[root] != -1:
+            continue
+        index[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack[root] = 1
+        # (node, position of the next outgoing edge to follow)
+        work = [(root, offsets[root])]
+        while work:
+            v, pos = work[-1]
+            if pos < offsets[v + 1]:
+                work[-1] = (v, pos + 1)
+                w = edge_target[out_edges[pos]]
+                if index[w] == -1:
+                    index[w] = low[w] = counter
+                    counter += 1
+                    stack.append(w)
+                    on_stack[w] = 1
+                    work.append((w, offsets[w]))
+                elif on_stack[w] and index[w] < low[v]:
+                    low[v] = index[w]
+                continue
+
+            work.pop()
+            postorder.append(v)
+            if work:
+                u = work[-1][0]
+                if low[v] < low[u]:
+                    low[u] = low[v]
+            if low[v] == index[v]:
+                component = []
+                while True:
+                    w = stack.pop()
+                    on_stack[w] = 0
+                    component.append(w)
+                    if w == v:
+                        break
+                components.append(component)
+
+    if reached == -1:
+        reached = len(postorder)
+    return components, postorder, reached
+
+class DominatorTree:
+    """
+    Dominators of the nodes reachable from a set of entry nodes
+    (Cooper, Harvey & Kennedy's iterative algorithm over reverse postorder).
+
+    The entries hang off a virtual root, so `dominates(a, b)` holds when every path
+    from any entry to `b` passes through `a`. Unreachable nodes have no dominators.
+    """
+
+    def __init__(self, graph: GraphIndex, roots: Iterable[int], postorder: Optional[array] = None):
+        count = len(graph)
+        root = count
+        roots = list(dict.fromkeys(roots))
+        if postorder is None:
+            _, postorder, reached = depth_first(graph, roots)
+            postorder = postorder[:reached]
+        is_root = bytearray(count)
+        for r in roots:
+            is_root[r] = 1
+
+        rpo = [root]
+        rpo.extend(reversed(postorder))
+        number = array("i", [-1]) * (count + 1)
+        for n, v in enumerate(rpo):
+            number[v] = n
+
+        in_offsets, in_edges, edge_source = graph._in_offsets, graph._in_edges, graph.edge_source
+        idom = array("i", [-1]) * (count + 1)
+        idom[root] = root
+        changed = True
+        while changed:
+            changed = False
+            for v in rpo[1:]:
+                new = root if is_root[v] else -1
+                for e in in_edges[in_offsets[v]:in_offsets[v + 1]]:
+                    p = edge_source[e]
+                    if idom[p] == -1:
+                        continue
+                    if new == -1:
+                        new = p
+                        continue
+                    # Walk both fingers up the tree to their common ancestor
+                    a = p
+                    while a != new:
+                        while number[a] > number[new]:
+                            a = idom[a]
+                        while number[new] > number[a]:
+                            new = idom[new]
+                if idom[v] != new:
+                    idom[v] = new
+                    changed = True
+        self.idom = idom[:count]
+
+        # Pre/post numbering of the tree makes dominance queries O(1)
+        children: List[List[int]] = [[] for _ in range(count + 1)]
+        for v in rpo[1:]:
+            children[idom[v]].append(v)
+        self._enter = array("i", [-1]) * (count + 1)
+        self._exit = array("i", [-1]) * (count + 1)
+        clock = 0
+        work = [(root, 0)]
+        self._enter[root] = clock
+        while work:
+            v, pos = work[-1]
+            if pos < len(children[v]):
+                work[-1] = (v, pos + 1)
+                w = children[v][pos]
+                clock += 1
+                self._enter[w] = clock
+                work.append((w, 0))
+            else:
+                work.pop()
+                clock += 1
+                self._exit[v] = clock
+
+    def reachable(self, i: int) -> bool:
+        return self._enter[i] != -1
+
+    def dominates(self, a: int, b: int) -> bool:
+        """Whether `a` runs before `b` on every path from the entries (a node dominates itself)."""
+        if not self.reachable(a) or not self.reachable(b):
+            return False
+        return self._enter[a] <= self._enter[b] and self._exit[b] <= self._exit[a]
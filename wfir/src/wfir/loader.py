@@ -0,0 +1,106 @@
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Tuple, Union
+
+from wfir import binary
+from wfir.models import TRUSTED, WorkflowIR
+
+try:
+    import orjson
+except ImportError: # pragma: no cover - optional speedup
+    orjson = None
+
+Source = Union[bytes, str, Dict[str, Any]]
+
+def loads(raw: Union[bytes, str]) -> Any:
+    """Decode JSON with orjson when available, falling back to the standard library."""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+def _canonical_bytes(data: Dict[str, Any]) -> bytes:
+    """Serialization with sorted keys, so dicts that differ only in key order share a key."""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_SORT_KEYS)
+    return json.dumps(data, separators=(",", ":"), sort_keys=True, default=str).encode("utf-8")
+
+def validate_trusted(data: Dict[str, Any]) -> WorkflowIR:
+    """
+    Validate already-validated IR with the `TRUSTED` context.
+    Fields are still parsed by pydantic-core (which is faster than building the models
+    in Python with `model_construct`), but the edge check and graph index are deferred
+    to the first use of `workflow.graph`, which still raises on dangling edges.
+    """
+    return WorkflowIR.model_validate(data, context=TRUSTED)
+
+class WorkflowLoader:
+    """
+    Loads WorkflowIR from JSON or the binary format (`wfir.binary`),
+    caching results by a SHA-256 of the source: raw bytes and text as given (no parsing
+    on a hit), decoded dicts serialized with sorted keys.
+
+    Strict loads validate with pydantic the first time a given source is seen;
+    later loads of identical content return the cached model without re-validating.
+    Trusted loads skip the structural checks (see `validate_trusted`); a strict load
+    never returns a model that was only constructed by a trusted load.
+    Cached models are shared between callers and must be treated as read-only.
+    """
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        # key -> (workflow, validated)
+        self._cache: "OrderedDict[str, Tuple[WorkflowIR, bool]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def source_key(source: Source) -> str:
+        raw = _canonical_bytes(source) if isinstance(source, dict) else source
+        if isinstance(raw, str):
+            raw = raw.encode("utf-8")
+        return hashlib.sha256(raw).hexdigest()
+
+    def load(self, source: Source, trusted: bool = False) -> WorkflowIR:
+        """
+        Args:
+            source: Raw JSON or binary (bytes), JSON text, or an already-decoded dict.
+            trusted: Defer structural checks for IR that was validated when stored.
+        """
+        key = self.source_key(source)
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None and (trusted or cached[1]):
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return cached[0]
+            self.misses += 1
+
+        if isinstance(source, dict):
+            data = source
+        elif isinstance(source, bytes) and binary.is_binary(source):
+            data, _ = binary.decode(source)
+        else:
+            data = loads(source)
+        if trusted:
+            workflow = validate_trusted(data)
+        else:
+            workflow = WorkflowIR.model_validate(data)
+
+        with self._lock:
+            self._cache[key] = (workflow, not trusted)
+            if len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+        return workflow
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+
+default_loader = WorkflowLoader()
+
+def load_workflow(source: Source, trusted: bool = False) -> WorkflowIR:
+    """Load through the process-wide `default_loader`."""
+    return default_loader.load(source, trusted)
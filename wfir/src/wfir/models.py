@@ -1,5 +1,17 @@
-from typing import Any, Dict, List, Optional, Union, Literal
-from pydantic import BaseModel, Field, model_validator
+import hashlib
+import json
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Union, Literal
+from pydantic import BaseModel, Field, PrivateAttr, ValidationInfo, model_validator
+
+if TYPE_CHECKING:
+    from wfir.graph import GraphIndex
+
+# Validation context for IR that was already validated when stored (see wfir.loader):
+# the O(E) edge check is deferred, field validation and shorthand parsing still run.
+TRUSTED = {"trusted": True}
+
+def _is_trusted(info: ValidationInfo) -> bool:
+    return bool(info.context and info.context.get("trusted"))
 
 # --- Value Definitions ---
 
@@ -77,13 +89,81 @@ class WorkflowIR(BaseModel):
     # Global variables / Context schema could go here
     variables: Dict[str, Any] = Field(default_factory=dict)
 
+    # Cached GraphIndex and the (nodes, edges) identity/length stamp it was built for
+    _graph: Optional[Any] = PrivateAttr(default=None)
+    _graph_stamp: Optional[tuple] = PrivateAttr(default=None)
+    # Cached content hash and the parts it was computed from (held, so ids can't be reused)
+    _hash: Optional[str] = PrivateAttr(default=None)
+    _hash_stamp: Optional[tuple] = PrivateAttr(default=None)
+
+    def __eq__(self, other: Any) -> bool:
+        """Fields only: the private attributes above are derived caches, not content."""
+        if not isinstance(other, BaseModel):
+            return NotImplemented
+        return (
+            self.__class__ is other.__class__
+            and self.__dict__ == other.__dict__
+            and self.__pydantic_extra__ == other.__pydantic_extra__
+        )
+
     @model_validator(mode='after')
-    def validate_edges(self):
+    def validate_edges(self, info: ValidationInfo):
         """Ensure all edges point to existing nodes."""
-        node_ids = {n.id for n in self.nodes}
-        for edge in self.edges:
-            if edge.source not in node_ids:
-                raise ValueError(f"Edge source '{edge.source}' does not exist in nodes.")
-            if edge.target not in node_ids:
-                raise ValueError(f"Edge target '{edge.target}' does not exist in nodes.")
+        self.invalidate_graph()
+        if _is_trusted(info):
+            # Deferred: the index is built (and edges checked) on first use of `graph`
+            return self
+        # Building the index checks every edge endpoint; the result is kept for later consumers
+        _ = self.graph
         return self
+
+    def _structure_stamp(self) -> tuple:
+        return (id(self.nodes), len(self.nodes), id(self.edges), len(self.edges))
+
+    @property
+    def graph(self) -> "GraphIndex":
+        """
+        Indexed view of the graph (CSR adjacency, valueFrom index, topological order).
+        Built once and reused. Replacing or resizing `nodes`/`edges` rebuilds it automatically;
+        call `invalidate_graph()` after editing nodes or edges in place.
+        """
+        stamp = self._structure_stamp()
+        if self._graph is None or self._graph_stamp != stamp:
+            from wfir.graph import GraphIndex
+            self._graph = GraphIndex(self)
+            self._graph_stamp = stamp
+        return self._graph
+
+    def invalidate_graph(self):
+        """Drop the cached graph index and content hash (after editing the workflow in place)."""
+        self._graph = None
+        self._graph_stamp = None
+        self._hash = None
+        self._hash_stamp = None
+
+    def _content_stamp(self) -> tuple:
+        return (self.name, self.variables, tuple(self.nodes), tuple(self.edges))
+
+    def content_hash(self) -> str:
+        """
+        Stable SHA-256 of the workflow content.
+        Keys are sorted so that semantically identical workflows hash the same
+        regardless of dict ordering in params/metadata.
+        Cached until the name or variables are replaced or a node or edge is added, removed
+        or replaced; call `invalidate_graph()` after editing a node or edge in place.
+        """
+        stamp = self._content_stamp()
+        if self._hash is None or self._hash_stamp != stamp:
+            self._hash = self._compute_hash()
+            self._hash_stamp = stamp
+        return self._hash
+
+    def _compute_hash(self) -> str:
+        # Python mode keeps inf and nan apart (JSON mode maps both to null)
+        payload = json.dumps(
+            self.model_dump(by_alias=True),
+            sort_keys=True,
+            separators=(",", ":"),
+            default=str,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
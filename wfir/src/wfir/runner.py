@@ -1,83 +1,243 @@
 import asyncio
-from typing import Dict, Any, Callable, Awaitable
+import logging
+from collections import deque
+from typing import TYPE_CHECKING, Dict, Any, AsyncIterator, Callable, Awaitable, Iterable, List, Optional, Set, Union
+from wfir.compiler.analysis import retained_outputs
 from wfir.models import WorkflowIR, Node
+from wfir.runtime.base import InputPlan
+
+if TYPE_CHECKING:
+    from wfir.runtime.registry import Runtime
+
+logger = logging.getLogger(__name__)
 
 # Type for a node handler function
-# It takes (inputs, context, node_def) and returns output
-NodeHandler = Callable[[Dict[str, Any], Dict[str, Any], Dict[str, Any]], Awaitable[Any]]
+# It takes (inputs, context, node_def) and returns an awaitable output,
+# or an async iterator of output chunks for streaming nodes
+NodeHandler = Callable[[Dict[str, Any], Dict[str, Any], Dict[str, Any]], Union[Awaitable[Any], AsyncIterator[Any]]]
+
+def collect_chunks(chunks: List[Any]) -> Any:
+    """The output of a streamed node: text chunks are joined, a single chunk is returned as is."""
+    if all(isinstance(chunk, str) for chunk in chunks):
+        return "".join(chunks)
+    return chunks[0] if len(chunks) == 1 else chunks
 
 class WorkflowRunner:
-    def __init__(self, workflow: WorkflowIR):
+    def __init__(self, workflow: WorkflowIR, max_concurrency: Optional[int] = None, release_outputs: bool = False, pinned: Iterable[str] = ()):
+        """
+        Args:
+            max_concurrency: Maximum number of nodes running at once (unbounded if None).
+            release_outputs: Drop a node's output from `node_outputs` as soon as every node
+                reading it has run, so intermediate results don't live for the whole run.
+                Final outputs (see `wfir.compiler.analysis.retained_outputs`), nodes with
+                `metadata.pinned` and the `pinned` ids are kept and returned by `run`.
+        """
+        if max_concurrency is not None and max_concurrency < 1:
+            raise ValueError("max_concurrency must be a positive integer or None")
         self.workflow = workflow
+        self.max_concurrency = max_concurrency
+        self.release_outputs = release_outputs
+        self.pinned = set(pinned)
         self.handlers: Dict[str, NodeHandler] = {}
         self.context: Dict[str, Any] = workflow.variables.copy()
         self.node_outputs: Dict[str, Any] = {}
+        # Node id -> compiled inputs, built when the run starts
+        self._input_plans: Dict[str, InputPlan] = {}
+        # Set while `events()` is being consumed
+        self._events: Optional[asyncio.Queue] = None
+
+    @classmethod
+    def from_runtime(cls, workflow: WorkflowIR, runtime: Optional["Runtime"] = None, max_concurrency: Optional[int] = None,
+                     release_outputs: bool = False, pinned: Iterable[str] = ()) -> "WorkflowRunner":
+        """
+        A runner executing every node with its registered implementation (`NodeRegistry`).
+        Node params are validated up front (ValueError for unknown types, ValidationError
+        for bad params). Nodes with `stream` set are run through `astream`.
+        """
+        from wfir.runtime.base import Context
+        from wfir.runtime.registry import Runtime
+
+        plan = (runtime or Runtime()).prepare(workflow)
+        runner = cls(workflow, max_concurrency, release_outputs, pinned)
+        context = Context(runner.context)
+
+        def handler(inputs: Dict[str, Any], _: Dict[str, Any], node_def: Dict[str, Any]):
+            prepared = plan[node_def["id"]]
+            if prepared.streams:
+                return prepared.astream(inputs, context)
+            return prepared.aexecute(inputs, context)
+
+        for node_type in {node.type for node in workflow.nodes}:
+            runner.register_handler(node_type, handler)
+        return runner
 
     def register_handler(self, node_type: str, handler: NodeHandler):
-        """Register a python function to handle a specific node type."""
+        """
+        Register a python function to handle a specific node type.
+        A handler returning an async iterator (e.g. an async generator) streams its output:
+        each chunk is reported as a "token" event and the chunks are combined with `collect_chunks`.
+        """
         self.handlers[node_type] = handler
 
-    async def _resolve_inputs(self, node: Node) -> Dict[str, Any]:
+    def _emit(self, event: str, node_id: Optional[str] = None, data: Any = None):
+        if self._events is not None:
+            self._events.put_nowait({"event": event, "node": node_id, "data": data})
+
+    def _build_dependencies(self) -> Dict[str, Set[str]]:
+        """
+        Collect the predecessors of every node.
+        A node depends on the source of each incoming edge and on every node
+        it reads from through `valueFrom`. References to unknown nodes are left
+        out here and reported by `_resolve_inputs` when the node runs.
+        """
+        graph = self.workflow.graph
+        return {node_id: {graph.ids[p] for p in graph.dependencies(i)} for i, node_id in enumerate(graph.ids)}
+
+    def _reader_counts(self) -> Dict[str, int]:
+        """Number of distinct nodes reading each releasable output; the output dies when it reaches 0."""
+        graph = self.workflow.graph
+        kept = retained_outputs(self.workflow, self.pinned)
+        return {
+            node_id: len(set(graph.consumers(i)))
+            for i, node_id in enumerate(graph.ids)
+            if node_id not in kept
+        }
+
+    def _release_inputs(self, node_id: str, readers: Dict[str, int]):
+        """Count `node_id` as done reading its inputs, releasing outputs nobody else needs."""
+        graph = self.workflow.graph
+        for producer in {graph.ids[p] for p in graph.producers(graph.index[node_id])}:
+            if producer in readers:
+                readers[producer] -= 1
+                if readers[producer] == 0:
+                    self.node_outputs.pop(producer, None)
+
+    def _resolve_inputs(self, node: Node) -> Dict[str, Any]:
         resolved = {}
-        for name, input_val in node.inputs.items():
-            if input_val.value is not None:
-                resolved[name] = input_val.value
-            elif input_val.value_from:
-                ref_node_id = input_val.value_from.node_id
-                
-                if ref_node_id not in self.node_outputs:
-                    raise RuntimeError(f"Node '{node.id}' depends on '{ref_node_id}' which has not executed yet.")
-                
-                output = self.node_outputs[ref_node_id]
-                resolved[name] = output
+        outputs = self.node_outputs
+        for name, value, ref_node_id, _ in self._input_plans[node.id].entries:
+            if ref_node_id is None:
+                if value is not None:
+                    resolved[name] = value
+            elif ref_node_id in outputs:
+                resolved[name] = outputs[ref_node_id]
+            else:
+                raise RuntimeError(f"Node '{node.id}' depends on '{ref_node_id}' which has not executed yet.")
         return resolved
 
+    async def _execute_node(self, node: Node):
+        logger.debug("Executing node %s (%s)", node.id, node.type)
+
+        # 1. Resolve Inputs
+        inputs = self._resolve_inputs(node)
+
+        # 2. Find Handler
+        handler = self.handlers.get(node.type)
+        if not handler:
+            logger.warning("No handler for type '%s'; skipping node %s", node.type, node.id)
+            return
+
+        # 3. Execute
+        # Pass node definition (as dict) to handler
+        # node.model_dump() converts the pydantic model to a dict
+        node_def = node.model_dump(by_alias=True)
+        self._emit("node_start", node.id)
+        result = handler(inputs, self.context, node_def)
+        if hasattr(result, "__aiter__"):
+            chunks = []
+            async for chunk in result:
+                self._emit("token", node.id, chunk)
+                chunks.append(chunk)
+            output = collect_chunks(chunks)
+        else:
+            output = await result
+        self.node_outputs[node.id] = output
+        self._emit("node_end", node.id, output)
+
     async def run(self, start_inputs: Dict[str, Any] = None):
         """
-        Simple topological execution. 
-        For a real runner, we'd build a DAG and execute ready nodes.
-        Here we just iterate linearly for the demo since our test case is linear.
+        Dependency-driven execution.
+        Every node is started as soon as all of its predecessors (incoming edges
+        and `valueFrom` references) have finished, so independent branches run
+        concurrently. At most `max_concurrency` nodes run at once (unbounded if None).
+        With `release_outputs`, outputs are released as their last reader finishes
+        and only the retained ones are returned.
         """
         if start_inputs:
             self.context.update(start_inputs)
 
-        # 1. Build Adjacency Map to find start nodes (nodes with no incoming edges)
-        # For this simple version, we will just iterate through the list order 
-        # assuming the user provided a topologically sorted list or we just find the start node.
-        # A real runner needs a proper graph traversal (BFS/DFS).
-        
-        # Let's just execute in the order they appear in the list for this MVP
-        # assuming the list is sorted.
-        
-        print(f"--- Starting Workflow: {self.workflow.name} ---")
-        
-        for node in self.workflow.nodes:
-            print(f"Executing Node: {node.id} ({node.type})")
-            
-            # 1. Resolve Inputs
-            inputs = await self._resolve_inputs(node)
-            
-            # 2. Find Handler
-            handler = self.handlers.get(node.type)
-            if not handler:
-                print(f"  Warning: No handler for type '{node.type}'. Skipping.")
-                continue
-            
-            # 3. Execute
-            try:
-                # Pass node definition (as dict) to handler
-                # node.model_dump() converts the pydantic model to a dict
-                node_def = node.model_dump(by_alias=True)
-                output = await handler(inputs, self.context, node_def)
-                self.node_outputs[node.id] = output
-                print(f"  Output: {output}")
-                
-                # Update context if needed (optional design choice)
-                # self.context[f"{node.id}.output"] = output
-                
-            except Exception as e:
-                print(f"  Error executing node {node.id}: {e}")
-                raise e
-                
-        print("--- Workflow Completed ---")
+        logger.debug("Starting workflow %s", self.workflow.name)
+
+        node_map = {n.id: n for n in self.workflow.nodes}
+        self._input_plans = {n.id: InputPlan.compile(n.inputs) for n in self.workflow.nodes}
+        deps = self._build_dependencies()
+        successors: Dict[str, List[str]] = {n.id: [] for n in self.workflow.nodes}
+        remaining: Dict[str, int] = {}
+        for node_id, node_deps in deps.items():
+            remaining[node_id] = len(node_deps)
+            for dep in node_deps:
+                successors[dep].append(node_id)
+
+        # Seed in list order so that ties are scheduled deterministically
+        ready = deque(n.id for n in self.workflow.nodes if remaining[n.id] == 0)
+        running: Dict[asyncio.Task, str] = {}
+        finished = 0
+        readers = self._reader_counts() if self.release_outputs else None
+
+        try:
+            while ready or running:
+                while ready and (self.max_concurrency is None or len(running) < self.max_concurrency):
+                    node_id = ready.popleft()
+                    task = asyncio.create_task(self._execute_node(node_map[node_id]))
+                    running[task] = node_id
+
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    node_id = running.pop(task)
+                    # Propagates the handler's exception, if any
+                    task.result()
+                    finished += 1
+                    if readers is not None:
+                        self._release_inputs(node_id, readers)
+                    for succ in successors[node_id]:
+                        remaining[succ] -= 1
+                        if remaining[succ] == 0:
+                            ready.append(succ)
+        finally:
+            for task in running:
+                task.cancel()
+            if running:
+                await asyncio.gather(*running, return_exceptions=True)
+
+        if finished != len(node_map):
+            blocked = [node_id for node_id, count in remaining.items() if count > 0]
+            raise RuntimeError(f"Workflow contains a dependency cycle; nodes never became ready: {blocked}")
+
+        logger.debug("Workflow %s completed", self.workflow.name)
         return self.node_outputs
+
+    async def events(self, start_inputs: Dict[str, Any] = None) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Run the workflow, yielding events as they happen:
+        {"event": "node_start" | "token" | "node_end" | "workflow_end", "node": id or None, "data": ...}.
+        "token" carries a chunk of a streaming node, "node_end" a node's output and
+        "workflow_end" all outputs. Errors from the run are raised after the events before them.
+        """
+        queue: asyncio.Queue = asyncio.Queue()
+        self._events = queue
+        task = asyncio.create_task(self.run(start_inputs))
+        # Runs after the task's last event has been queued
+        task.add_done_callback(lambda _: queue.put_nowait(None))
+        try:
+            while True:
+                event = await queue.get()
+                if event is None:
+                    break
+                yield event
+            outputs = task.result()
+            yield {"event": "workflow_end", "node": None, "data": outputs}
+        finally:
+            self._events = None
+            if not task.done():
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
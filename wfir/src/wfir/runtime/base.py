@@ -1,12 +1,223 @@
-from typing import Any, Dict, Protocol, Optional
+import mmap
+import os
+import threading
+from functools import lru_cache
+from typing import Any, Callable, Dict, Protocol, Optional, Tuple, Union
+
+BytesLike = Union[bytes, bytearray, memoryview]
+
+class Blob:
+    """
+    Handle to a large payload stored once and passed between nodes instead of the value.
+
+    The data lives in memory or in a memory-mapped file (see `BlobStore`). `view()` is a
+    zero-copy memoryview of the raw bytes; `materialize()` builds the value (bytes, or str
+    for text blobs, decoded with `encoding`). Serializing a file-backed blob (pickle, or
+    LangGraph checkpoints) only records the path, so serialized state stays small; the
+    file is removed by `BlobStore.clear`.
+    """
+    __slots__ = ("size", "encoding", "path", "_data")
+
+    def __init__(self, data: Optional[BytesLike] = None, encoding: Optional[str] = None, path: Optional[str] = None, size: Optional[int] = None):
+        self._data = data
+        self.encoding = encoding
+        self.path = path
+        self.size = len(data) if data is not None else size
+
+    @property
+    def is_text(self) -> bool:
+        return self.encoding is not None
+
+    def view(self) -> memoryview:
+        """The raw bytes, without copying; file-backed blobs are mapped on first access."""
+        if self._data is None:
+            with open(self.path, "rb") as f:
+                self._data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if self.size else b""
+        return memoryview(self._data)
+
+    def materialize(self) -> Union[bytes, str]:
+        """A copy of the value: str for text blobs, bytes otherwise."""
+        view = self.view()
+        return str(view, self.encoding, "replace") if self.is_text else view.tobytes()
+
+    def __len__(self) -> int:
+        return self.size
+
+    def _asdict(self) -> Dict[str, Any]:
+        """Constructor arguments; also how LangGraph's checkpoint serializer encodes the handle."""
+        if self.path is not None:
+            return {"encoding": self.encoding, "path": self.path, "size": self.size}
+        return {"data": self.view().tobytes(), "encoding": self.encoding}
+
+    def __reduce__(self):
+        return (_rebuild_blob, (self._asdict(),))
+
+    def __repr__(self) -> str:
+        kind = f"text {self.encoding}" if self.is_text else "bytes"
+        where = f" at {self.path}" if self.path else ""
+        return f"<Blob {kind}, {self.size} bytes{where}>"
+
+def _rebuild_blob(kwargs: Dict[str, Any]) -> Blob:
+    return Blob(**kwargs)
+
+class BlobStore:
+    """
+    Turns large node outputs into `Blob` handles.
+
+    Byte and text values of at least `threshold` bytes (top-level outputs, or values of a
+    dict output such as an HTTP response) become blobs. With `directory`, blobs of at
+    least `mmap_threshold` bytes are written there once and memory-mapped, so they don't
+    count against the heap and serialize as a path; others are kept in memory.
+    """
+
+    def __init__(self, threshold: int = 1 << 20, directory: Optional[str] = None, mmap_threshold: int = 16 << 20):
+        self.threshold = threshold
+        self.directory = directory
+        self.mmap_threshold = mmap_threshold
+        self._paths: Dict[str, None] = {}
+        self._lock = threading.Lock()
+        self.blobs = 0
+        self.bytes = 0
+
+    def put(self, data: BytesLike, encoding: Optional[str] = None) -> Blob:
+        """Store raw bytes (the encoded text if `encoding` is given). Bytes-like objects are kept without copying."""
+        with self._lock:
+            self.blobs += 1
+            self.bytes += len(data)
+        if self.directory is None or len(data) < self.mmap_threshold:
+            return Blob(data, encoding)
+
+        import tempfile
+        os.makedirs(self.directory, exist_ok=True)
+        fd, path = tempfile.mkstemp(dir=self.directory, suffix=".blob")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        with self._lock:
+            self._paths[path] = None
+        return Blob(encoding=encoding, path=path, size=len(data))
+
+    def wrap(self, value: Any) -> Any:
+        """`value` with large bytes/str values (itself, or the values of a dict) replaced by blobs."""
+        if isinstance(value, dict):
+            if not any(self._is_large(v) for v in value.values()):
+                return value
+            return {k: self.wrap(v) if self._is_large(v) else v for k, v in value.items()}
+        if not self._is_large(value):
+            return value
+        if isinstance(value, str):
+            return self.put(value.encode("utf-8"), "utf-8")
+        return self.put(value)
+
+    def _is_large(self, value: Any) -> bool:
+        # len(str) counts characters, a lower bound for its UTF-8 size
+        return isinstance(value, (bytes, bytearray, memoryview, str)) and len(value) >= self.threshold
+
+    def clear(self):
+        """Delete the files of file-backed blobs; their handles can no longer be read."""
+        with self._lock:
+            paths, self._paths = list(self._paths), {}
+        for path in paths:
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+
+def resolve_blobs(value: Any, mode: str = "materialize") -> Any:
+    """
+    Blob handles in a node input (the value itself, or the values of a dict) as the
+    node wants them: "materialize" (bytes/str), "view" (memoryview) or "handle" (as is).
+    """
+    if mode == "handle":
+        return value
+    if isinstance(value, Blob):
+        return value.view() if mode == "view" else value.materialize()
+    if isinstance(value, dict) and any(isinstance(v, Blob) for v in value.values()):
+        return {k: resolve_blobs(v, mode) for k, v in value.items()}
+    return value
+
+_default_store: Optional[BlobStore] = None
+_default_configured = False
+_default_lock = threading.Lock()
+
+def get_blob_store() -> Optional[BlobStore]:
+    """
+    The process-wide store for node outputs, or None if large outputs are passed by value.
+    Enabled by `$WFIR_BLOB_THRESHOLD` (bytes); `$WFIR_BLOB_DIR` adds memory-mapped storage.
+    """
+    global _default_store, _default_configured
+    if _default_configured:
+        return _default_store
+    with _default_lock:
+        if not _default_configured:
+            threshold = os.environ.get("WFIR_BLOB_THRESHOLD")
+            if threshold:
+                _default_store = BlobStore(int(threshold), os.environ.get("WFIR_BLOB_DIR"))
+            _default_configured = True
+        return _default_store
+
+def set_blob_store(store: Optional[BlobStore]):
+    """Replace the process-wide store (None: rebuild it from the environment on next use)."""
+    global _default_store, _default_configured
+    with _default_lock:
+        _default_store = store
+        _default_configured = store is not None
+
+@lru_cache(maxsize=65536)
+def state_key(node_id: str) -> str:
+    """The state key holding a node's output (`<id>_output`, with '-' replaced by '_')."""
+    return f'{node_id.replace("-", "_")}_output'
+
+class InputPlan:
+    """
+    A node's inputs compiled once into (name, literal, source node id, state key) entries,
+    so resolving them is a single pass without parsing input definitions.
+    Accepts `InputValue` models or their aliased dicts ({"value": ...} / {"valueFrom": {"nodeId": ...}}).
+    """
+    __slots__ = ("entries",)
+
+    def __init__(self, entries: Tuple[Tuple[str, Any, Optional[str], Optional[str]], ...]):
+        self.entries = entries
+
+    @classmethod
+    def compile(cls, inputs_def: Dict[str, Any]) -> "InputPlan":
+        entries = []
+        for name, input_val in inputs_def.items():
+            if isinstance(input_val, dict):
+                value_from = input_val.get("valueFrom")
+                value = input_val.get("value")
+                ref_node = value_from.get("nodeId") if value_from else None
+            else:
+                value_from = input_val.value_from
+                value = input_val.value
+                ref_node = value_from.node_id if value_from else None
+            if value_from:
+                # A reference without a node id resolves to None
+                entries.append((name, None, ref_node, state_key(ref_node) if ref_node else None))
+            else:
+                entries.append((name, value, None, None))
+        return cls(tuple(entries))
+
+    def resolve(self, state: Dict[str, Any]) -> Dict[str, Any]:
+        """Literals as given, references read from the state by key; missing values are None."""
+        get = state.get
+        return {name: value if key is None else get(key) for name, value, _, key in self.entries}
 
 class Context:
     """
     Runtime context for the workflow.
     Wraps the state dictionary to provide helper methods.
+    `writer`, if given, receives partial output from streaming nodes (see `emit`).
     """
-    def __init__(self, state: Dict[str, Any]):
-        self._state = state
+    __slots__ = ("_state", "_writer")
+
+    def __init__(self, state: Optional[Dict[str, Any]] = None, writer: Optional[Callable[[Any], None]] = None):
+        self._state = state if state is not None else {}
+        self._writer = writer
+
+    def emit(self, event: Any):
+        """Forward a streaming event (e.g. an LLM token) to the host; a no-op without a writer."""
+        if self._writer is not None:
+            self._writer(event)
 
     def get(self, key: str, default: Any = None) -> Any:
         return self._state.get(key, default)
@@ -18,55 +229,26 @@ class Context:
         """
         Retrieve the output of a specific node from the state.
         """
-        sanitized_id = node_id.replace("-", "_")
-        state_key = f"{sanitized_id}_output"
-        return self._state.get(state_key)
+        return self._state.get(state_key(node_id))
 
     def set_node_output(self, node_id: str, value: Any):
         """
         Set the output of a specific node in the state.
+        Large values are stored as `Blob` handles when a blob store is enabled.
         """
-        sanitized_id = node_id.replace("-", "_")
-        state_key = f"{sanitized_id}_output"
-        self._state[state_key] = value
+        store = get_blob_store()
+        self._state[state_key(node_id)] = store.wrap(value) if store is not None else value
 
-    def resolve_inputs(self, inputs_def: Dict[str, Any]) -> Dict[str, Any]:
+    def resolve_inputs(self, inputs_def: Union[InputPlan, Dict[str, Any]]) -> Dict[str, Any]:
         """
-        Resolves input values from the node definition.
+        Resolves input values from the node definition, or from its `InputPlan`.
         Handles literal values and references to other nodes.
+        Hot paths compile the plan once where the node is prepared (`PreparedNode.input_plan`);
+        a definition dict is compiled on every call.
         """
-        resolved = {}
-        for name, input_val in inputs_def.items():
-            # input_val is a dict (from model_dump, likely aliased)
-            # structure: { value: ..., valueFrom: { nodeId: ... } }
-            
-            # Check for valueFrom (Reference)
-            # Note: keys might be camelCase due to by_alias=True in template
-            
-            value_from = input_val.get("valueFrom")
-            value = input_val.get("value")
-            print(f"Value: {value}")
-            print(f"Value from: {value_from}")
-            
-            if value_from:
-                # Reference
-                ref_node = value_from.get("nodeId")
-                print(f"Ref node: {ref_node}")
-                if ref_node:
-                    # Get the entire output of the referenced node
-                    resolved[name] = self.get_node_output(ref_node)
-                else:
-                    # Invalid reference
-                    resolved[name] = None
-            
-            elif value is not None:
-                # Literal value
-                resolved[name] = value
-            else:
-                # No value provided
-                resolved[name] = None
-                
-        return resolved
+        if not isinstance(inputs_def, InputPlan):
+            inputs_def = InputPlan.compile(inputs_def)
+        return inputs_def.resolve(self._state)
 
 class WorkflowNode(Protocol):
     """Protocol that all generated/runtime nodes must implement."""
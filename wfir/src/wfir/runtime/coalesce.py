@@ -0,0 +1,93 @@
+import threading
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+def freeze(value: Any) -> Hashable:
+    """Turn inputs, params and kwargs into a hashable form for coalescing and cache keys."""
+    if isinstance(value, dict):
+        return tuple(sorted((str(k), freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(v) for v in value)
+    if isinstance(value, set):
+        return frozenset(freeze(v) for v in value)
+    try:
+        hash(value)
+    except TypeError:
+        return repr(value)
+    return value
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls with the same key into one.
+    The first caller (the leader) runs the call; callers arriving while it is in flight
+    wait for it and share its result or exception. Once it finishes the key is released,
+    so later calls run again (caching results is not this class's job).
+
+    Threads (`do`) and coroutines (`ado`) share the same in-flight calls: waiting uses a
+    `concurrent.futures.Future`, which threads block on and coroutines await through
+    `asyncio.wrap_future`, whichever thread or event loop the leader runs on.
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+        # Calls actually made, and calls that were served by another caller's call
+        self.calls = 0
+        self.shared = 0
+
+    def _join(self, key: Hashable) -> Tuple[Future, bool]:
+        """Returns the in-flight future for `key` and whether the caller is its leader."""
+        with self._lock:
+            future = self._calls.get(key)
+            if future is not None:
+                self.shared += 1
+                return future, False
+            future = Future()
+            self._calls[key] = future
+            self.calls += 1
+            return future, True
+
+    def _finish(self, key: Hashable, future: Future, result: Any = None, error: BaseException = None):
+        # Release the key first, so callers arriving after this point start a fresh call
+        with self._lock:
+            self._calls.pop(key, None)
+        if future.done():
+            return
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    def do(self, key: Hashable, fn: Callable[..., Any], *args: Any) -> Any:
+        future, leader = self._join(key)
+        if not leader:
+            return future.result()
+        try:
+            result = fn(*args)
+        except BaseException as e:
+            self._finish(key, future, error=e)
+            raise
+        self._finish(key, future, result)
+        return result
+
+    async def ado(self, key: Hashable, fn: Callable[..., Awaitable[Any]], *args: Any) -> Any:
+        future, leader = self._join(key)
+        if not leader:
+            # Imported here so that importing the registry stays cheap for the CLI
+            import asyncio
+            # Shielded: a cancelled waiter must not cancel the call everyone shares
+            return await asyncio.shield(asyncio.wrap_future(future))
+        try:
+            result = await fn(*args)
+        except BaseException as e:
+            # Includes cancellation of the leader, which waiters see as CancelledError
+            self._finish(key, future, error=e)
+            raise
+        self._finish(key, future, result)
+        return result
+
+    def stats(self) -> Dict[str, int]:
+        return {"calls": self.calls, "shared": self.shared}
+
+# Used by prepared nodes whose implementation enables `coalesce`
+coalescer = SingleFlight()
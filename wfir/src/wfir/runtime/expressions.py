@@ -0,0 +1,81 @@
+import ast
+from functools import lru_cache
+from typing import Any, Dict
+
+class ExpressionError(ValueError):
+    """Raised when an expression is malformed or uses a disallowed construct."""
+
+# Syntax allowed in Condition/Loop expressions.
+# Anything not listed here (lambdas, comprehensions, walrus, f-strings, ...) is rejected.
+_ALLOWED_NODES = (
+    ast.Expression,
+    ast.BoolOp, ast.And, ast.Or,
+    ast.BinOp, ast.Add, ast.Sub, ast.Mult, ast.Div, ast.FloorDiv, ast.Mod, ast.Pow,
+    ast.UnaryOp, ast.Not, ast.USub, ast.UAdd,
+    ast.Compare, ast.Eq, ast.NotEq, ast.Lt, ast.LtE, ast.Gt, ast.GtE,
+    ast.In, ast.NotIn, ast.Is, ast.IsNot,
+    ast.IfExp,
+    ast.Call, ast.Attribute,
+    ast.Subscript, ast.Slice,
+    ast.Name, ast.Load,
+    ast.Constant,
+    ast.List, ast.Tuple, ast.Set, ast.Dict,
+)
+
+# Expressions run without builtins, same as the previous inline eval
+_GLOBALS: Dict[str, Any] = {"__builtins__": {}}
+
+class _Validator(ast.NodeVisitor):
+    def __init__(self, source: str):
+        self.source = source
+
+    def generic_visit(self, node: ast.AST):
+        if not isinstance(node, _ALLOWED_NODES):
+            raise ExpressionError(f"Unsupported syntax '{type(node).__name__}' in expression: {self.source!r}")
+        super().generic_visit(node)
+
+    def visit_Attribute(self, node: ast.Attribute):
+        if node.attr.startswith("_"):
+            raise ExpressionError(f"Access to private attribute '{node.attr}' is not allowed: {self.source!r}")
+        self.generic_visit(node)
+
+    def visit_Name(self, node: ast.Name):
+        if node.id.startswith("__"):
+            raise ExpressionError(f"Access to name '{node.id}' is not allowed: {self.source!r}")
+        self.generic_visit(node)
+
+class CompiledExpression:
+    """A validated expression, parsed and compiled once."""
+    __slots__ = ("source", "code")
+
+    def __init__(self, source: str, code):
+        self.source = source
+        self.code = code
+
+    def evaluate(self, inputs: Dict[str, Any]) -> Any:
+        """
+        Evaluate against node inputs.
+        Inputs are accessible directly by name or through the `input` alias.
+        """
+        eval_context = dict(inputs)
+        eval_context["input"] = inputs
+        return eval(self.code, _GLOBALS, eval_context)
+
+@lru_cache(maxsize=1024)
+def compile_expression(source: str) -> CompiledExpression:
+    """
+    Parse, validate and compile an expression.
+    Results are cached by expression text, so each distinct expression is compiled once per process.
+    """
+    try:
+        tree = ast.parse(source.strip(), mode="eval")
+    except SyntaxError as e:
+        raise ExpressionError(f"Invalid expression {source!r}: {e.msg}") from e
+
+    _Validator(source).visit(tree)
+    code = compile(tree, f"<expression {source!r}>", "eval")
+    return CompiledExpression(source, code)
+
+def evaluate_expression(source: str, inputs: Dict[str, Any]) -> Any:
+    """Compile (cached) and evaluate an expression against inputs."""
+    return compile_expression(source).evaluate(inputs)
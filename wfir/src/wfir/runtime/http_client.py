@@ -0,0 +1,282 @@
+import asyncio
+import json
+import os
+import random
+import threading
+import time
+import weakref
+from typing import Any, AsyncIterator, Dict, Iterator, Optional, Union
+from urllib.parse import urlsplit
+import httpx
+from wfir.runtime.base import get_blob_store
+
+# Statuses worth retrying: rate limiting and transient gateway/server unavailability
+RETRY_STATUSES = frozenset({429, 502, 503, 504})
+# Methods that may be retried after the request was (possibly) sent
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+# Upper bound for a server-requested Retry-After, in seconds
+MAX_RETRY_AFTER = 30.0
+
+class ResponseTooLarge(RuntimeError):
+    """The response body exceeded the caller's `max_body_bytes`."""
+
+class RequestOptions:
+    """Per-request settings shared by the sync and async paths."""
+    __slots__ = ("method", "url", "headers", "params", "body", "timeout", "retries", "backoff", "max_body_bytes")
+
+    def __init__(self, method: str, url: str, headers: Optional[Dict[str, str]] = None, params: Optional[Dict[str, Any]] = None,
+                 body: Any = None, timeout: float = 30.0, retries: int = 2, backoff: float = 0.25, max_body_bytes: Optional[int] = None):
+        self.method = method.upper()
+        self.url = url
+        self.headers = headers or {}
+        self.params = params
+        self.body = body
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.max_body_bytes = max_body_bytes
+
+    def build(self, client: Union[httpx.Client, httpx.AsyncClient]) -> httpx.Request:
+        body: Dict[str, Any] = {}
+        if isinstance(self.body, (str, bytes)):
+            body["content"] = self.body
+        elif self.body is not None:
+            body["json"] = self.body
+        return client.build_request(self.method, self.url, headers=self.headers, params=self.params, timeout=self.timeout, **body)
+
+    def retry_delay(self, attempt: int, response: Optional[httpx.Response] = None) -> Optional[float]:
+        """Seconds to wait before retry number `attempt + 1`, or None if the request must not be retried."""
+        if attempt >= self.retries:
+            return None
+        if response is not None:
+            if response.status_code not in RETRY_STATUSES or self.method not in IDEMPOTENT_METHODS:
+                return None
+            retry_after = response.headers.get("Retry-After", "")
+            if retry_after.isdigit():
+                return min(float(retry_after), MAX_RETRY_AFTER)
+        # Exponential backoff with jitter, so synchronized callers spread out
+        return self.backoff * (2 ** attempt) * (0.5 + random.random() / 2)
+
+    def retryable_error(self, error: Exception) -> bool:
+        # A failed connect means nothing was sent, so any method can be retried
+        if isinstance(error, (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)):
+            return True
+        return isinstance(error, httpx.TransportError) and self.method in IDEMPOTENT_METHODS
+
+def _host(url: str) -> str:
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+def _check_length(response: httpx.Response, size: int, limit: Optional[int]):
+    if limit is not None and size > limit:
+        raise ResponseTooLarge(f"Response body from {response.request.url} exceeds {limit} bytes")
+
+def _result(response: httpx.Response, content: bytearray) -> Dict[str, Any]:
+    """
+    Node output: status, headers and the body (decoded JSON for JSON responses, otherwise text).
+    With a blob store enabled, a large text body becomes a `Blob` of the raw bytes,
+    decoded only when a node reads it.
+    """
+    is_json = "json" in response.headers.get("Content-Type", "")
+    store = get_blob_store()
+    if store is not None and not is_json and len(content) >= store.threshold:
+        body = store.put(content, response.charset_encoding or "utf-8")
+        return {"status": response.status_code, "headers": dict(response.headers), "body": body}
+    body = content.decode(response.charset_encoding or "utf-8", errors="replace")
+    if is_json and content:
+        try:
+            body = json.loads(body)
+        except ValueError:
+            pass
+    return {"status": response.status_code, "headers": dict(response.headers), "body": body}
+
+class HTTPClientPool:
+    """
+    Shared HTTP clients for HTTP nodes.
+
+    One keep-alive connection pool serves every node and execution: an `httpx.Client` for
+    threads, and an `httpx.AsyncClient` per event loop (async clients can't cross loops).
+    At most `max_per_host` requests per scheme+host are in flight at once, per client.
+    Requests time out after `timeout` seconds (connect, read, write and pool wait each),
+    and are retried with exponential backoff on connection errors, timeouts and 429/502/503/504;
+    non-idempotent methods (POST, PATCH) are retried only when the connection failed.
+    Bodies are read in chunks, so `max_body_bytes` aborts an oversized response early.
+    """
+
+    def __init__(self, max_per_host: int = 10, max_keepalive: int = 100, keepalive_expiry: float = 30.0):
+        self.max_per_host = max_per_host
+        self._limits = httpx.Limits(max_connections=None, max_keepalive_connections=max_keepalive, keepalive_expiry=keepalive_expiry)
+        self._lock = threading.Lock()
+        self._client: Optional[httpx.Client] = None
+        self._host_slots: Dict[str, threading.BoundedSemaphore] = {}
+        # loop -> (client, host -> semaphore)
+        self._async: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Any]" = weakref.WeakKeyDictionary()
+
+    # --- Clients and per-host slots ---
+
+    def client(self) -> httpx.Client:
+        with self._lock:
+            if self._client is None:
+                self._client = httpx.Client(limits=self._limits)
+            return self._client
+
+    def _host_slot(self, url: str) -> threading.BoundedSemaphore:
+        host = _host(url)
+        with self._lock:
+            slot = self._host_slots.get(host)
+            if slot is None:
+                slot = self._host_slots[host] = threading.BoundedSemaphore(self.max_per_host)
+            return slot
+
+    def _loop_state(self):
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            state = self._async.get(loop)
+            if state is None:
+                state = self._async[loop] = (httpx.AsyncClient(limits=self._limits), {})
+            return state
+
+    def async_client(self) -> httpx.AsyncClient:
+        """The client for the running event loop."""
+        return self._loop_state()[0]
+
+    def _async_host_slot(self, url: str) -> asyncio.Semaphore:
+        slots = self._loop_state()[1]
+        host = _host(url)
+        slot = slots.get(host)
+        if slot is None:
+            slot = slots[host] = asyncio.Semaphore(self.max_per_host)
+        return slot
+
+    # --- Requests ---
+
+    def request(self, options: RequestOptions) -> Dict[str, Any]:
+        """Send a request with retries; returns {"status", "headers", "body"}."""
+        client = self.client()
+        attempt = 0
+        while True:
+            try:
+                with self._host_slot(options.url):
+                    response = client.send(options.build(client), stream=True)
+                    try:
+                        delay = options.retry_delay(attempt, response)
+                        if delay is None:
+                            _check_length(response, int(response.headers.get("Content-Length") or 0), options.max_body_bytes)
+                            content = bytearray()
+                            for chunk in response.iter_bytes():
+                                content += chunk
+                                _check_length(response, len(content), options.max_body_bytes)
+                            return _result(response, content)
+                    finally:
+                        response.close()
+            except httpx.TransportError as e:
+                delay = options.retry_delay(attempt) if options.retryable_error(e) else None
+                if delay is None:
+                    raise
+            time.sleep(delay)
+            attempt += 1
+
+    async def arequest(self, options: RequestOptions) -> Dict[str, Any]:
+        """Async counterpart of `request`."""
+        client = self.async_client()
+        attempt = 0
+        while True:
+            try:
+                async with self._async_host_slot(options.url):
+                    response = await client.send(options.build(client), stream=True)
+                    try:
+                        delay = options.retry_delay(attempt, response)
+                        if delay is None:
+                            _check_length(response, int(response.headers.get("Content-Length") or 0), options.max_body_bytes)
+                            content = bytearray()
+                            async for chunk in response.aiter_bytes():
+                                content += chunk
+                                _check_length(response, len(content), options.max_body_bytes)
+                            return _result(response, content)
+                    finally:
+                        await response.aclose()
+            except httpx.TransportError as e:
+                delay = options.retry_delay(attempt) if options.retryable_error(e) else None
+                if delay is None:
+                    raise
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    def stream(self, options: RequestOptions) -> Iterator[str]:
+        """
+        Yield the response body as text chunks without buffering it.
+        Retries happen only before the first chunk; `max_body_bytes` doesn't apply.
+        """
+        client = self.client()
+        attempt = 0
+        # Once a chunk was yielded, a retry would repeat it: failures are raised from then on
+        started = False
+        while True:
+            try:
+                with self._host_slot(options.url):
+                    response = client.send(options.build(client), stream=True)
+                    try:
+                        delay = options.retry_delay(attempt, response)
+                        if delay is None:
+                            for chunk in response.iter_text():
+                                started = True
+                                yield chunk
+                            return
+                    finally:
+                        response.close()
+            except httpx.TransportError as e:
+                delay = options.retry_delay(attempt) if not started and options.retryable_error(e) else None
+                if delay is None:
+                    raise
+            time.sleep(delay)
+            attempt += 1
+
+    async def astream(self, options: RequestOptions) -> AsyncIterator[str]:
+        """Async counterpart of `stream`."""
+        client = self.async_client()
+        attempt = 0
+        started = False
+        while True:
+            try:
+                async with self._async_host_slot(options.url):
+                    response = await client.send(options.build(client), stream=True)
+                    try:
+                        delay = options.retry_delay(attempt, response)
+                        if delay is None:
+                            async for chunk in response.aiter_text():
+                                started = True
+                                yield chunk
+                            return
+                    finally:
+                        await response.aclose()
+            except httpx.TransportError as e:
+                delay = options.retry_delay(attempt) if not started and options.retryable_error(e) else None
+                if delay is None:
+                    raise
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    def close(self):
+        """Close the thread client; async clients are closed with `aclose` from their loop."""
+        with self._lock:
+            client, self._client = self._client, None
+        if client is not None:
+            client.close()
+
+    async def aclose(self):
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            state = self._async.pop(loop, None)
+        if state is not None:
+            await state[0].aclose()
+
+_default_pool: Optional[HTTPClientPool] = None
+_default_lock = threading.Lock()
+
+def get_http_pool() -> HTTPClientPool:
+    """The process-wide pool used by HTTP nodes; `$WFIR_HTTP_MAX_PER_HOST` sets the per-host limit."""
+    global _default_pool
+    with _default_lock:
+        if _default_pool is None:
+            _default_pool = HTTPClientPool(max_per_host=int(os.environ.get("WFIR_HTTP_MAX_PER_HOST", "10")))
+        return _default_pool
@@ -1,9 +1,13 @@
-from typing import Any, Optional, List
+import asyncio
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Dict, Hashable, Iterator, Optional, List, Set, Tuple
 from langchain_core.language_models import BaseChatModel
-from langchain_core.messages import BaseMessage, AIMessage
-from langchain_core.outputs import ChatResult, ChatGeneration
-from langchain_openai import ChatOpenAI
-from langchain_ollama import ChatOllama
+from langchain_core.messages import BaseMessage, AIMessage, AIMessageChunk
+from langchain_core.outputs import ChatResult, ChatGeneration, ChatGenerationChunk
+from wfir.runtime.coalesce import freeze
 
 class MockChatModel(BaseChatModel):
     model_name: str = "mock"
@@ -15,23 +19,185 @@ class MockChatModel(BaseChatModel):
         # We can assume it might be in kwargs or we just ignore it for the mock string to match previous behavior approximately.
         response = f"Mock response from {self.model_name}: {last_msg}"
         return ChatResult(generations=[ChatGeneration(message=AIMessage(content=response))])
+
+    def _stream(self, messages: List[BaseMessage], stop: Optional[List[str]] = None, run_manager: Optional[Any] = None, **kwargs: Any) -> Iterator[ChatGenerationChunk]:
+        # One chunk per word, so streaming can be observed without a real provider
+        response = self._generate(messages, stop, run_manager, **kwargs).generations[0].message.content
+        for i, word in enumerate(response.split(" ")):
+            yield ChatGenerationChunk(message=AIMessageChunk(content=word if i == 0 else " " + word))
     
     @property
     def _llm_type(self) -> str:
         return "mock"
 
 class ModelFactory:
+    """
+    Builds chat model clients and caches them.
+    A client is reused for the same provider, model, temperature and kwargs,
+    so its HTTP connection pool is shared by every node and execution using it.
+    The cache is an LRU bounded by `max_cached_clients` and guarded by a lock,
+    which makes it safe to use from threads and from async code.
+    """
+    max_cached_clients: int = 32
+    _cache: "OrderedDict[Tuple[Hashable, ...], BaseChatModel]" = OrderedDict()
+    _lock = threading.Lock()
+
+    @classmethod
+    def create(cls, provider: str, model: str, temperature: float = 0.7, **kwargs) -> BaseChatModel:
+        """
+        Returns a (possibly cached) LangChain Chat Model for the provider and configuration.
+        """
+        key = (provider.lower(), model, temperature, freeze(kwargs))
+        with cls._lock:
+            client = cls._cache.get(key)
+            if client is not None:
+                cls._cache.move_to_end(key)
+                return client
+
+        # Build outside the lock; client construction can be slow
+        client = cls._build(provider, model, temperature, **kwargs)
+
+        with cls._lock:
+            # Another caller may have built the same client in the meantime
+            existing = cls._cache.get(key)
+            if existing is not None:
+                cls._cache.move_to_end(key)
+                return existing
+            cls._cache[key] = client
+            while len(cls._cache) > cls.max_cached_clients:
+                cls._cache.popitem(last=False)
+        return client
+
+    @classmethod
+    def clear_cache(cls):
+        with cls._lock:
+            cls._cache.clear()
+
     @staticmethod
-    def create(provider: str, model: str, temperature: float = 0.7, **kwargs) -> BaseChatModel:
+    def _build(provider: str, model: str, temperature: float = 0.7, **kwargs) -> BaseChatModel:
         """
         Creates a LangChain Chat Model based on the provider and configuration.
+        Provider SDKs are imported here, on first use, since each takes a second or more to import.
         """
         if provider.lower() == "openai":
+            from langchain_openai import ChatOpenAI
             # Ensure api_key is handled by env var or kwargs
             return ChatOpenAI(model=model, temperature=temperature, **kwargs)
         elif provider.lower() == "ollama":
+            from langchain_ollama import ChatOllama
             return ChatOllama(model=model, temperature=temperature, **kwargs)
         elif provider.lower() == "mock":
             return MockChatModel(model_name=model, **kwargs)
         else:
             raise ValueError(f"Unsupported provider: {provider}")
+
+class _Batch:
+    """Calls collected for one model during one window."""
+    __slots__ = ("model", "messages", "futures", "full")
+
+    def __init__(self, model: BaseChatModel, full: Any):
+        self.model = model
+        self.messages: List[List[BaseMessage]] = []
+        self.futures: List[Any] = []
+        # threading.Event or asyncio.Event, set when the batch reaches max_batch_size
+        self.full = full
+
+class MicroBatcher:
+    """
+    Collects concurrent calls to the same chat model client (same provider, model,
+    temperature and kwargs; see `ModelFactory`) for up to `window` seconds, or until
+    `max_batch_size` calls are waiting, then sends them with one `model.batch`/`abatch`
+    and hands each caller its own result or exception.
+
+    Batching trades up to `window` of extra latency for fewer, larger provider calls;
+    it pays off with providers (or rate limits) where a batch costs less than its calls.
+    Threads (`invoke`) and coroutines (`ainvoke`) are batched separately, and async
+    batches are per event loop.
+    """
+
+    def __init__(self, window: float = 0.01, max_batch_size: int = 32):
+        self.window = window
+        self.max_batch_size = max_batch_size
+        self._lock = threading.Lock()
+        self._pending: Dict[Hashable, _Batch] = {}
+        # Flush tasks in flight; the event loop only keeps weak references to tasks
+        self._tasks: Set[asyncio.Task] = set()
+        # Provider calls made, and the individual calls they carried
+        self.batches = 0
+        self.calls = 0
+
+    def _join(self, key: Hashable, model: BaseChatModel, messages: List[BaseMessage], make_event, make_future) -> Tuple[_Batch, Any, bool]:
+        """Add a call to the open batch for `key`. Returns (batch, future, whether a new batch was opened)."""
+        with self._lock:
+            batch = self._pending.get(key)
+            opened = batch is None
+            if opened:
+                batch = self._pending[key] = _Batch(model, make_event())
+            future = make_future()
+            batch.messages.append(messages)
+            batch.futures.append(future)
+            if len(batch.messages) >= self.max_batch_size:
+                # Close it now; the next call opens a new batch
+                del self._pending[key]
+                batch.full.set()
+            return batch, future, opened
+
+    def _close(self, key: Hashable, batch: _Batch):
+        with self._lock:
+            if self._pending.get(key) is batch:
+                del self._pending[key]
+            self.batches += 1
+            self.calls += len(batch.messages)
+
+    def invoke(self, model: BaseChatModel, messages: List[BaseMessage]) -> BaseMessage:
+        """Batched `model.invoke`; the thread that opens a batch waits out the window and sends it."""
+        key = ("sync", id(model))
+        batch, future, opened = self._join(key, model, messages, threading.Event, Future)
+        if opened:
+            batch.full.wait(self.window)
+            self._close(key, batch)
+            try:
+                results = model.batch(batch.messages, return_exceptions=True)
+            except Exception as e:
+                results = [e] * len(batch.futures)
+            for waiter, result in zip(batch.futures, results):
+                if isinstance(result, Exception):
+                    waiter.set_exception(result)
+                else:
+                    waiter.set_result(result)
+        return future.result()
+
+    async def ainvoke(self, model: BaseChatModel, messages: List[BaseMessage]) -> BaseMessage:
+        """Batched `model.ainvoke`; each batch is sent by its own task, so cancelled callers don't strand the others."""
+        loop = asyncio.get_running_loop()
+        key = (loop, id(model))
+        batch, future, opened = self._join(key, model, messages, asyncio.Event, loop.create_future)
+        if opened:
+            task = loop.create_task(self._flush(key, batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        return await future
+
+    async def _flush(self, key: Hashable, batch: _Batch):
+        try:
+            await asyncio.wait_for(batch.full.wait(), self.window)
+        except asyncio.TimeoutError:
+            pass
+        self._close(key, batch)
+        try:
+            results = await batch.model.abatch(batch.messages, return_exceptions=True)
+        except Exception as e:
+            results = [e] * len(batch.futures)
+        for waiter, result in zip(batch.futures, results):
+            if waiter.done():
+                continue
+            if isinstance(result, Exception):
+                waiter.set_exception(result)
+            else:
+                waiter.set_result(result)
+
+# Used by LLM nodes with `batch` enabled
+llm_batcher = MicroBatcher(
+    window=float(os.environ.get("WFIR_LLM_BATCH_WINDOW_MS", "10")) / 1000,
+    max_batch_size=int(os.environ.get("WFIR_LLM_BATCH_SIZE", "32")),
+)
@@ -1,6 +1,9 @@
-from typing import Any, Dict, Optional, Type, TypeVar, Generic
+import asyncio
+from typing import Any, AsyncIterator, Dict, Hashable, Iterator, Optional, Tuple, Type, TypeVar, Generic
 from pydantic import BaseModel, Field
 from wfir.runtime.base import Context
+from wfir.runtime.coalesce import freeze
+from wfir.runtime.expressions import evaluate_expression
 
 class EmptyParams(BaseModel):
     pass
@@ -10,20 +13,70 @@ TParams = TypeVar("TParams", bound=BaseModel)
 class NodeDef(BaseModel, Generic[TParams]):
     params: TParams
     node_id: str
-    
+    # The IR node's `stream` flag; streaming nodes emit partial output as it is produced
+    stream: bool = False
+
 
 class NodeImplementation(Generic[TParams]):
     params_model: Type[TParams] = EmptyParams
 
+    # Whether `execute` may block (I/O, heavy CPU). Blocking nodes without a native
+    # `aexecute` are run in a worker thread so they don't stall the event loop.
+    blocking: bool = True
+
+    # Whether executing the node affects the outside world (HTTP calls, tools).
+    # Nodes without side effects may be pruned by the optimizer when their output is unused.
+    side_effects: bool = True
+
+    # Whether `astream` yields partial output (e.g. tokens) rather than one final chunk.
+    streaming: bool = False
+
+    # Opt-in: concurrent executions with the same `coalesce_key` share one call
+    # (see `wfir.runtime.coalesce`). Enable per type, e.g. `LLMNode.coalesce = True`.
+    coalesce: bool = False
+
+    # How `Blob` inputs (large outputs of other nodes, see `wfir.runtime.base.BlobStore`)
+    # reach `execute`: "materialize" (bytes/str), "view" (zero-copy memoryview of the
+    # raw bytes) or "handle" (the Blob itself, for nodes that only pass values on).
+    blob_inputs: str = "materialize"
+
+    def coalesce_key(self, inputs: Dict[str, Any], node_def: NodeDef[TParams]) -> Optional[Hashable]:
+        """What identifies an upstream call; None if this execution must not be shared."""
+        return None
+
     def execute(self, inputs: Dict[str, Any], context: Context, node_def: NodeDef[TParams]) -> Any:
         raise NotImplementedError
 
+    async def aexecute(self, inputs: Dict[str, Any], context: Context, node_def: NodeDef[TParams]) -> Any:
+        """
+        Async execution. Override for a native implementation;
+        the default falls back to `execute` (in a thread pool if the node is blocking).
+        """
+        if not self.blocking:
+            return self.execute(inputs, context, node_def)
+        return await asyncio.to_thread(self.execute, inputs, context, node_def)
+
+    async def astream(self, inputs: Dict[str, Any], context: Context, node_def: NodeDef[TParams]) -> AsyncIterator[Any]:
+        """
+        Async iterator over the node's output in chunks.
+        Nodes that don't stream yield the result of `aexecute` as a single chunk.
+        """
+        yield await self.aexecute(inputs, context, node_def)
+
 class StartNode(NodeImplementation[EmptyParams]):
+    blocking = False
+    side_effects = False
+    blob_inputs = "handle"
+
     def execute(self, inputs: Dict[str, Any], context: Context, node_def: NodeDef[EmptyParams]) -> Any:
         # StartNode usually just passes through initial inputs or does nothing
         return inputs
 
 class EndNode(NodeImplementation[EmptyParams]):
+    blocking = False
+    side_effects = False
+    blob_inputs = "handle"
+
     def execute(self, inputs: Dict[str, Any], context: Context, node_def: NodeDef[EmptyParams]) -> Any:
         return inputs
 
@@ -32,11 +85,111 @@ class LLMParams(BaseModel):
     model: str = Field("gpt-3.5-turbo", description="The LLM model to use")
     temperature: float = Field(0.7, description="Sampling temperature", ge=0.0, le=2.0)
     system_prompt: str = Field("", description="System prompt")
+    batch: bool = Field(False, description="Send together with concurrent calls to the same model (see `wfir.runtime.llm.MicroBatcher`); adds up to the batching window of latency")
+    cache: bool = Field(False, description="Reuse the response of an identical earlier request (same provider, model, temperature, system prompt and prompt); meant for deterministic calls, e.g. temperature 0")
 
 class LLMNode(NodeImplementation[LLMParams]):
     params_model = LLMParams
+    side_effects = False
+    streaming = True
+
+    def _build_request(self, prompt: Any, node_def: NodeDef[LLMParams]):
+        """Returns the model client and the messages to send."""
+        params = node_def.params
+        
+        from wfir.runtime.llm import ModelFactory
+        from langchain_core.messages import HumanMessage, SystemMessage
+        
+        model = ModelFactory.create(
+            provider=params.provider,
+            model=params.model,
+            temperature=params.temperature
+        )
+        
+        messages = []
+        if params.system_prompt:
+            messages.append(SystemMessage(content=params.system_prompt))
+        messages.append(HumanMessage(content=str(prompt)))
+        return model, messages
+
+    def coalesce_key(self, inputs: Dict[str, Any], node_def: NodeDef[LLMParams]) -> Optional[Hashable]:
+        # Streamed tokens go to the caller's context, so streaming executions are never shared
+        if node_def.stream:
+            return None
+        params = node_def.params
+        return (params.provider.lower(), params.model, params.temperature, params.system_prompt, freeze(inputs.get("prompt")))
+
+    def _cache_lookup(self, prompt: Any, params: LLMParams) -> Tuple[Optional[str], Any]:
+        """Returns (cache key, cached response); the key is None when caching is off for the node."""
+        if not params.cache:
+            return None, None
+        from wfir.runtime.response_cache import get_response_cache, llm_cache_key
+
+        key = llm_cache_key(params.provider, params.model, params.temperature, params.system_prompt, str(prompt))
+        return key, get_response_cache().get(key)
+
+    @staticmethod
+    def _cache_store(key: Optional[str], response: Any):
+        # Only successful responses are stored; errors are returned, not cached
+        if key is not None:
+            from wfir.runtime.response_cache import get_response_cache
+            get_response_cache().set(key, response)
+
+    def stream(self, inputs: Dict[str, Any], context: Context, node_def: NodeDef[LLMParams]) -> Iterator[str]:
+        """Yield the completion in chunks as the provider produces them."""
+        prompt = inputs.get("prompt")
+        if prompt is None:
+            yield "Error: 'prompt' input missing"
+            return
+
+        key, cached = self._cache_lookup(prompt, node_def.params)
+        if cached is not None:
+            yield cached
+            return
+
+        try:
+            model, messages = self._build_request(prompt, node_def)
+            chunks = []
+            for chunk in model.stream(messages):
+                if chunk.content:
+                    chunks.append(chunk.content)
+                    yield chunk.content
+            self._cache_store(key, "".join(chunks))
+        except Exception as e:
+            yield f"Error executing LLMNode: {str(e)}"
+
+    async def astream(self, inputs: Dict[str, Any], context: Context, node_def: NodeDef[LLMParams]) -> AsyncIterator[str]:
+        """Async counterpart of `stream`; the first chunk arrives with the provider's first token."""
+        prompt = inputs.get("prompt")
+        if prompt is None:
+            yield "Error: 'prompt' input missing"
+            return
+
+        key, cached = self._cache_lookup(prompt, node_def.params)
+        if cached is not None:
+            yield cached
+            return
+
+        try:
+            model, messages = self._build_request(prompt, node_def)
+            chunks = []
+            async for chunk in model.astream(messages):
+                if chunk.content:
+                    chunks.append(chunk.content)
+                    yield chunk.content
+            self._cache_store(key, "".join(chunks))
+        except Exception as e:
+            yield f"Error executing LLMNode: {str(e)}"
 
     def execute(self, inputs: Dict[str, Any], context: Context, node_def: NodeDef[LLMParams]) -> Any:
+        if node_def.stream:
+            # Tokens go to the host as they arrive; the node's output is still the full text
+            chunks = []
+            for chunk in self.stream(inputs, context, node_def):
+                context.emit({"node": node_def.node_id, "chunk": chunk})
+                chunks.append(chunk)
+            return "".join(chunks)
+
         prompt = inputs.get("prompt")
         if prompt is None:
             # Try to find 'input' if prompt is not explicit, as a fallback convention? 
@@ -44,24 +197,46 @@ class LLMNode(NodeImplementation[LLMParams]):
             # Based on existing code: prompt = inputs.get("prompt")
             return "Error: 'prompt' input missing"
 
-        params = node_def.params
-        
-        from wfir.runtime.llm import ModelFactory
-        from langchain_core.messages import HumanMessage, SystemMessage
-        
+        key, cached = self._cache_lookup(prompt, node_def.params)
+        if cached is not None:
+            return cached
+
         try:
-            model = ModelFactory.create(
-                provider=params.provider,
-                model=params.model,
-                temperature=params.temperature
-            )
-            
-            messages = []
-            if params.system_prompt:
-                messages.append(SystemMessage(content=params.system_prompt))
-            messages.append(HumanMessage(content=str(prompt)))
-            
-            response = model.invoke(messages)
+            model, messages = self._build_request(prompt, node_def)
+            if node_def.params.batch:
+                from wfir.runtime.llm import llm_batcher
+                response = llm_batcher.invoke(model, messages)
+            else:
+                response = model.invoke(messages)
+            self._cache_store(key, response.content)
+            return response.content
+        except Exception as e:
+            return f"Error executing LLMNode: {str(e)}"
+
+    async def aexecute(self, inputs: Dict[str, Any], context: Context, node_def: NodeDef[LLMParams]) -> Any:
+        if node_def.stream:
+            chunks = []
+            async for chunk in self.astream(inputs, context, node_def):
+                context.emit({"node": node_def.node_id, "chunk": chunk})
+                chunks.append(chunk)
+            return "".join(chunks)
+
+        prompt = inputs.get("prompt")
+        if prompt is None:
+            return "Error: 'prompt' input missing"
+
+        key, cached = self._cache_lookup(prompt, node_def.params)
+        if cached is not None:
+            return cached
+
+        try:
+            model, messages = self._build_request(prompt, node_def)
+            if node_def.params.batch:
+                from wfir.runtime.llm import llm_batcher
+                response = await llm_batcher.ainvoke(model, messages)
+            else:
+                response = await model.ainvoke(messages)
+            self._cache_store(key, response.content)
             return response.content
         except Exception as e:
             return f"Error executing LLMNode: {str(e)}"
@@ -70,22 +245,78 @@ class HTTPParams(BaseModel):
     url: str = Field(..., description="Target URL")
     method: str = Field("GET", description="HTTP Method", pattern="^(GET|POST|PUT|DELETE|PATCH)$")
     headers: Dict[str, str] = Field(default_factory=dict, description="HTTP Headers")
+    timeout: float = Field(30.0, description="Seconds to wait for connecting, sending and each read", gt=0)
+    retries: int = Field(2, description="Retries on connection errors, timeouts and 429/502/503/504 (POST/PATCH: connection errors only)", ge=0)
+    max_body_bytes: int = Field(10 * 1024 * 1024, description="Fail if the response body is larger (streaming nodes are not limited)", gt=0)
 
 class HTTPNode(NodeImplementation[HTTPParams]):
+    """
+    Sends a request through the shared pool (`wfir.runtime.http_client`).
+    Inputs: `query` (query parameters) and `body` (JSON, or text/bytes sent as is).
+    Output: {"status", "headers", "body"}, with JSON bodies decoded; HTTP error statuses
+    are returned, failures to get a response after retries raise.
+    With `stream` set, the body is produced in text chunks instead of being buffered.
+    """
     params_model = HTTPParams
+    streaming = True
 
-    def execute(self, inputs: Dict[str, Any], context: Context, node_def: NodeDef[HTTPParams]) -> Any:
+    @staticmethod
+    def _options(inputs: Dict[str, Any], node_def: NodeDef[HTTPParams]):
+        from wfir.runtime.http_client import RequestOptions
+
+        params = node_def.params
+        return RequestOptions(params.method, params.url, params.headers, inputs.get("query"), inputs.get("body"),
+                              timeout=params.timeout, retries=params.retries, max_body_bytes=params.max_body_bytes)
+
+    def coalesce_key(self, inputs: Dict[str, Any], node_def: NodeDef[HTTPParams]) -> Optional[Hashable]:
+        # Only reads are shared; each write must reach the server. Limits are part of the
+        # key, so a caller never gets a response fetched under looser ones
         params = node_def.params
-        url = params.url
-        method = params.method
-        # Mock HTTP call
-        return {"status": 200, "body": f"Response from {method} {url}"}
+        if params.method != "GET" or node_def.stream:
+            return None
+        return (params.url, freeze(params.headers), freeze(inputs.get("query")), freeze(inputs.get("body")),
+                params.timeout, params.retries, params.max_body_bytes)
+
+    def stream(self, inputs: Dict[str, Any], context: Context, node_def: NodeDef[HTTPParams]) -> Iterator[str]:
+        from wfir.runtime.http_client import get_http_pool
+        return get_http_pool().stream(self._options(inputs, node_def))
+
+    async def astream(self, inputs: Dict[str, Any], context: Context, node_def: NodeDef[HTTPParams]) -> AsyncIterator[str]:
+        from wfir.runtime.http_client import get_http_pool
+        async for chunk in get_http_pool().astream(self._options(inputs, node_def)):
+            yield chunk
+
+    def execute(self, inputs: Dict[str, Any], context: Context, node_def: NodeDef[HTTPParams]) -> Any:
+        from wfir.runtime.http_client import get_http_pool
+
+        if node_def.stream:
+            chunks = []
+            for chunk in self.stream(inputs, context, node_def):
+                context.emit({"node": node_def.node_id, "chunk": chunk})
+                chunks.append(chunk)
+            return "".join(chunks)
+        return get_http_pool().request(self._options(inputs, node_def))
+
+    async def aexecute(self, inputs: Dict[str, Any], context: Context, node_def: NodeDef[HTTPParams]) -> Any:
+        from wfir.runtime.http_client import get_http_pool
+
+        if node_def.stream:
+            chunks = []
+            async for chunk in self.astream(inputs, context, node_def):
+                context.emit({"node": node_def.node_id, "chunk": chunk})
+                chunks.append(chunk)
+            return "".join(chunks)
+        return await get_http_pool().arequest(self._options(inputs, node_def))
 
 class ToolParams(BaseModel):
     tool_name: str = Field(..., description="Name of the tool to execute")
 
 class ToolNode(NodeImplementation[ToolParams]):
     params_model = ToolParams
+    blocking = False
+
+    def coalesce_key(self, inputs: Dict[str, Any], node_def: NodeDef[ToolParams]) -> Optional[Hashable]:
+        return (node_def.params.tool_name, freeze(inputs.get("tool_args", {})))
 
     def execute(self, inputs: Dict[str, Any], context: Context, node_def: NodeDef[ToolParams]) -> Any:
         params = node_def.params
@@ -101,6 +332,8 @@ class ConditionParams(BaseModel):
 
 class ConditionNode(NodeImplementation[ConditionParams]):
     params_model = ConditionParams
+    blocking = False
+    side_effects = False
 
     def execute(self, inputs: Dict[str, Any], context: Context, node_def: NodeDef[ConditionParams]) -> Any:
         params = node_def.params
@@ -108,15 +341,10 @@ class ConditionNode(NodeImplementation[ConditionParams]):
         true_target = params.true_target
         false_target = params.false_target
         
-        # Simple eval context
-        # We allow accessing inputs via 'input' or directly by name
-        eval_context = inputs.copy()
-        eval_context["input"] = inputs # Alias for convenience
-        
+        # Inputs are accessible via 'input' or directly by name.
+        # The expression is validated and compiled once, then cached by its text.
         try:
-            # WARNING: eval is unsafe. In production use a safe evaluator like simpleeval
-            # We use a limited scope
-            result = eval(expression, {"__builtins__": {}}, eval_context)
+            result = evaluate_expression(expression, inputs)
         except Exception as e:
             print(f"Condition eval failed: {e}")
             result = False
@@ -135,6 +363,8 @@ class LoopNode(NodeImplementation[LoopParams]):
     or exit (end_target).
     """
     params_model = LoopParams
+    blocking = False
+    side_effects = False
 
     def execute(self, inputs: Dict[str, Any], context: Context, node_def: NodeDef[LoopParams]) -> Any:
         params = node_def.params
@@ -143,11 +373,8 @@ class LoopNode(NodeImplementation[LoopParams]):
         true_target = params.body_target
         false_target = params.end_target
         
-        eval_context = inputs.copy()
-        eval_context["input"] = inputs
-        
         try:
-            result = eval(expression, {"__builtins__": {}}, eval_context)
+            result = evaluate_expression(expression, inputs)
         except Exception as e:
             print(f"Loop eval failed: {e}")
             result = False
@@ -1,25 +1,54 @@
-from typing import Dict, Type, Any, Optional
-from wfir.runtime.base import Context
-from wfir.runtime.nodes import NodeImplementation, StartNode, EndNode, LLMNode, HTTPNode, ToolNode, ConditionNode, LoopNode, NodeDef
+import importlib
+import threading
+from collections import OrderedDict
+from typing import TYPE_CHECKING, AsyncIterator, Dict, List, Type, Any, Optional, Union
+from wfir.models import WorkflowIR
+from wfir.runtime.base import Context, InputPlan, get_blob_store, resolve_blobs
+from wfir.runtime.coalesce import coalescer
+
+if TYPE_CHECKING:
+    from wfir.runtime.nodes import NodeImplementation, NodeDef
 
 class NodeRegistry:
-    _registry: Dict[str, Type[NodeImplementation]] = {
-        "StartNode": StartNode,
-        "EndNode": EndNode,
-        "LLM": LLMNode,
-        "HTTP": HTTPNode,
-        "Tool": ToolNode,
-        "Condition": ConditionNode,
-        "Loop": LoopNode,
+    # Node type -> implementation class, or "module:attribute" to import on first use.
+    # Built-ins are lazy so that tools which only check type names never import the runtime.
+    _registry: Dict[str, Union[Type["NodeImplementation"], str]] = {
+        "StartNode": "wfir.runtime.nodes:StartNode",
+        "EndNode": "wfir.runtime.nodes:EndNode",
+        "LLM": "wfir.runtime.nodes:LLMNode",
+        "HTTP": "wfir.runtime.nodes:HTTPNode",
+        "Tool": "wfir.runtime.nodes:ToolNode",
+        "Condition": "wfir.runtime.nodes:ConditionNode",
+        "Loop": "wfir.runtime.nodes:LoopNode",
     }
 
     @classmethod
-    def register(cls, name: str, node_cls: Type[NodeImplementation]):
+    def register(cls, name: str, node_cls: Union[Type["NodeImplementation"], str]):
+        """Register a class, or a "module:attribute" path imported when the type is first used."""
         cls._registry[name] = node_cls
 
     @classmethod
-    def get(cls, name: str) -> NodeImplementation:
+    def names(cls) -> List[str]:
+        """Registered type names; imports nothing."""
+        return list(cls._registry)
+
+    @classmethod
+    def has(cls, name: str) -> bool:
+        return name in cls._registry
+
+    @classmethod
+    def get_class(cls, name: str) -> Optional[Type["NodeImplementation"]]:
+        """Look up a node implementation class without instantiating it."""
         node_cls = cls._registry.get(name)
+        if isinstance(node_cls, str):
+            module_name, _, attr = node_cls.partition(":")
+            node_cls = getattr(importlib.import_module(module_name), attr)
+            cls._registry[name] = node_cls
+        return node_cls
+
+    @classmethod
+    def get(cls, name: str) -> "NodeImplementation":
+        node_cls = cls.get_class(name)
         if not node_cls:
             raise ValueError(f"Node type '{name}' not found in registry.")
         return node_cls()
@@ -27,31 +56,162 @@ class NodeRegistry:
     @classmethod
     def get_all_schemas(cls) -> Dict[str, Any]:
         schemas = {}
-        for name, node_cls in cls._registry.items():
+        for name in cls.names():
+            node_cls = cls.get_class(name)
             if node_cls.params_model:
                 schemas[name] = node_cls.params_model.model_json_schema()
             else:
                 schemas[name] = {}
         return schemas
 
+class PreparedNode:
+    """
+    A node whose implementation, validated params and NodeDef were built ahead of time.
+    Executing it does no registry lookup, validation or allocation beyond the call itself.
+    Implementations with `coalesce` enabled share concurrent identical calls through `coalescer`.
+    With a blob store enabled (`get_blob_store`), large outputs are returned as `Blob`
+    handles, and handles in the inputs are resolved according to the implementation's `blob_inputs`.
+    """
+    __slots__ = ("node_id", "node_type", "impl", "node_def", "input_plan")
+
+    def __init__(self, node_id: str, node_type: str, impl: "NodeImplementation", node_def: "NodeDef", input_plan: Optional[InputPlan] = None):
+        self.node_id = node_id
+        self.node_type = node_type
+        self.impl = impl
+        self.node_def = node_def
+        self.input_plan = input_plan or InputPlan(())
+
+    def resolve_inputs(self, context: Context) -> Dict[str, Any]:
+        """The node's IR inputs, resolved against the context's state with the precompiled plan."""
+        return context.resolve_inputs(self.input_plan)
+
+    def _resolve_blobs(self, inputs: Dict[str, Any]) -> Dict[str, Any]:
+        """Inputs with `Blob` handles turned into what the implementation reads (`blob_inputs`)."""
+        mode = self.impl.blob_inputs
+        if mode == "handle":
+            return inputs
+        resolved = None
+        for name, value in inputs.items():
+            new = resolve_blobs(value, mode)
+            if new is not value:
+                if resolved is None:
+                    resolved = dict(inputs)
+                resolved[name] = new
+        return inputs if resolved is None else resolved
+
+    def _execute(self, inputs: Dict[str, Any], context: Context) -> Any:
+        result = self.impl.execute(inputs, context, self.node_def)
+        store = get_blob_store()
+        return store.wrap(result) if store is not None else result
+
+    async def _aexecute(self, inputs: Dict[str, Any], context: Context) -> Any:
+        result = await self.impl.aexecute(inputs, context, self.node_def)
+        store = get_blob_store()
+        return store.wrap(result) if store is not None else result
+
+    def execute(self, inputs: Dict[str, Any], context: Context) -> Any:
+        inputs = self._resolve_blobs(inputs)
+        if self.impl.coalesce:
+            key = self.impl.coalesce_key(inputs, self.node_def)
+            if key is not None:
+                return coalescer.do((self.node_type, key), self._execute, inputs, context)
+        return self._execute(inputs, context)
+
+    async def aexecute(self, inputs: Dict[str, Any], context: Context) -> Any:
+        inputs = self._resolve_blobs(inputs)
+        if self.impl.coalesce:
+            key = self.impl.coalesce_key(inputs, self.node_def)
+            if key is not None:
+                return await coalescer.ado((self.node_type, key), self._aexecute, inputs, context)
+        return await self._aexecute(inputs, context)
+
+    @property
+    def streams(self) -> bool:
+        """Whether the IR asked for streaming and the implementation produces partial output."""
+        return self.node_def.stream and self.impl.streaming
+
+    def astream(self, inputs: Dict[str, Any], context: Context) -> AsyncIterator[Any]:
+        return self.impl.astream(self._resolve_blobs(inputs), context, self.node_def)
+
+class ExecutionPlan:
+    """Prepared nodes of one workflow version, keyed by node id."""
+
+    def __init__(self, workflow_hash: str, nodes: Dict[str, PreparedNode]):
+        self.workflow_hash = workflow_hash
+        self.nodes = nodes
+
+    def __getitem__(self, node_id: str) -> PreparedNode:
+        return self.nodes[node_id]
+
+    def execute(self, node_id: str, inputs: Dict[str, Any], context: Context) -> Any:
+        return self.nodes[node_id].execute(inputs, context)
+
+    async def aexecute(self, node_id: str, inputs: Dict[str, Any], context: Context) -> Any:
+        return await self.nodes[node_id].aexecute(inputs, context)
+
 class Runtime:
-    def __init__(self):
-        pass
+    def __init__(self, max_plans: int = 128):
+        self.max_plans = max_plans
+        self._plans: "OrderedDict[str, ExecutionPlan]" = OrderedDict()
+        self._lock = threading.Lock()
 
-    def execute(self, node_type: str, inputs: Dict[str, Any], context: Context, node_def: Dict[str, Any] = None) -> Any:
+    @staticmethod
+    def prepare_node(node_type: str, node_def: Dict[str, Any] = None) -> PreparedNode:
+        """
+        Instantiate the node implementation and validate its params once.
+        Raises ValueError for unknown types and pydantic ValidationError for bad params.
+        """
+        from wfir.runtime.nodes import NodeDef
         node_impl = NodeRegistry.get(node_type)
-        
+
         # Create NodeDef from dict
         raw_params = node_def.get("params", {}) if node_def else {}
         # Validate params using the node's params_model
-        # Note: This might raise validation errors
         validated_params = node_impl.params_model(**raw_params)
-        
+
         node_id = node_def.get("id") if node_def else "unknown"
-        
+
         node_def_obj = NodeDef(
             params=validated_params,
-            node_id=node_id
+            node_id=node_id,
+            stream=bool(node_def.get("stream", False)) if node_def else False,
         )
-        
-        return node_impl.execute(inputs, context, node_def_obj)
+        input_plan = InputPlan.compile(node_def.get("inputs", {})) if node_def else None
+        return PreparedNode(node_id, node_type, node_impl, node_def_obj, input_plan)
+
+    def prepare(self, workflow: WorkflowIR) -> ExecutionPlan:
+        """
+        Build (or fetch from cache) the execution plan for a workflow.
+        Plans are keyed by the workflow content hash, so editing a workflow
+        produces a new plan while re-running the same version reuses the old one.
+        """
+        workflow_hash = workflow.content_hash()
+        with self._lock:
+            plan = self._plans.get(workflow_hash)
+            if plan is not None:
+                self._plans.move_to_end(workflow_hash)
+                return plan
+
+        nodes = {
+            node.id: self.prepare_node(node.type, node.model_dump(by_alias=True))
+            for node in workflow.nodes
+        }
+        plan = ExecutionPlan(workflow_hash, nodes)
+
+        with self._lock:
+            self._plans[workflow_hash] = plan
+            self._plans.move_to_end(workflow_hash)
+            while len(self._plans) > self.max_plans:
+                self._plans.popitem(last=False)
+        return plan
+
+    def execute(self, node_type: str, inputs: Dict[str, Any], context: Context, node_def: Dict[str, Any] = None) -> Any:
+        """
+        Validate and execute a node in one go.
+        Prefer `prepare()` for repeated executions, which does this work once per workflow.
+        """
+        return self.prepare_node(node_type, node_def).execute(inputs, context)
+
+    async def aexecute(self, node_type: str, inputs: Dict[str, Any], context: Context, node_def: Dict[str, Any] = None) -> Any:
+        """Async counterpart of `execute`."""
+        return await self.prepare_node(node_type, node_def).aexecute(inputs, context)
@@ -0,0 +1,150 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+def llm_cache_key(provider: str, model: str, temperature: float, system_prompt: str, prompt: str) -> str:
+    """Key of an LLM request: everything that determines the response of a deterministic call."""
+    payload = json.dumps([provider.lower(), model, temperature, system_prompt, prompt], separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+class ResponseCache(ABC):
+    """
+    Cache of LLM responses by `llm_cache_key`.
+    Backends implement `_get`/`_set`; `get`/`set` count hits and misses.
+    Entries older than `ttl` seconds are treated as missing (no expiry if None).
+    """
+
+    def __init__(self, ttl: Optional[float] = None):
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @abstractmethod
+    def _get(self, key: str) -> Optional[Any]:
+        pass
+
+    @abstractmethod
+    def _set(self, key: str, value: Any):
+        pass
+
+    @abstractmethod
+    def clear(self):
+        pass
+
+    def get(self, key: str) -> Optional[Any]:
+        value = self._get(key)
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def set(self, key: str, value: Any):
+        if value is not None:
+            self._set(key, value)
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses}
+
+class MemoryResponseCache(ResponseCache):
+    """In-process LRU bounded by `max_entries`."""
+
+    def __init__(self, max_entries: int = 1024, ttl: Optional[float] = None):
+        super().__init__(ttl)
+        self.max_entries = max_entries
+        # key -> (stored at, value)
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+
+    def _get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if self.ttl is not None and time.monotonic() - entry[0] > self.ttl:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def _set(self, key: str, value: Any):
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+class SQLiteResponseCache(ResponseCache):
+    """
+    On-disk cache in a SQLite database, shared across processes and restarts.
+    Values are stored as JSON. Expired rows are skipped on read and replaced on write.
+    """
+
+    def __init__(self, path: str, ttl: Optional[float] = None):
+        super().__init__(ttl)
+        self.path = path
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        # One connection shared by all threads, serialized by the lock
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, value TEXT NOT NULL, created REAL NOT NULL)")
+
+    def _get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            row = self._conn.execute("SELECT value, created FROM responses WHERE key = ?", (key,)).fetchone()
+        if row is None or (self.ttl is not None and time.time() - row[1] > self.ttl):
+            return None
+        return json.loads(row[0])
+
+    def _set(self, key: str, value: Any):
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO responses (key, value, created) VALUES (?, ?, ?)",
+                               (key, json.dumps(value), time.time()))
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+_default_cache: Optional[ResponseCache] = None
+_default_lock = threading.Lock()
+
+def get_response_cache() -> ResponseCache:
+    """
+    The process-wide cache used by LLM nodes with `cache` enabled.
+    SQLite at `$WFIR_LLM_CACHE_PATH` if set, otherwise in memory;
+    `$WFIR_LLM_CACHE_TTL` sets the TTL in seconds.
+    """
+    global _default_cache
+    with _default_lock:
+        if _default_cache is None:
+            ttl = os.environ.get("WFIR_LLM_CACHE_TTL")
+            ttl = float(ttl) if ttl else None
+            path = os.environ.get("WFIR_LLM_CACHE_PATH")
+            _default_cache = SQLiteResponseCache(path, ttl) if path else MemoryResponseCache(ttl=ttl)
+        return _default_cache
+
+def set_response_cache(cache: Optional[ResponseCache]):
+    """Replace the process-wide cache (None: rebuild it from the environment on next use)."""
+    global _default_cache
+    with _default_lock:
+        _default_cache = cache
@@ -1,35 +1,48 @@
-from typing import Dict, Set, List, Any
 from collections import deque
+from typing import List
+from wfir.graph import DominatorTree, depth_first
 from wfir.models import WorkflowIR, Node
+from wfir.runtime.expressions import compile_expression, ExpressionError
+
+# What the workflow is checked against:
+#   langgraph  the compiled graph, which follows the listed edges: Condition/Loop nodes
+#              route, cycles through a Loop repeat, and an input must be produced on every path
+#   runner     `WorkflowRunner`, which runs every node once after its edge and `valueFrom`
+#              dependencies: those must form no cycle at all, Loop or not
+TARGETS = ("langgraph", "runner")
 
 class WorkflowVerifier:
-    def __init__(self, workflow: WorkflowIR):
+    def __init__(self, workflow: WorkflowIR, target: str = "langgraph"):
+        if target not in TARGETS:
+            raise ValueError(f"Unknown verification target '{target}'; expected one of {list(TARGETS)}")
         self.workflow = workflow
-        self.node_map = {n.id: n for n in self.workflow.nodes}
-        self.adj_list: Dict[str, List[str]] = {n.id: [] for n in self.workflow.nodes}
-        self.in_degree: Dict[str, int] = {n.id: 0 for n in self.workflow.nodes}
-        
-        for edge in self.workflow.edges:
-            self.adj_list[edge.source].append(edge.target)
-            self.in_degree[edge.target] += 1
+        self.graph = workflow.graph
+        self.target = target
 
     def verify(self) -> List[str]:
         """
         Verifies the workflow IR.
         Returns a list of error messages. Empty list means valid.
+        With the "runner" target it accepts exactly what `WorkflowRunner` can schedule.
+
+        One depth-first pass finds the strongly connected components (cycles) and the
+        DFS order used to build the dominator tree for the data-flow check, so the
+        whole verification scales linearly with the size of the graph.
         """
+        if self.target == "runner":
+            return self._verify_schedule() + self._verify_references() + self._verify_node_params()
+
         errors = []
-        
-        # 1. Check for Cycles (Basic DAG check)
-        # Note: If we support Loop nodes, this check needs to be smarter (allow cycles involving Loop nodes)
-        # For now, we assume a DAG for the main flow.
-        if not self._is_dag():
-            errors.append("Workflow contains cycles (loops), which are only allowed via specific Loop nodes (not yet implemented).")
+        entries = self._entries()
+        components, postorder, reached = depth_first(self.graph, entries)
+
+        # 1. Cycles are only allowed through Loop nodes
+        errors.extend(self._verify_cycles(components))
 
         # 2. Data Flow Verification
-        # Simulate execution to check if inputs are available when needed.
-        data_errors = self._verify_data_flow()
-        errors.extend(data_errors)
+        # An input is available only if its producer runs before the node on every path.
+        dominators = DominatorTree(self.graph, entries, postorder[:reached])
+        errors.extend(self._verify_data_flow(dominators))
 
         # 3. Node Parameter Verification (e.g. Condition targets)
         param_errors = self._verify_node_params()
@@ -37,6 +50,63 @@ class WorkflowVerifier:
 
         return errors
 
+    def _entries(self) -> List[int]:
+        """The first node (the transpiler's entry point) and every node without incoming edges."""
+        graph = self.graph
+        entries = [0] if len(graph) else []
+        entries.extend(i for i in range(1, len(graph)) if graph.in_degree(i) == 0)
+        return entries
+
+    def _verify_cycles(self, components: List[List[int]]) -> List[str]:
+        errors = []
+        graph = self.graph
+        self_loops = {s for s, t in zip(graph.edge_source, graph.edge_target) if s == t}
+        for component in components:
+            if len(component) == 1 and component[0] not in self_loops:
+                continue
+            if any(graph.node(i).type == "Loop" for i in component):
+                continue
+            members = sorted(component)
+            errors.append(f"Workflow contains a cycle without a Loop node: {[graph.ids[i] for i in members]}")
+        return errors
+
+    def _verify_schedule(self) -> List[str]:
+        """The runner's own scheduling (Kahn's algorithm over edges and `valueFrom`): every node must become ready."""
+        graph = self.graph
+        count = len(graph)
+        dependents: List[List[int]] = [[] for _ in range(count)]
+        remaining = [0] * count
+        for i in range(count):
+            deps = graph.dependencies(i)
+            remaining[i] = len(deps)
+            for dep in deps:
+                dependents[dep].append(i)
+        ready = deque(i for i in range(count) if remaining[i] == 0)
+        while ready:
+            for v in dependents[ready.popleft()]:
+                remaining[v] -= 1
+                if remaining[v] == 0:
+                    ready.append(v)
+        blocked = [graph.ids[i] for i in range(count) if remaining[i] > 0]
+        if blocked:
+            return [f"Workflow contains a dependency cycle; nodes never become ready: {blocked}"]
+        return []
+
+    def _verify_references(self) -> List[str]:
+        """Under the runner a producer always finishes first; only missing producers and self-references fail."""
+        graph = self.graph
+        errors = []
+        for u, node in enumerate(self.workflow.nodes):
+            for input_name, input_val in node.inputs.items():
+                if not input_val.value_from:
+                    continue
+                ref_node = input_val.value_from.node_id
+                if ref_node not in graph.index:
+                    errors.append(f"Node '{node.id}' input '{input_name}' references missing node '{ref_node}'")
+                elif graph.index[ref_node] == u:
+                    errors.append(f"Node '{node.id}' input '{input_name}' references the node itself")
+        return errors
+
     def _verify_node_params(self) -> List[str]:
         errors = []
         for node in self.workflow.nodes:
@@ -52,86 +122,60 @@ class WorkflowVerifier:
                     targets.extend(node.params["targets"])
 
                 for target_id in targets:
-                    if target_id not in self.node_map:
+                    if target_id not in self.graph.index:
                         errors.append(f"Condition Node '{node.id}' references non-existent target '{target_id}'")
                 
                 # Check condition definition
                 if "expression" in node.params:
                     if not isinstance(node.params["expression"], str):
                          errors.append(f"Condition Node '{node.id}' has invalid 'expression' type (expected string)")
+                    else:
+                        errors.extend(self._verify_expression(node))
                 else:
                     errors.append(f"Condition Node '{node.id}' missing 'expression' parameter")
 
+            elif node.type == "Loop":
+                if isinstance(node.params.get("expression"), str):
+                    errors.extend(self._verify_expression(node))
+
         return errors
 
+    def _verify_expression(self, node: Node) -> List[str]:
+        """Parse the node's expression with the runtime expression engine."""
+        try:
+            compile_expression(node.params["expression"])
+        except ExpressionError as e:
+            return [f"{node.type} Node '{node.id}' has invalid expression: {e}"]
+        return []
+
     def _is_dag(self) -> bool:
-        """Standard Kahn's algorithm to check for cycles."""
-        in_degree = self.in_degree.copy()
-        queue = deque([n for n in self.node_map if in_degree[n] == 0])
-        visited_count = 0
-        
-        while queue:
-            u = queue.popleft()
-            visited_count += 1
-            
-            for v in self.adj_list[u]:
-                in_degree[v] -= 1
-                if in_degree[v] == 0:
-                    queue.append(v)
-                    
-        return visited_count == len(self.workflow.nodes)
-
-    def _verify_data_flow(self) -> List[str]:
+        """Kahn's algorithm, precomputed by the graph index."""
+        return self.graph.is_dag
+
+    def _verify_data_flow(self, dominators: DominatorTree) -> List[str]:
         errors = []
-        # Track available variables: "node_id" -> "Type"
-        available_vars: Dict[str, str] = {}
-        
-        # Initialize with global variables if any
-        # Assuming variables dict values are types or initial values. 
-        # If values, we infer type. If types (as strings), we use them.
-        for var_name, var_val in self.workflow.variables.items():
-            # Simple heuristic: if it looks like a type name, use it, else infer
-            var_type = "Any"
-            if isinstance(var_val, str) and var_val[0].isupper():
-                 var_type = var_val
-            else:
-                 var_type = type(var_val).__name__
-            available_vars[f"global.{var_name}"] = var_type
-
-        # Topological traversal for data flow
-        in_degree = self.in_degree.copy()
-        queue = deque([n for n in self.node_map if in_degree[n] == 0])
-        
-        # Also need to track which nodes have "executed" to provide their outputs
-        executed_nodes = set()
-
-        while queue:
-            u_id = queue.popleft()
-            node = self.node_map[u_id]
-            executed_nodes.add(u_id)
-            
+        graph = self.graph
+        for u, node in enumerate(self.workflow.nodes):
+            if graph.index[node.id] != u:
+                continue # duplicate id
+            if not dominators.reachable(u):
+                errors.append(f"Node '{node.id}' is unreachable from the entry node")
+                continue
+
             # Check inputs
             for input_name, input_val in node.inputs.items():
-                if input_val.value_from:
-                    ref_node = input_val.value_from.node_id
-                    
-                    if ref_node not in available_vars and ref_node != "global": # Global vars not fully implemented in reference model properly yet
-                        if ref_node == "global":
-                             pass # Skip global check for now as structure changed
-                        else:
-                             errors.append(f"Node '{u_id}' input '{input_name}' references missing node '{ref_node}'")
-                    else:
-                        # Optional: Type Checking logic here
-                        pass
-
-            # "Execute" node -> Produce outputs
-            # We assume the node produces an output
-            available_vars[u_id] = "Any"
-
-            # Continue traversal
-            for v in self.adj_list[u_id]:
-                in_degree[v] -= 1
-                if in_degree[v] == 0:
-                    queue.append(v)
-                    
+                if not input_val.value_from:
+                    continue
+                ref_node = input_val.value_from.node_id
+                if ref_node == "global": # Global vars not fully implemented in reference model properly yet
+                    continue
+                producer = graph.index.get(ref_node)
+                if producer is None:
+                    errors.append(f"Node '{node.id}' input '{input_name}' references missing node '{ref_node}'")
+                elif producer == u or not dominators.dominates(producer, u):
+                    errors.append(
+                        f"Node '{node.id}' input '{input_name}' references node '{ref_node}', "
+                        "which does not run before it on every path"
+                    )
+
         return errors